@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
-from recommender import parse_query_with_gemini, recommend_assessments
+from recommender import parse_query_async, recommend_assessments
 
 app = FastAPI()
 
@@ -8,7 +8,7 @@ class QueryModel(BaseModel):
     query: str
 
 @app.post("/recommend")
-def recommend(query: QueryModel):
-    filters = parse_query_with_gemini(query.query)
+async def recommend(query: QueryModel):
+    filters = await parse_query_async(query.query)
     results = recommend_assessments(filters)
     return {"recommendations": results}
@@ -1,39 +1,41 @@
 from flask import Flask, render_template, request, jsonify
-from recommender import parse_query_with_gemini, recommend_assessments
+from recommender import (parse_query, parse_queries, recommend_assessments_batch,
+                         cached_response, response_cache, catalog_manager, metrics_text)
+from response_format import Assessment, GENERIC_ASSESSMENT, MAX_RECOMMENDATIONS
+from response_cache import etag_matches
+from config import BATCH_MAX_QUERIES, CATALOG, ADMIN_TOKEN, LOG_LEVEL
+from catalog_snapshot import load_url_map
+import logging
 import os
-import re
+
+logging.basicConfig(level=LOG_LEVEL)
 
 app = Flask(__name__)
 
-# Load the title => url mapping from final.txt
+# Load the title => url mapping, from the catalog snapshot or final.txt
 def load_url_mappings():
-    mappings = {}
     try:
-        if os.path.exists("final.txt"):
-            with open("final.txt", "r") as file:
-                for line in file:
-                    line = line.strip()
-                    if "=>" in line:
-                        title, url = line.split("=>", 1)
-                        mappings[title.strip()] = url.strip()
+        return load_url_map(CATALOG["urls"], CATALOG["snapshot"])
     except Exception as e:
         print(f"Error loading URL mappings: {e}")
-    return mappings
+        return {}
 
 # Cache the mappings
 URL_MAPPINGS = load_url_mappings()
 
-# Test type mapping
-TEST_TYPE_MAP = {
-    "A": ["Ability & Aptitude"],
-    "B": ["Biodata & Situational Judgement"],
-    "C": ["Competencies"],
-    "D": ["Development & 360"],
-    "E": ["Assessment Exercises"],
-    "K": ["Knowledge & Skills"],
-    "P": ["Personality & Behavior"],
-    "S": ["Simulations"]
-}
+def _use_url_mappings(state):
+    # A reloaded catalog carries its own mappings
+    global URL_MAPPINGS
+    URL_MAPPINGS = state.urls
+
+catalog_manager.subscribe(_use_url_mappings)
+
+def format_recommendations(results):
+    """Transform recommender results to match the required response format"""
+    recommended_assessments = [Assessment(result, URL_MAPPINGS).to_dict() for result in results[:MAX_RECOMMENDATIONS]]
+
+    # Ensure we have at least one recommendation
+    return recommended_assessments or [dict(GENERIC_ASSESSMENT)]
 
 @app.route('/', methods=['GET'])
 def index():
@@ -52,65 +54,82 @@ def recommend():
     if request.is_json:
         data = request.get_json()
         query = data.get('query', '')
+        test_types = data.get('test_types')
     else:
         query = request.form.get('query', '')
+        test_types = request.form.getlist('test_types')
     
     if not query:
         return jsonify({"error": "No query provided"}), 400
     
-    # Use your existing recommender code
-    filters = parse_query_with_gemini(query)
-    results = recommend_assessments(filters)
-    
-    # Transform results to match the required response format
-    recommended_assessments = []
-    
-    for result in results[:10]:  # Limit to at most 10 recommendations
-        title = result["title"]
-        
-        # Get URL from mappings or create a fallback URL
-        slug = re.sub(r'[^\w-]', '-', title.lower())
-        url = URL_MAPPINGS.get(title, "https://www.shl.com/solutions/products/product-catalog/view/" + slug + "/")
-        
-        # Map test type code to descriptive value
-        test_type_code = result.get("test_type", "M")
-        test_type = TEST_TYPE_MAP.get(test_type_code, ["Mixed"])
-        
-        # Handle duration - default to 0 if not available or invalid
-        try:
-            duration = int(result.get("assessment_length", 0))
-        except (ValueError, TypeError):
-            duration = 0
-        
-        # Create assessment object
-        assessment = {
-            "url": url,
-            "adaptive_support": "Yes" if result.get("adaptive/irt", "").lower() == "yes" else "No",
-            "description": result.get("description", ""),
-            "duration": duration,
-            "remote_support": "Yes" if result.get("remote_testing", "").lower() == "yes" else "No",
-            "test_type": test_type
-        }
-        
-        recommended_assessments.append(assessment)
-    
-    # Ensure we have at least one recommendation
-    if not recommended_assessments:
-        # Create a generic recommendation if none are found
-        recommended_assessments = [{
-            "url": "https://www.shl.com/solutions/products/product-catalog/view/general-assessment/",
-            "adaptive_support": "No",
-            "description": "General assessment for evaluating candidate skills.",
-            "duration": 30,
-            "remote_support": "Yes",
-            "test_type": ["Mixed"]
-        }]
-    
-    return jsonify({"recommended_assessments": recommended_assessments})
+    # Use your existing recommender code, the JSON body is joined from
+    # per-assessment fragments and cached per canonical filters
+    filters = parse_query(query)
+    if test_types:
+        # Requested test types (codes, labels or words) replace the extracted ones
+        filters = {**filters, "test_types": test_types}
+    body, etag = cached_response(filters)
+
+    # The client already holds this exact payload
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response_cache.not_modified += 1
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response
+
+@app.route('/recommend/batch', methods=['POST'])
+def recommend_batch():
+    """Recommendations for a list of queries, e.g. job descriptions sent in bulk"""
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+
+    if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q for q in queries):
+        return jsonify({"error": "Provide a non-empty list of queries"}), 400
+    if len(queries) > BATCH_MAX_QUERIES:
+        return jsonify({"error": f"At most {BATCH_MAX_QUERIES} queries per batch"}), 400
+
+    filters_list = parse_queries(queries)
+    batch_results = recommend_assessments_batch(filters_list)
+
+    return jsonify({"results": [
+        {"query": query, "recommended_assessments": format_recommendations(results)}
+        for query, results in zip(queries, batch_results)
+    ]})
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload the catalog of this worker without a restart.
+
+    ``{"rebuild_snapshot": true}`` also rebuilds the snapshot from the CSV
+    and URL map, which the file watchers of the other workers then pick up.
+    """
+    if not ADMIN_TOKEN or request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        return jsonify({"error": "Forbidden"}), 403
+    data = request.get_json(silent=True) or {}
+    report = catalog_manager.reload(rebuild_snapshot=bool(data.get("rebuild_snapshot")),
+                                    force=bool(data.get("force")))
+    return jsonify(report), 500 if "error" in report else 200
+
+@app.route('/admin/catalog', methods=['GET'])
+def admin_catalog():
+    """Live catalog version, reload counts and reload latency"""
+    if not ADMIN_TOKEN or request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify(catalog_manager.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage latency histograms and cache counters of this worker, for Prometheus"""
+    return app.response_class(metrics_text(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     # Print startup message with loaded URL mappings
     print(f"Starting Flask server with {len(URL_MAPPINGS)} URL mappings loaded.")
     
+    if CATALOG["watch_interval"] > 0:
+        catalog_manager.watch(CATALOG["watch_interval"])
+
     port = int(os.environ.get("PORT", 8080))
     app.run(host="0.0.0.0", port=port, debug=False)
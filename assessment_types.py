@@ -0,0 +1,103 @@
+import re
+import numpy as np
+
+# Catalog test type codes, one bit each in this order
+TEST_TYPE_CODES = "ABCDEKPS"
+
+TEST_TYPE_LABELS = {
+    "A": "Ability & Aptitude",
+    "B": "Biodata & Situational Judgement",
+    "C": "Competencies",
+    "D": "Development & 360",
+    "E": "Assessment Exercises",
+    "K": "Knowledge & Skills",
+    "P": "Personality & Behavior",
+    "S": "Simulations",
+}
+
+TEST_TYPE_BITS = {code: 1 << bit for bit, code in enumerate(TEST_TYPE_CODES)}
+
+# Labels of every possible mask, in code order; a row without a known code is "Mixed"
+MASK_LABELS = [[TEST_TYPE_LABELS[code] for code in TEST_TYPE_CODES if mask & TEST_TYPE_BITS[code]] or ["Mixed"]
+               for mask in range(1 << len(TEST_TYPE_CODES))]
+
+# Words in a query or filter naming a test type
+TEST_TYPE_TERMS = {
+    "ability": "A", "aptitude": "A", "cognitive": "A", "reasoning": "A",
+    "biodata": "B", "situational judgement": "B", "situational judgment": "B", "sjt": "B",
+    "competencies": "C", "competency": "C",
+    "development": "D", "360": "D",
+    "assessment exercises": "E", "assessment exercise": "E", "exercises": "E",
+    "assessment centre": "E", "assessment center": "E",
+    "knowledge": "K", "skills": "K",
+    "personality": "P", "behavior": "P", "behaviour": "P", "behavioral": "P", "behavioural": "P",
+    "simulation": "S", "simulations": "S",
+}
+
+# Query phrases that ask for a type of test. Stricter than TEST_TYPE_TERMS:
+# "ability" or "skills" alone describe the candidate far more often
+_QUERY_TERMS = {
+    "cognitive": "A", "aptitude": "A", "ability test": "A", "reasoning test": "A",
+    "biodata": "B", "situational judgement": "B", "situational judgment": "B", "sjt": "B",
+    "competency test": "C", "competency assessment": "C",
+    "360": "D",
+    "assessment exercise": "E", "assessment centre": "E", "assessment center": "E",
+    "knowledge test": "K",
+    "personality": "P", "behavioral test": "P", "behavioural test": "P",
+    "simulation": "S",
+}
+_QUERY_PATTERN = re.compile(r'(?<!\w)(' + '|'.join(re.escape(term) for term in
+                                                   sorted(_QUERY_TERMS, key=len, reverse=True)) + r')(?:s|es)?(?!\w)')
+
+def parse_test_type(value) -> int:
+    """Mask of a catalog ``test_type`` such as ``"C P"``; unknown codes set no bit"""
+    if not isinstance(value, str):
+        return 0
+    mask = 0
+    for code in value.upper().split():
+        mask |= TEST_TYPE_BITS.get(code, 0)
+    return mask
+
+def parse_test_types(values) -> np.ndarray:
+    """``uint8`` mask per row of a ``test_type`` column, each distinct string parsed once"""
+    masks = {}
+    return np.array([masks.setdefault(value, parse_test_type(value)) if isinstance(value, str) else 0
+                     for value in values], dtype=np.uint8)
+
+def mask_labels(mask: int) -> list:
+    """Response labels of a mask"""
+    return MASK_LABELS[mask]
+
+def mask_codes(mask: int) -> list:
+    return [code for code in TEST_TYPE_CODES if mask & TEST_TYPE_BITS[code]]
+
+def test_types_mask(values) -> int:
+    """Mask of a ``test_types`` filter.
+
+    Entries may be codes (``"A"``), labels (``"Personality & Behavior"``)
+    or plain words (``"cognitive"``), in any case; anything else is
+    ignored. A single string is read as one entry.
+    """
+    if isinstance(values, str):
+        values = [values]
+    mask = 0
+    for value in values or ():
+        value = str(value).strip()
+        if value.upper() in TEST_TYPE_BITS:
+            mask |= TEST_TYPE_BITS[value.upper()]
+            continue
+        value = value.lower()
+        for code, label in TEST_TYPE_LABELS.items():
+            if value == label.lower():
+                mask |= TEST_TYPE_BITS[code]
+                break
+        else:
+            mask |= TEST_TYPE_BITS.get(TEST_TYPE_TERMS.get(value), 0)
+    return mask
+
+def extract_test_types(text) -> list:
+    """Codes of the test types a lowercased query asks for, in code order"""
+    mask = 0
+    for match in _QUERY_PATTERN.finditer(text):
+        mask |= TEST_TYPE_BITS[_QUERY_TERMS[match.group(1)]]
+    return mask_codes(mask)
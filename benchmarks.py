@@ -0,0 +1,1045 @@
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import threading
+import sys
+import urllib.request
+import hashlib
+import html
+import re
+from email.utils import formatdate
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+from pathlib import Path
+import time
+from contextlib import contextmanager, redirect_stdout
+import numpy as np
+import pandas as pd
+import recommender
+from benchmarks_legacy import recommend_assessments_old
+from recommender import (recommend_assessments, recommend_assessments_batch,
+                         parse_query_with_gemini, parse_query_async)
+from config import StubModel
+from query_cache import QueryCache
+from response_cache import ResponseCache
+from llm_client import AsyncLLMClient
+from metrics import Histogram
+from catalog_index import CatalogIndex
+from scoring import ScoringEngine, top_k_rows
+from semantic import VectorStore
+from catalog_snapshot import build_snapshot, load_catalog_csv
+
+# Filter sets that exercise every scoring path (technical, soft, job level
+# category, job level tokens, duration filter and duration fallback)
+SAMPLE_FILTERS = [
+    {"skills": ["python", "machine learning"], "duration_limit": 45, "job_level": None},
+    {"skills": ["ai", "nlp"], "job_level": "research engineer", "duration_limit": None},
+    {"skills": ["java", "collaboration"], "job_level": "developer", "duration_limit": 40},
+    {"skills": ["python", "sql", "javascript"], "job_level": "mid", "duration_limit": 60},
+    {"skills": ["ai", "ml", "collaboration"], "job_level": "research engineer", "duration_limit": 30},
+    {"skills": ["cognitive", "personality"], "job_level": "analyst", "duration_limit": 45},
+    {"skills": ["communication", "attention to detail"], "job_level": "entry", "duration_limit": None},
+    {"skills": ["c++", ".net", "ci/cd"], "job_level": "senior", "duration_limit": 5},
+    {"skills": ["generative ai"], "job_level": "manager", "duration_limit": "20"},
+    {"skills": [], "job_level": "graduate", "duration_limit": None},
+    {},
+]
+
+# Queries from runner.py run_eval
+SAMPLE_QUERIES = [
+    "Looking for assessments on Python and ML, 45 mins max",
+    "Need something for a research engineer on generative AI and NLP",
+    "I am hiring for Java developers who can also collaborate effectively with my business teams. Looking for an assessment(s) that can be completed in 40 minutes.",
+    "Looking to hire mid-level professionals who are proficient in Python, SQL and Java Script. Need an assessment package that can test all skills with max duration of 60 minutes.",
+    "Are you an AI enthusiast with visionary thinking to conceptualize AI-based products? Are you looking to apply these skills in an environment where teamwork and collaboration are key to developing our digital product experiences? We are seeking a Research Engineer to join our team to deliver robust AI/ML models. You will closely work with the product team to spot opportunities to use AI in the current product stack and influence the product roadmap by incorporating AI-led features/products. Can you recommend some assessment that can help me screen applications? Time limit is less than 30 minutes.",
+    "I am hiring for an analyst and want applications to screen using Cognitive and personality tests, what options are available within 45 mins",
+]
+
+def random_filters(count, seed=0):
+    """Filter sets mixing the skills, job levels and durations of the samples"""
+    rng = random.Random(seed)
+    skills = sorted({skill for filters in SAMPLE_FILTERS for skill in filters.get("skills", [])})
+    job_levels = [None] + sorted({f["job_level"] for f in SAMPLE_FILTERS if f.get("job_level")})
+    durations = [None, 10, 20, 30, 45, 60]
+    return [{
+        "skills": rng.sample(skills, rng.randint(0, 4)),
+        "job_level": rng.choice(job_levels),
+        "duration_limit": rng.choice(durations),
+    } for _ in range(count)]
+
+@contextmanager
+def catalog_override(df):
+    """Temporarily point the legacy recommender at another catalog"""
+    original = recommender.shl_df
+    recommender.shl_df = df
+    try:
+        yield
+    finally:
+        recommender.shl_df = original
+
+@contextmanager
+def quiet():
+    """Silence the recommender's per-request prints while timing"""
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+def replicate_catalog(df, factor):
+    """Stack ``factor`` copies of the catalog to simulate a larger one"""
+    return pd.concat([df] * factor, ignore_index=True)
+
+def _time_call(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+def check_scoring_parity(filters_list=SAMPLE_FILTERS, engine=None):
+    """Compare the vectorized recommender against the legacy one.
+
+    Returns a list of the filter sets whose results differ.
+    """
+    mismatches = []
+    for filters in filters_list:
+        old = recommend_assessments_old(dict(filters))
+        new = recommend_assessments(dict(filters), engine=engine)
+        if json.dumps(old, default=str) != json.dumps(new, default=str):
+            mismatches.append(filters)
+    return mismatches
+
+def bench_scoring(replicate=100, repeats=3, include_old=True):
+    """Per-request latency of the legacy and vectorized scorers.
+
+    The catalog is replicated ``replicate`` times. Returns a list of dicts
+    with timings in milliseconds for every sample filter set.
+    """
+    big_df = replicate_catalog(recommender.shl_df, replicate)
+    engine = ScoringEngine(CatalogIndex(big_df))
+
+    rows = []
+    for filters in SAMPLE_FILTERS:
+        new, new_time = _time_call(lambda: recommend_assessments(dict(filters), engine=engine), repeats)
+        row = {"filters": filters, "rows": len(big_df), "vectorized_ms": round(new_time * 1000, 2)}
+
+        if include_old:
+            with catalog_override(big_df):
+                old, old_time = _time_call(lambda: recommend_assessments_old(dict(filters)), 1)
+            row["legacy_ms"] = round(old_time * 1000, 2)
+            row["speedup"] = round(old_time / new_time, 1) if new_time else None
+            row["parity"] = json.dumps(old, default=str) == json.dumps(new, default=str)
+
+        rows.append(row)
+    return rows
+
+def synthetic_catalog(rows=100_000, seed=0):
+    """Catalog of ``rows`` assessments built from the real catalog's vocabulary"""
+    rng = np.random.default_rng(seed)
+    source = recommender.shl_df
+    title_words = np.array(" ".join(source['title'].astype(str)).split())
+    description_words = np.array(" ".join(source['description'].astype(str)).split())
+
+    def phrases(words, low, high):
+        lengths = rng.integers(low, high, size=rows)
+        picks = rng.integers(0, len(words), size=lengths.sum())
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+        return [" ".join(words[picks[a:b]]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    df = pd.DataFrame({
+        'title': phrases(title_words, 2, 6),
+        'description': phrases(description_words, 30, 90),
+    })
+    for column in ['job_levels', 'language', 'test_type', 'remote_testing', 'adaptive/irt']:
+        df[column] = source[column].sample(rows, replace=True, random_state=seed).to_numpy()
+    df['assessment_length'] = rng.integers(0, 90, size=rows).astype(float)
+    return df
+
+def bench_inverted_index(rows=100_000, repeats=3):
+    """Candidate pruning through the inverted index against full column scans.
+
+    Returns the index build time and, for every sample filter set, the
+    per-request latency of both paths and whether their results agree.
+    """
+    df = synthetic_catalog(rows)
+
+    start = time.perf_counter()
+    index = CatalogIndex(df)
+    build_time = time.perf_counter() - start
+
+    pruned = ScoringEngine(index, prune=True)
+    scanned = ScoringEngine(index, prune=False)
+
+    results = []
+    for filters in SAMPLE_FILTERS:
+        fast, fast_time = _time_call(lambda: recommend_assessments(dict(filters), engine=pruned), repeats)
+        slow, slow_time = _time_call(lambda: recommend_assessments(dict(filters), engine=scanned), repeats)
+        results.append({
+            "filters": filters,
+            "pruned_ms": round(fast_time * 1000, 2),
+            "scan_ms": round(slow_time * 1000, 2),
+            "speedup": round(slow_time / fast_time, 1) if fast_time else None,
+            "parity": json.dumps(fast, default=str) == json.dumps(slow, default=str),
+        })
+    return {"rows": rows, "build_s": round(build_time, 2), "results": results}
+
+def bench_query_cache(rounds=5, max_entries=1024, latency=0.0):
+    """Hit rate of the query cache against an offline stub model.
+
+    Every sample query is sent ``rounds`` times with varying case and
+    whitespace, then once more through a fresh cache on the same SQLite
+    file to show that a restarted worker is served from disk.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "query_cache.sqlite")
+        model = StubModel(latency=latency)
+        cache = QueryCache(path=path, max_entries=max_entries)
+
+        start = time.perf_counter()
+        for i in range(rounds):
+            for query in SAMPLE_QUERIES:
+                variant = query.upper() if i % 2 else "  " + query.replace(" ", "  ")
+                parse_query_with_gemini(variant, model=model, cache=cache)
+        elapsed = time.perf_counter() - start
+
+        restarted = QueryCache(path=path, max_entries=max_entries)
+        for query in SAMPLE_QUERIES:
+            parse_query_with_gemini(query, model=model, cache=restarted)
+
+        return {
+            "requests": rounds * len(SAMPLE_QUERIES),
+            "model_calls": model.calls,
+            "avg_ms": round(elapsed / (rounds * len(SAMPLE_QUERIES)) * 1000, 3),
+            "cache": cache.stats(),
+            "restarted_cache": restarted.stats(),
+        }
+
+def _filter_variants(filters, rng):
+    """Filters asking for the same thing: skills shuffled and recased, limit nudged"""
+    skills = list(filters.get("skills") or [])
+    rng.shuffle(skills)
+    variant = dict(filters, skills=[skill.upper() if rng.random() < 0.5 else skill for skill in skills])
+    if isinstance(filters.get("duration_limit"), (int, float)):
+        variant["duration_limit"] = filters["duration_limit"] + rng.choice([0, 0.5, 1])
+    return variant
+
+def bench_response_cache(requests=2000, distinct=50, max_entries=2048, seed=0):
+    """Hit rate and latency of the response cache on a skewed stream of filters.
+
+    ``distinct`` filter sets are requested with Zipf-like popularity, each
+    time as a shuffled/recased variant. Every cached payload is checked
+    against uncached scoring of its canonical filters.
+    """
+    rng = random.Random(seed)
+    engine = recommender.scoring_engine
+    base = random_filters(distinct, seed=seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    stream = [_filter_variants(rng.choices(base, weights)[0], rng) for _ in range(requests)]
+    cache = ResponseCache(max_entries=max_entries, catalog_version=recommender.catalog_version)
+
+    with quiet():
+        start = time.perf_counter()
+        for filters in stream[:200]:
+            recommend_assessments(filters, engine=engine)
+        uncached = (time.perf_counter() - start) / min(200, len(stream))
+
+        start = time.perf_counter()
+        payloads = [recommender.cached_recommendations(filters, cache=cache, engine=engine)[0]
+                    for filters in stream]
+        cached = (time.perf_counter() - start) / len(stream)
+
+        mismatches = [filters for filters, payload in zip(stream, payloads)
+                      if payload != recommend_assessments(filters, engine=engine)]
+
+    # A rebuilt catalog must not serve the old payloads
+    cache.set_catalog_version("rebuilt")
+    return {
+        "requests": requests,
+        "uncached_ms": round(uncached * 1000, 3),
+        "cached_ms": round(cached * 1000, 3),
+        "speedup": round(uncached / cached, 1) if cached else None,
+        "mismatches": mismatches,
+        "cache": cache.stats(),
+    }
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    pick = lambda q: round(timings[min(len(timings) - 1, int(q / 100 * len(timings)))] * 1000, 1)
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+def bench_llm_client(requests=200, concurrency=50, latency=0.2, slow_fraction=0.05,
+                     slow_latency=2.0, timeout=1.5, seed=0):
+    """Throughput of query extraction under concurrent load against a fake model.
+
+    The stub model answers in ``latency`` seconds, or ``slow_latency`` for a
+    ``slow_fraction`` of calls, to mimic a long-tailed LLM backend. Queries
+    carry no known skill so every one needs the model. Compares blocking
+    calls inside the event loop (the old handler behaviour, on a sample of
+    the requests) with the async client, with and without hedging.
+    """
+    rng = random.Random(seed)
+    delay = lambda: slow_latency if rng.random() < slow_fraction else latency
+    queries = [f"someone good for our new team number {i}" for i in range(requests)]
+
+    async def run(handler, count):
+        slots = asyncio.Semaphore(concurrency)
+        timings = []
+
+        async def one(query):
+            async with slots:
+                start = time.perf_counter()
+                filters = await handler(query)
+                timings.append(time.perf_counter() - start)
+                return filters
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one(query) for query in queries[:count]))
+        elapsed = time.perf_counter() - start
+        return {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 1),
+            "degraded": sum(1 for filters in results if filters.get("degraded")),
+            **_percentiles(timings),
+        }
+
+    report = {}
+
+    model = StubModel(latency=delay)
+    async def blocking(query):
+        return parse_query_with_gemini(query, model=model, cache=None)
+    report["blocking"] = asyncio.run(run(blocking, min(requests, 20)))
+
+    for name, hedge in [("async", False), ("async_hedged", True)]:
+        # Headroom above the request concurrency leaves slots free for hedges
+        client = AsyncLLMClient(timeout=timeout, max_in_flight=concurrency * 2, hedge=hedge,
+                                hedge_after=latency * 2, model_factory=lambda: StubModel(latency=delay),
+                                latency=Histogram("llm_call_seconds"))
+        async def handler(query, client=client):
+            return await parse_query_async(query, client=client, cache=None)
+        report[name] = asyncio.run(run(handler, requests))
+        stats = client.stats()
+        report[name].update({key: stats[key] for key in ("calls", "hedges", "hedge_wins", "timeouts")})
+    return report
+
+def bench_batch(sizes=(1, 10, 100), replicate=1, repeats=3):
+    """Batched against sequential scoring throughput for several batch sizes"""
+    df = replicate_catalog(recommender.shl_df, replicate) if replicate > 1 else recommender.shl_df
+    engine = ScoringEngine(CatalogIndex(df)) if replicate > 1 else recommender.scoring_engine
+
+    rows = []
+    for size in sizes:
+        filters_list = random_filters(size, seed=size)
+        sequential, sequential_time = _time_call(
+            lambda: [recommend_assessments(dict(filters), engine=engine) for filters in filters_list], repeats)
+        batched, batched_time = _time_call(
+            lambda: recommend_assessments_batch([dict(filters) for filters in filters_list], engine=engine), repeats)
+        rows.append({
+            "batch_size": size,
+            "rows": len(df),
+            "sequential_qps": round(size / sequential_time, 1),
+            "batched_qps": round(size / batched_time, 1),
+            "speedup": round(sequential_time / batched_time, 1) if batched_time else None,
+            "parity": json.dumps(sequential, default=str) == json.dumps(batched, default=str),
+        })
+    return rows
+
+def bench_top_k(sizes=(1_000, 10_000, 100_000, 1_000_000), top_k=10, repeats=5, seed=0):
+    """Cost of picking the top rows as the catalog grows.
+
+    Compares the legacy tail of ``recommend_assessments_old`` (column
+    selection, fillna, full sort_values, head, to_dict), a full lexsort of
+    the score arrays, and ``top_k_rows`` partial selection. Scores are
+    small integers with many ties, like real ones.
+    """
+    rng = np.random.default_rng(seed)
+    source = recommender.shl_df
+    rows = []
+    for size in sizes:
+        score = rng.integers(0, 40, size=size)
+        description_match_score = rng.integers(0, 5, size=size) / rng.integers(50, 500, size=size) * 100
+        df = source.iloc[rng.integers(0, len(source), size=size)].reset_index(drop=True)
+        df['score'] = score
+        df['description_match_score'] = description_match_score
+
+        def legacy():
+            result_df = df[['title', 'description', 'job_levels', 'language', 'assessment_length',
+                            'test_type', 'remote_testing', 'adaptive/irt', 'score', 'description_match_score']]
+            result_df = result_df.fillna("N/A").sort_values(by=['score', 'description_match_score'],
+                                                            ascending=[False, False]).head(top_k)
+            return result_df.index.to_numpy()
+
+        full, full_time = _time_call(lambda: np.lexsort((-description_match_score, -score))[:top_k], repeats)
+        partial, partial_time = _time_call(lambda: top_k_rows(score, description_match_score, top_k), repeats)
+        _, legacy_time = _time_call(legacy, 1)
+        rows.append({
+            "rows": size,
+            "legacy_ms": round(legacy_time * 1000, 3),
+            "full_sort_ms": round(full_time * 1000, 3),
+            "top_k_ms": round(partial_time * 1000, 3),
+            "speedup_vs_sort": round(full_time / partial_time, 1) if partial_time else None,
+            "parity": bool(np.array_equal(full, partial)),
+        })
+    return rows
+
+def _slug(title):
+    return re.sub(r'[^\w-]', '-', title.lower())
+
+def _boilerplate(links):
+    """Navigation markup of ``links`` menu entries, as on every real catalog page"""
+    items = "".join(f'<li><a href="/solutions/{i}/">Services Resources Careers About Support {i}</a></li>'
+                    for i in range(links))
+    return f'<header><nav><ul>{items}</ul></nav></header>'
+
+def render_fixture_site(raw, directory, page_size=12, nav_links=20):
+    """Save listing and product pages shaped like the SHL catalog for the rows of ``raw``.
+
+    ``raw`` holds the columns of ``shl_clean.csv``. Listing pages go to
+    ``listing-<start>.html``, product pages to ``view/<slug>.html``. Every
+    page carries ``nav_links`` navigation entries before the content and a
+    footer of the same size after it.
+    """
+    os.makedirs(os.path.join(directory, "view"), exist_ok=True)
+    text = lambda value: "" if pd.isna(value) else html.escape(str(value))
+    circle = lambda value: '<span class="catalogue__circle -yes"></span>' if value == "Yes" else ""
+    chrome = _boilerplate(nav_links)
+    footer = f'<footer>{_boilerplate(nav_links)}</footer>'
+    for start in range(0, len(raw) + page_size, page_size):
+        rows = []
+        for _, row in raw.iloc[start:start + page_size].iterrows():
+            rows.append(f'<tr><td><a href="/view/{_slug(row["Topic"])}/">{text(row["Topic"])}</a></td>'
+                        f'<td>{circle(row["Remote Testing"])}</td><td>{circle(row["Adaptive/IRT"])}</td>'
+                        f'<td>{text(row["Test Type"])}</td></tr>')
+        with open(os.path.join(directory, f"listing-{start}.html"), "w", encoding="utf-8") as f:
+            f.write(f'<html><body>{chrome}'
+                    '<table><tr><th>Pre-packaged Job Solutions</th></tr></table>'
+                    f'<table><tr><th>Individual Test Solutions</th></tr>{"".join(rows)}</table>'
+                    f'{footer}</body></html>')
+    for _, row in raw.iterrows():
+        keys = "".join(f'<span class="product-catalogue__key">{html.escape(key)}</span>'
+                       for key in ("" if pd.isna(row["Test Type"]) else str(row["Test Type"])).split())
+        adaptive = (f'<p>Adaptive/IRT: {circle(row["Adaptive/IRT"])}</p>'
+                    if row["Adaptive/IRT"] == "Yes" else "")
+        with open(os.path.join(directory, "view", f"{_slug(row['Topic'])}.html"), "w", encoding="utf-8") as f:
+            f.write(f'<html><body>{chrome}<main>'
+                    f'<p>Products</p><p>Product Catalog</p><h1>{text(row["Topic"])}</h1>'
+                    f'<div><h4>Description</h4><p>{text(row["Description"])}</p></div>'
+                    f'<div><h4>Job levels</h4><p>{text(row["Job Levels"])}</p></div>'
+                    f'<div><h4>Languages</h4><p>{text(row["Language"])}</p></div>'
+                    f'<div><h4>Assessment length</h4><p>{text(row["Assessment Length"])}</p></div>'
+                    f'<p>Test Type: {keys}</p><p>Remote Testing: {circle(row["Remote Testing"])}</p>{adaptive}'
+                    f'</main>{footer}</body></html>')
+
+@contextmanager
+def fixture_server(directory, delay=0.0):
+    """Serve saved catalog pages with ETag and Last-Modified validators.
+
+    Yields ``(base_url, counters)``; counters count responses by status and
+    the connections opened, and track the largest number of requests in
+    flight. Connections are kept alive, as the real site does.
+    """
+    counters = {"200": 0, "304": 0, "404": 0, "in_flight": 0, "max_in_flight": 0, "connections": 0}
+    lock = threading.Lock()
+
+    class Handler(SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with lock:
+                counters["connections"] += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                counters[str(status)] += 1
+
+        def do_GET(self):
+            with lock:
+                counters["in_flight"] += 1
+                counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+            try:
+                time.sleep(delay)
+                parts = urlsplit(self.path)
+                start = re.search(r'start=(\d+)', parts.query)
+                if parts.path.startswith("/view/"):
+                    name = os.path.join("view", parts.path.strip("/").split("/")[-1] + ".html")
+                else:
+                    name = f"listing-{start.group(1) if start else 0}.html"
+                path = os.path.join(directory, name)
+                if not os.path.exists(path):
+                    return self._send(404)
+                with open(path, "rb") as f:
+                    body = f.read()
+                validators = [("ETag", '"' + hashlib.sha256(body).hexdigest()[:16] + '"'),
+                              ("Last-Modified", formatdate(os.path.getmtime(path), usegmt=True))]
+                if self.headers.get("If-None-Match") == validators[0][1]:
+                    return self._send(304, headers=validators)
+                self._send(200, body, [("Content-Type", "text/html; charset=utf-8"), *validators])
+            finally:
+                with lock:
+                    counters["in_flight"] -= 1
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/", counters
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def bench_extractor(rows=0, nav_links=200, processes=4, repeats=3):
+    """Pages per second of the streaming extractor against the BeautifulSoup + regex parser.
+
+    Product pages of the first ``rows`` catalog rows (all when 0) are
+    saved with ``nav_links`` navigation entries each, then parsed by the
+    legacy parser, the streaming extractor and the extractor on a pool of
+    ``processes``. Also reports fields on which the two parsers disagree.
+    """
+    from crawler import parse_detail_old
+    from extractor import extract_detail, extract_details
+
+    raw = pd.read_csv("shl_clean.csv", encoding='latin1')
+    raw = (raw.head(rows) if rows else raw).drop_duplicates("Topic").reset_index(drop=True)
+    with tempfile.TemporaryDirectory() as directory:
+        render_fixture_site(raw, directory, nav_links=nav_links)
+        pages = []
+        for title in raw["Topic"]:
+            with open(os.path.join(directory, "view", f"{_slug(title)}.html"), encoding="utf-8") as f:
+                pages.append(f.read())
+
+    legacy, legacy_time = _time_call(lambda: [parse_detail_old(page) for page in pages], 1)
+    streamed, stream_time = _time_call(lambda: [extract_detail(page) for page in pages], repeats)
+    _, pool_time = _time_call(lambda: extract_details(pages, processes=processes), repeats)
+
+    normalize = lambda value: " ".join(str(value).split())
+    mismatches = [(new["Topic"], field, old[field], new[field])
+                  for old, new in zip(legacy, streamed) for field in old
+                  if field != "Remote Testing" and normalize(old[field]) != normalize(new[field])]
+    return {
+        "pages": len(pages),
+        "avg_kb": round(sum(len(page) for page in pages) / len(pages) / 1024, 1),
+        "legacy_pps": round(len(pages) / legacy_time),
+        "streaming_pps": round(len(pages) / stream_time),
+        "pool_pps": round(len(pages) / pool_time),
+        "processes": processes,
+        "mismatches": mismatches,
+    }
+
+# Skills added one by one for the skill-count sweep, technical and soft mixed
+BENCH_SKILLS = ["python", "collaboration", "sql", "machine learning", "java", "communication",
+                "javascript", "leadership", "c++", "excel", "attention to detail", "ai"]
+
+def _summarize(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "min_ms": round(timings[0] * 1000, 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(0.95 * len(timings)))] * 1000, 4),
+        "runs": len(timings),
+    }
+
+def _measure(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return _summarize(timings)
+
+def run_bench_suite(scales=(1, 10, 100), skill_counts=(1, 3, 6), llm_latency=0.05, repeats=5, top_k=10):
+    """Offline latency of every stage of the recommendation pipeline.
+
+    Stages: catalog load (CSV, snapshot, index build per scale), query
+    parsing (local parser and a stub LLM with ``llm_latency`` seconds per
+    call), each scoring component of ``recommend_assessments`` and the
+    whole call per scale and skill count, then top-k selection and the
+    response shaping of ``app.py``, as dicts and as joined JSON
+    fragments. Returns ``{"meta", "results"}`` with one flat
+    ``stage/component/...`` key per measurement.
+    """
+    from app import format_recommendations
+    from response_format import ResponseFragments
+    from catalog_snapshot import CatalogSnapshot, load_catalog_csv
+    from config import CATALOG, SCORING_WEIGHTS
+    from taxonomy import classify_skills, expand_technical_skills, match_job_level_category
+
+    results = {}
+    with quiet():
+        # --- Catalog load ---
+        results["catalog/csv"] = _measure(lambda: load_catalog_csv(CATALOG["csv"]), repeats)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.snap")
+            build_snapshot(CATALOG["csv"], CATALOG["urls"], path)
+            results["catalog/snapshot"] = _measure(lambda: CatalogSnapshot(path).to_dataframe(), repeats)
+
+        # --- Query parsing ---
+        model = StubModel(response={"skills": ["python", "sql"], "job_level": "mid", "duration_limit": 45},
+                          latency=llm_latency)
+        results["parse/local"] = _measure(
+            lambda: [recommender.local_parser.parse(query) for query in SAMPLE_QUERIES], repeats)
+        results["parse/llm"] = _measure(
+            lambda: recommender.parse_query(SAMPLE_QUERIES[0], model=model, cache=None, min_confidence=1.1),
+            max(1, repeats // 2))
+
+        for scale in scales:
+            df = replicate_catalog(recommender.shl_df, scale) if scale > 1 else recommender.shl_df
+            start = time.perf_counter()
+            engine = ScoringEngine(CatalogIndex(df))
+            results[f"catalog/index_build/scale={scale}"] = _summarize([time.perf_counter() - start])
+            fragments = ResponseFragments(engine.index.records, recommender.catalog_manager.current.urls)
+
+            for count in skill_counts:
+                filters = {"skills": BENCH_SKILLS[:count], "job_level": "mid", "duration_limit": 45}
+                technical, soft = classify_skills(filters["skills"])
+                technical = expand_technical_skills(technical)
+                key = f"scale={scale}/skills={count}"
+
+                components = {
+                    "technical_score": lambda: engine.technical_score(technical),
+                    "title_relevance": lambda: engine.title_relevance(technical),
+                    "inferred_score": lambda: engine.inferred_score(technical),
+                    "soft_skill_score": lambda: engine.soft_skill_score(soft),
+                    "description_match": lambda: engine.description_match_score(technical + soft),
+                    "job_level": lambda: engine.job_level_category_score(match_job_level_category("mid")),
+                    "duration": lambda: (engine.duration_match(45.0), engine.durations.mask_within(45.0)),
+                }
+                for name, fn in components.items():
+                    results[f"score/{name}/{key}"] = _measure(fn, repeats)
+                results[f"score/total/{key}"] = _measure(
+                    lambda: recommend_assessments(filters, engine=engine, top_k=top_k), repeats)
+
+                # --- Top-k and response shaping ---
+                score, description_match_score, keep = recommender.score_assessments(filters, engine)
+                results[f"respond/top_k/{key}"] = _measure(
+                    lambda: recommender.top_results(engine, score, description_match_score, keep, top_k), repeats)
+                top = recommender.top_results(engine, score, description_match_score, keep, top_k)
+                results[f"respond/format/{key}"] = _measure(lambda: format_recommendations(top), repeats)
+                rows = recommender.top_rows(score, description_match_score, keep, top_k)
+                results[f"respond/fragments/{key}"] = _measure(lambda: fragments.render(rows), repeats)
+
+    meta = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "catalog_rows": len(recommender.shl_df),
+        "scales": list(scales),
+        "skill_counts": list(skill_counts),
+        "llm_latency": llm_latency,
+        "repeats": repeats,
+        "scoring_weights": SCORING_WEIGHTS,
+    }
+    return {"meta": meta, "results": results}
+
+def compare_bench_results(current, baseline, tolerance=0.25, min_delta_ms=0.05, field="min_ms"):
+    """Measurements that got slower than the baseline by more than ``tolerance``.
+
+    Compares ``field`` of each measurement, the fastest run by default
+    since it is the least sensitive to other load on the machine.
+    Differences under ``min_delta_ms`` are timer noise and never count.
+    Returns ``(regressions, improvements)``, lists of
+    ``(key, baseline_ms, current_ms, ratio)``.
+    """
+    regressions, improvements = [], []
+    for key, stats in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if before is None:
+            continue
+        old, new = before[field], stats[field]
+        if abs(new - old) < min_delta_ms:
+            continue
+        ratio = round(new / old, 2) if old else float("inf")
+        if ratio > 1 + tolerance:
+            regressions.append((key, old, new, ratio))
+        elif ratio < 1 / (1 + tolerance):
+            improvements.append((key, old, new, ratio))
+    return regressions, improvements
+
+def _synthetic_eval_results(cases, rng, k=10):
+    results = []
+    for i in range(cases):
+        checks = {check: rng.random() > 0.15 for check in ("skills_pass", "job_level_pass", "duration_pass")}
+        recall = round(rng.random(), 3)
+        results.append({
+            "query": f"synthetic case {i}", "expected": {}, "extracted": {}, "checks": checks,
+            "passed": all(checks.values()), "top_recommendations": [],
+            "metrics": {f"recall@{k}": recall, f"ap@{k}": round(recall * rng.random(), 3)},
+        })
+    return results
+
+def bench_eval_dashboard(histories=(10, 100, 1000), cases=50, requests=50, seed=0):
+    """Dashboard latency as the run history grows, against the JSON files it used to re-read.
+
+    For each history size, ``histories`` runs of ``cases`` results are
+    written both as eval_results files and to an eval store. The old
+    path globs and re-reads the newest file per request; the store path
+    serves the page, the results API and the trend from its statistics
+    cache (``cold`` is the first request after a run lands).
+    """
+    import eval_dashboard
+    from eval_store import EvalStore
+    from starlette.requests import Request
+
+    rng = random.Random(seed)
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+    loop = asyncio.new_event_loop()
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        store = EvalStore(os.path.join(directory, "eval_runs.sqlite"))
+        eval_dashboard.store = store
+        written = 0
+        for history in histories:
+            for _ in range(history - written):
+                results = _synthetic_eval_results(cases, rng)
+                store.add_run(results, created_at=time.time() + written)
+                with open(os.path.join(directory, f"eval_results_{written:06d}.json"), "w") as f:
+                    json.dump(results, f)
+                written += 1
+
+            def read_json():
+                # What every dashboard request did before the store
+                newest = sorted(Path(directory).glob("eval_results*.json"), reverse=True)[0]
+                with open(newest) as f:
+                    results = json.load(f)
+                return sum(r["passed"] for r in results), {c: sum(r["checks"][c] for r in results)
+                                                           for c in ("skills_pass", "job_level_pass", "duration_pass")}
+
+            async def handle():
+                await eval_dashboard.dashboard(request)
+                await eval_dashboard.get_results()
+                await eval_dashboard.get_trend()
+
+            serve = lambda: loop.run_until_complete(handle())
+
+            eval_dashboard._stats_cache.update(version=None, entries={})
+            start = time.perf_counter()
+            serve()
+            cold = time.perf_counter() - start
+            _, warm = _time_call(serve, requests)
+            _, json_read = _time_call(read_json, requests)
+            report[history] = {"json_read_ms": round(json_read * 1000, 3), "store_cold_ms": round(cold * 1000, 3),
+                               "store_warm_ms": round(warm * 1000, 3)}
+    loop.close()
+    return report
+
+def _write_jobs(path, rows, distinct=500, seed=0):
+    """JSONL job descriptions drawn from ``distinct`` variants, so some repeat"""
+    rng = random.Random(seed)
+    skills = ["python", "java", "sql", "excel", "communication", "leadership", "javascript", "c++",
+              "sales", "accounting", "machine learning", "customer service"]
+    variants = [f"Hiring a {rng.choice(['junior', 'mid-level', 'senior'])} {rng.choice(['engineer', 'analyst', 'manager'])}"
+                f" with {rng.choice(skills)} and {rng.choice(skills)} skills, test within {rng.choice([20, 30, 45, 60])} minutes"
+                for _ in range(distinct)]
+    with open(path, "w") as f:
+        for i in range(rows):
+            f.write(json.dumps({"id": f"job-{i}", "description": rng.choice(variants)}) + "\n")
+
+def check_recommend_file(rows=3000, stop_after=1000, window=64, memo_entries=500, sizes=(1000, 4000)):
+    """Resume after an interruption and the memory bounds of ``recommend-file``.
+
+    A run is stopped after ``stop_after`` rows with ``limit``, a torn
+    line is appended past its checkpoint as a crash mid-write would leave
+    one, then the run is resumed: the output must equal that of an
+    uninterrupted run byte for byte. The parse window must never hold
+    more than ``window`` rows and the parse memo more than
+    ``memo_entries``, whatever the input size; peak traced memory per
+    input size is reported. Returns ``(failures, report)``.
+    """
+    import tracemalloc
+    from bulk import ParseMemo, parse_stage, read_jobs, recommend_file
+
+    failures, report = [], {}
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = os.path.join(directory, "jobs.jsonl")
+        _write_jobs(jobs, rows)
+        reference = os.path.join(directory, "reference.jsonl")
+        with quiet():
+            report["uninterrupted"] = recommend_file(jobs, reference, resume=False, min_confidence=0.0)
+
+        output = os.path.join(directory, "resumed.jsonl")
+        with quiet():
+            report["stopped"] = recommend_file(jobs, output, resume=False, min_confidence=0.0,
+                                               limit=stop_after, checkpoint_every=100)
+        with open(output + ".checkpoint") as f:
+            stopped_at = json.load(f)
+        if stopped_at.get("complete") or stopped_at["offset"] != stop_after:
+            failures.append(f"stopping after {stop_after} rows left the checkpoint {stopped_at}")
+        with open(output, "ab") as f:
+            f.write(b'{"id": "torn')
+
+        with quiet():
+            report["resumed"] = recommend_file(jobs, output, resume=True, min_confidence=0.0)
+        with open(reference, "rb") as a, open(output, "rb") as b:
+            if a.read() != b.read():
+                failures.append("resumed output differs from the uninterrupted run")
+        if report["resumed"]["resumed_from"] != stopped_at["offset"]:
+            failures.append(f"resumed from {report['resumed']['resumed_from']}, checkpoint said {stopped_at['offset']}")
+
+        # Rows read from the input but not yet handed on, at every step
+        read = handed_on = in_flight = 0
+
+        def counted(source):
+            nonlocal read
+            for job in source:
+                read += 1
+                yield job
+
+        with quiet():
+            for _ in parse_stage(counted(read_jobs(jobs)), ParseMemo(memo_entries), window=window,
+                                 min_confidence=0.0):
+                in_flight = max(in_flight, read - handed_on)
+                handed_on += 1
+        report["max_in_flight"] = in_flight
+        if in_flight > window:
+            failures.append(f"{in_flight} rows were in flight with a window of {window}")
+
+        peaks = {}
+        for size in sizes:
+            path = os.path.join(directory, f"jobs-{size}.jsonl")
+            _write_jobs(path, size, distinct=size)
+            tracemalloc.start()
+            with quiet():
+                summary = recommend_file(path, os.path.join(directory, f"out-{size}.jsonl"), resume=False,
+                                         min_confidence=0.0, window=window, memo_entries=memo_entries)
+            peaks[size] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            tracemalloc.stop()
+            if summary["parse_memo_entries"] > memo_entries:
+                failures.append(f"the parse memo held {summary['parse_memo_entries']} entries, "
+                                f"more than {memo_entries}")
+        report["peak_mb"] = peaks
+    return failures, report
+
+def bench_serialization(distinct=200, repeats=5, top_k=10, seed=0):
+    """Per-request cost of building the ``/recommend`` JSON body, dicts vs fragments.
+
+    ``dicts`` is the former path: result records of the top rows, the
+    response dicts of ``format_recommendations``, then ``jsonify``.
+    ``fragments`` joins the precomputed JSON of the same rows. Scoring is
+    done up front and not timed. Returns ``(failures, report)``, a
+    failure being a body that decodes differently between the paths.
+    """
+    from flask import jsonify
+    from app import app as flask_app, format_recommendations
+    from response_format import ResponseFragments, orjson
+
+    state = recommender.catalog_manager.current
+    engine = state.engine
+    with quiet():
+        ranked = []
+        for filters in SAMPLE_FILTERS + random_filters(distinct, seed=seed):
+            score, description_match_score, keep = recommender.score_assessments(filters, engine)
+            ranked.append((score, recommender.top_rows(score, description_match_score, keep, top_k)))
+
+    def dicts_body(score, rows):
+        results = [engine.index.result(row, int(score[row])) for row in rows]
+        return jsonify({"recommended_assessments": format_recommendations(results)}).get_data()
+
+    failures = []
+    with flask_app.app_context():
+        for score, rows in ranked:
+            if json.loads(dicts_body(score, rows)) != json.loads(state.fragments.render(rows)):
+                failures.append(f"bodies differ for rows {list(rows)}")
+
+        _, dicts_seconds = _time_call(lambda: [dicts_body(score, rows) for score, rows in ranked], repeats)
+    _, fragments_seconds = _time_call(lambda: [state.fragments.render(rows) for _, rows in ranked], repeats)
+    _, build_seconds = _time_call(lambda: ResponseFragments(engine.index.records, state.urls), repeats)
+
+    report = {
+        "requests": len(ranked),
+        "encoder": "orjson" if orjson is not None else "json",
+        "dicts_us": round(dicts_seconds / len(ranked) * 1e6, 1),
+        "fragments_us": round(fragments_seconds / len(ranked) * 1e6, 1),
+        "speedup": round(dicts_seconds / fragments_seconds, 1) if fragments_seconds else None,
+        # Paid once per catalog generation, not per request
+        "build_ms": round(build_seconds * 1000, 2),
+        "catalog_rows": len(engine.index.records),
+    }
+    return failures, report
+
+def check_test_types(rows=100_000, repeats=5, seed=0):
+    """Multi-label test types on the live catalog and the cost of the bit mask filter.
+
+    Reports the rows with several codes and checks that the analyst
+    sample query asks for and gets cognitive and personality tests. Times
+    the filter against a string match on a ``rows`` synthetic catalog.
+    Mask encoding, labels and batch parity are covered by
+    tests/test_assessment_types.py. Returns ``(failures, report)``.
+    """
+    from assessment_types import TEST_TYPE_BITS
+
+    failures, report = [], {}
+    engine = recommender.catalog_manager.current.engine
+    report["multi_label_rows"] = sum(len(set(str(value).upper().split())) > 1
+                                     for value in recommender.shl_df['test_type'])
+
+    analyst = SAMPLE_QUERIES[-1]
+    filters = recommender.local_parser.parse(analyst)[0]
+    report["analyst_test_types"] = filters["test_types"]
+    if filters["test_types"] != ["A", "P"]:
+        failures.append(f"analyst query extracted test types {filters['test_types']}")
+    with quiet():
+        results = recommend_assessments(filters, engine=engine)
+    if not all(set(str(r["test_type"]).split()) & {"A", "P"} for r in results):
+        failures.append("analyst query returned assessments without a cognitive or personality test")
+    report["analyst_kept_rows"] = int(recommender.score_assessments(filters, engine)[2].sum())
+
+    big = ScoringEngine(CatalogIndex(synthetic_catalog(rows, seed=seed)))
+    column = pd.Series(big.index.records).str["test_type"].astype(str)
+    mask = TEST_TYPE_BITS["A"] | TEST_TYPE_BITS["P"]
+    _, mask_seconds = _time_call(lambda: big.test_type_match(mask), repeats)
+    _, string_seconds = _time_call(lambda: column.str.contains(r"\b[AP]\b"), repeats)
+    report["rows"] = rows
+    report["mask_ms"] = round(mask_seconds * 1000, 3)
+    report["string_ms"] = round(string_seconds * 1000, 3)
+    report["speedup"] = round(string_seconds / mask_seconds, 1) if mask_seconds else None
+    return failures, report
+
+def bench_semantic(rows=100_000, dim=384, repeats=5, k=10, seed=0):
+    """Query latency of memory-mapped float32 and int8 stores of ``rows`` random vectors"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((rows, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = vectors[0]
+
+    report = {"rows": rows, "dim": dim}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, data in [("float32", vectors), ("int8", np.round(vectors * 127).astype(np.int8))]:
+            path = os.path.join(directory, name)
+            np.save(path + ".npy", data)
+            with open(path + ".json", "w") as f:
+                json.dump({"embedder": "random", "row_ids": list(range(rows)), "catalog_fingerprint": ""}, f)
+            store = VectorStore(path)
+            (found, _), elapsed = _time_call(lambda: store.search(query, k=k), repeats)
+            report[name] = {"ms": round(elapsed * 1000, 2), "mb": round(data.nbytes / 2**20, 1),
+                            "top1_is_self": bool(found[0] == 0)}
+    return report
+
+_COLD_START_PROBE = """
+import json, resource, time
+start = time.perf_counter()
+from catalog_snapshot import load_catalog, load_url_map
+from config import CATALOG
+loaded = time.perf_counter()
+df, version = load_catalog(CATALOG["csv"], CATALOG["snapshot"], url_path=CATALOG["urls"])
+urls = load_url_map(CATALOG["urls"], CATALOG["snapshot"])
+catalog = time.perf_counter() - loaded
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+import recommender
+total = time.perf_counter() - start
+print(json.dumps({"catalog_s": catalog, "import_s": total, "catalog_rss_mb": rss,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+def bench_cold_start(snapshot_path, runs=3):
+    """Worker start-up cost with and without the catalog snapshot.
+
+    Every run is a fresh interpreter, as a new gunicorn worker would be.
+    Reports the best catalog load time (CSV and URL map, or the snapshot,
+    once pandas and the config are imported), the time to import
+    ``recommender`` and the peak RSS after the catalog load and after the
+    import.
+    """
+    report = {}
+    for name, path in [("csv", ""), ("snapshot", snapshot_path)]:
+        env = dict(os.environ, CATALOG_SNAPSHOT=path, LLM_BACKEND="stub")
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", _COLD_START_PROBE], env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        report[name] = {
+            "catalog_ms": round(min(s["catalog_s"] for s in samples) * 1000, 1),
+            "import_ms": round(min(s["import_s"] for s in samples) * 1000, 1),
+            "catalog_rss_mb": round(min(s["catalog_rss_mb"] for s in samples), 1),
+            "rss_mb": round(min(s["rss_mb"] for s in samples), 1),
+        }
+    return report
+
+def _memory_kb(pid):
+    """Rss and Pss of a process from /proc (Linux), Pss splits shared pages between sharers"""
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Dirty", "Shared_Clean", "Shared_Dirty"):
+                memory[key] = int(value.split()[0])
+    return memory
+
+def _worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+def _wait_healthy(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become healthy")
+
+def _post(url, query):
+    body = json.dumps({"query": query}).encode("utf-8")
+    request = urllib.request.Request(url + "/recommend", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - start
+
+def load_test(worker_counts=(1, 2, 4), requests=400, concurrency=16, preload=True, port=8765):
+    """Serve app.py with gunicorn at several worker counts and measure it.
+
+    Uses gunicorn.conf.py with the stub model, so only local parsing and
+    scoring are exercised. For every worker count reports throughput,
+    p50/p99 latency and the average Rss and Pss per worker after the run.
+    """
+    url = f"http://127.0.0.1:{port}"
+    queries = [f"{query} {i}" for i in range(requests // len(SAMPLE_QUERIES) + 1) for query in SAMPLE_QUERIES][:requests]
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts:
+            env = dict(os.environ, WEB_CONCURRENCY=str(workers), PORT=str(port), LLM_BACKEND="stub",
+                       GUNICORN_PRELOAD="1" if preload else "0",
+                       QUERY_CACHE_PATH=os.path.join(directory, "query_cache.sqlite"))
+            server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+                                      env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                _wait_healthy(url)
+                # Every worker answers a few requests before measuring
+                with ThreadPoolExecutor(concurrency) as pool:
+                    list(pool.map(lambda q: _post(url, q), SAMPLE_QUERIES * workers))
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(concurrency) as pool:
+                    timings = list(pool.map(lambda q: _post(url, q), queries))
+                elapsed = time.perf_counter() - start
+
+                memory = [_memory_kb(pid) for pid in _worker_pids(server.pid)]
+                rows.append({
+                    "workers": workers,
+                    "preload": preload,
+                    "throughput_rps": round(len(queries) / elapsed, 1),
+                    **_percentiles(timings),
+                    "rss_mb": round(sum(m["Rss"] for m in memory) / len(memory) / 1024, 1),
+                    "pss_mb": round(sum(m["Pss"] for m in memory) / len(memory) / 1024, 1),
+                    "master_pss_mb": round(_memory_kb(server.pid)["Pss"] / 1024, 1),
+                })
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+    return rows
@@ -0,0 +1,226 @@
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from query_cache import normalize_query
+from recommender import parse_query, recommend_assessments, query_cache
+
+# Columns or keys read as the job description, in order of preference
+QUERY_FIELDS = ("query", "description", "job_description", "text")
+
+def _open_input(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+def _json_rows(f):
+    for line in f:
+        if not line.strip():
+            continue
+        if not line.lstrip().startswith("{"):
+            yield {"query": line.strip()}
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield e
+
+def _csv_rows(f):
+    rows = csv.DictReader(f)
+    while True:
+        try:
+            yield next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader carries on with the next line
+            yield e
+
+def read_jobs(path, fmt=None, column=None):
+    """``(offset, id, query, error)`` of every job description in a JSONL or CSV file, ``-`` for stdin.
+
+    Rows are read one at a time. ``offset`` counts input rows, so it
+    doubles as the resume position. Rows without a description are
+    yielded with an empty query and scored without filters. A row that
+    cannot be read keeps its offset and carries the error instead.
+    """
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    fields = (column,) if column else QUERY_FIELDS
+
+    with _open_input(path) as f:
+        rows = _csv_rows(f) if fmt == "csv" else _json_rows(f)
+        for offset, row in enumerate(rows):
+            if isinstance(row, Exception):
+                yield offset, offset, "", repr(row)
+                continue
+            query = next((row[field] for field in fields if row.get(field)), "")
+            yield offset, row.get("id", offset), query, None
+
+class ParseMemo:
+    """Bounded in-run LRU of parsed filters, keyed by the normalized description"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def parse(self, query, min_confidence=None):
+        key = normalize_query(query)
+        with self._lock:
+            filters = self._entries.get(key)
+            if filters is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return filters
+            self.misses += 1
+        filters = parse_query(query, min_confidence=min_confidence) if key else {}
+        with self._lock:
+            self._entries[key] = filters
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return filters
+
+def _result(entry):
+    offset, job_id, query, error, future = entry
+    if future is not None:
+        try:
+            return offset, job_id, query, future.result(), None
+        except Exception as e:
+            error = repr(e)
+    return offset, job_id, query, None, error
+
+def parse_stage(jobs, memo, workers=8, window=64, min_confidence=None):
+    """Parsed ``(offset, id, query, filters, error)`` in input order.
+
+    At most ``window`` descriptions are in flight at once: reading the
+    input waits for the oldest parse, so memory stays bounded whatever
+    the input size. A failed parse, or a row read with an error, has
+    ``filters`` None and the error set.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for offset, job_id, query, error in jobs:
+            future = pool.submit(memo.parse, query, min_confidence) if error is None else None
+            pending.append((offset, job_id, query, error, future))
+            if len(pending) >= window:
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+
+def score_stage(parsed, top_k=10, include_query=False):
+    """One output record per parsed description, an ``error`` record for a row that failed"""
+    for offset, job_id, query, filters, error in parsed:
+        record = {"id": job_id, "offset": offset}
+        if error is None:
+            try:
+                record.update(filters=filters, recommendations=recommend_assessments(filters, top_k=top_k))
+            except Exception as e:
+                error = repr(e)
+        if error is not None:
+            record["error"] = error
+        if include_query:
+            record["query"] = query
+        yield offset, record
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+def write_stage(records, output, checkpoint_path, start_offset=0, start_bytes=0, checkpoint_every=100):
+    """Append records to ``output`` as JSONL, checkpointing the next offset and file size.
+
+    The checkpoint is saved every ``checkpoint_every`` rows and when the
+    run stops for any reason, always after the lines it covers were
+    flushed. Returns the number of rows written and how many of them
+    are error records.
+    """
+    written = errors = 0
+    next_offset = start_offset
+    with open(output, "ab") as f:
+        # Lines past the last checkpoint came from an interrupted run, they are written again
+        f.truncate(start_bytes)
+        f.seek(start_bytes)
+        try:
+            for offset, record in records:
+                f.write(json.dumps(record).encode("utf-8") + b"\n")
+                written += 1
+                errors += "error" in record
+                next_offset = offset + 1
+                if written % checkpoint_every == 0:
+                    f.flush()
+                    save_checkpoint(checkpoint_path, {"offset": next_offset, "bytes": f.tell()})
+        finally:
+            f.flush()
+            save_checkpoint(checkpoint_path, {"offset": next_offset, "bytes": f.tell()})
+    return written, errors
+
+def recommend_file(input_path, output, fmt=None, column=None, top_k=10, workers=8, window=64,
+                   resume=True, checkpoint_every=100, min_confidence=None, include_query=False, limit=None,
+                   memo_entries=10000):
+    """Stream job descriptions from ``input_path`` to JSONL recommendations in ``output``.
+
+    read -> parse (concurrent, memoized, bounded window) -> score -> write,
+    chained as generators so only ``window`` rows are held at once. With
+    ``resume`` a run continues from the checkpoint left next to the output.
+    At most ``memo_entries`` parsed descriptions are remembered.
+    ``limit`` stops after that many rows. Rows that cannot be read,
+    parsed or scored are written as ``{"id", "offset", "error"}`` records
+    and the run goes on. A finished run marks its
+    checkpoint complete, so the next run starts over. Returns a
+    throughput summary.
+    """
+    checkpoint_path = output + ".checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint and checkpoint.get("complete"):
+        # The last run finished, start over and replace its output
+        checkpoint = None
+    start_offset = checkpoint["offset"] if checkpoint else 0
+    start_bytes = checkpoint["bytes"] if checkpoint else 0
+
+    memo = ParseMemo(memo_entries)
+    llm_hits, llm_misses = query_cache.hits, query_cache.misses
+    start = time.perf_counter()
+
+    jobs = (job for job in read_jobs(input_path, fmt, column) if job[0] >= start_offset)
+    if limit is not None:
+        jobs = itertools.islice(jobs, limit)
+    parsed = parse_stage(jobs, memo, workers=workers, window=window, min_confidence=min_confidence)
+    records = score_stage(parsed, top_k=top_k, include_query=include_query)
+    written, errors = write_stage(records, output, checkpoint_path, start_offset, start_bytes, checkpoint_every)
+
+    seconds = time.perf_counter() - start
+    checkpoint = load_checkpoint(checkpoint_path)
+    if limit is None or written < limit:
+        save_checkpoint(checkpoint_path, {**checkpoint, "complete": True})
+    lookups = memo.hits + memo.misses
+    llm_lookups = (query_cache.hits - llm_hits) + (query_cache.misses - llm_misses)
+    return {
+        "rows": written,
+        "errors": errors,
+        "resumed_from": start_offset,
+        "next_offset": checkpoint["offset"],
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(written / seconds, 1) if seconds else 0.0,
+        "parse_cache_hit_rate": round(memo.hits / lookups, 3) if lookups else 0.0,
+        "parse_memo_entries": len(memo),
+        "llm_cache_hit_rate": round((query_cache.hits - llm_hits) / llm_lookups, 3) if llm_lookups else None,
+    }
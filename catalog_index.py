@@ -0,0 +1,288 @@
+import re
+from bisect import bisect_right
+from itertools import chain
+import numpy as np
+import pandas as pd
+from durations import DurationIndex, parse_assessment_lengths
+from assessment_types import parse_test_types
+
+_WORD_CHAR = re.compile(r'\w')
+TOKEN_PATTERN = re.compile(r'\w+')
+_WORDS_ONLY = re.compile(r'\w+(?: \w+)*')
+_WORD_SPLIT = re.compile(r'(\w+)')
+
+# Columns returned for every recommended assessment
+RESULT_COLUMNS = [
+    'title', 'description', 'job_levels', 'language',
+    'assessment_length', 'test_type', 'remote_testing', 'adaptive/irt'
+]
+
+class TextColumn:
+    """A lowercased catalog column joined into one newline-separated string.
+
+    A literal pattern can never match across the separator, so a single
+    regex scan over the joined text gives the same per-row answers as one
+    scan per row, and match offsets map back to row ids with a binary search.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.size = len(self.values)
+        self.blob = "\n".join(self.values)
+        lengths = np.fromiter((len(v) for v in self.values), dtype=np.int64, count=self.size)
+        self.starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1])).astype(np.int64)
+        self.row_starts = self.starts.tolist()
+
+    def match_rows(self, pattern):
+        """Row id of every non-overlapping match of ``pattern``"""
+        positions = np.fromiter((m.start() for m in pattern.finditer(self.blob)), dtype=np.int64)
+        return np.searchsorted(self.starts, positions, side='right') - 1
+
+    def contains_word(self, term):
+        """Rows where ``re.search(r'\\b' + re.escape(term) + r'\\b', row)`` matches"""
+        if not term or "\n" in term:
+            found = np.zeros(self.size, dtype=bool)
+            found[self.match_rows(word_pattern(term))] = True
+            return found
+
+        # A leading \b stops the regex engine from scanning for the literal
+        # prefix, so search with the trailing \b only and check the leading one here
+        pattern = re.compile(re.escape(term) + r'\b')
+        starts_with_word = _WORD_CHAR.match(term) is not None
+        row_starts = self.row_starts
+
+        found = np.zeros(self.size, dtype=bool)
+        pos = 0
+        while True:
+            match = pattern.search(self.blob, pos)
+            if match is None:
+                break
+            start = match.start()
+            after_word = start > 0 and _WORD_CHAR.match(self.blob, start - 1) is not None
+            if after_word == starts_with_word:
+                # No boundary here, an overlapping occurrence may still match
+                pos = start + 1
+                continue
+            row = bisect_right(row_starts, start) - 1
+            found[row] = True
+            if row + 1 >= self.size:
+                break
+            pos = row_starts[row + 1]
+        return found
+
+    def contains(self, term):
+        """Rows where ``term in row``"""
+        found = np.zeros(self.size, dtype=bool)
+        found[self.match_rows(literal_pattern(term))] = True
+        return found
+
+    def count(self, term):
+        """``row.count(term)`` for every row"""
+        return np.bincount(self.match_rows(literal_pattern(term)), minlength=self.size)
+
+def literal_pattern(term):
+    return re.compile(re.escape(term))
+
+def word_pattern(term):
+    return re.compile(r'\b' + re.escape(term) + r'\b')
+
+class InvertedIndex:
+    """Postings from word tokens and adjacent-word bigrams to catalog rows.
+
+    Terms follow ``tokenize_term``: single words plus pairs of adjacent words
+    joined by one space. Words are runs of ``\\w`` characters so a posting
+    list answers the word-boundary regex used by the scorers exactly; a
+    bigram is only recorded when the two words are separated by exactly one
+    space, as in a multi-word skill. Queries touch only the rows that can
+    contain the term and report zero for every other row.
+
+    Offers the same ``contains_word``/``contains``/``count`` interface as
+    ``TextColumn``, which it falls back to when a term is too common for
+    pruning to pay off.
+    """
+
+    # Above this share of candidate rows a single scan of the column is cheaper
+    DENSE_FRACTION = 0.25
+
+    def __init__(self, column, tokenized=None):
+        self.column = column
+        self.size = column.size
+
+        if tokenized is None:
+            tokenized = [tokenize_text(value) for value in column.values]
+        terms_per_row = [tokens + bigrams for tokens, bigrams in tokenized]
+
+        lengths = np.fromiter((len(terms) for terms in terms_per_row), dtype=np.int64, count=self.size)
+        codes, uniques = pd.factorize(pd.Series(list(chain.from_iterable(terms_per_row)), dtype=object))
+        rows = np.repeat(np.arange(self.size, dtype=np.int64), lengths)
+
+        # Compressed sparse postings: rows of term t are rows[offsets[t]:offsets[t + 1]].
+        # Encoding (term, row) as one integer sorts by term then row and drops repeats
+        stride = max(self.size, 1)
+        pairs = np.unique(codes.astype(np.int64) * stride + rows)
+        self.rows = (pairs % stride).astype(np.int32)
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(pairs // stride, minlength=len(uniques)))))
+        self.term_ids = {term: i for i, term in enumerate(uniques)}
+
+        self.vocabulary = [term for term in self.term_ids if ' ' not in term]
+        self.vocabulary_column = TextColumn(self.vocabulary)
+        self._substring_cache = {}
+
+    def postings(self, term):
+        """Sorted row ids containing the word or bigram ``term``"""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return np.zeros(0, dtype=np.int32)
+        return self.rows[self.offsets[term_id]:self.offsets[term_id + 1]]
+
+    def _intersect(self, terms):
+        rows = None
+        for term in terms:
+            found = self.postings(term)
+            rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+            if len(rows) == 0:
+                break
+        return rows
+
+    def _mask(self, rows):
+        found = np.zeros(self.size, dtype=bool)
+        found[rows] = True
+        return found
+
+    def word_candidates(self, term):
+        """Rows that may contain ``term`` as a whole word, None for all rows"""
+        words = TOKEN_PATTERN.findall(term)
+        if not words:
+            return None
+        if _WORDS_ONLY.fullmatch(term):
+            words = term.split(' ')
+            if len(words) > 1:
+                # Adjacent words of the phrase must show up as bigrams
+                words = [f"{a} {b}" for a, b in zip(words, words[1:])]
+        # Every word of a whole-word match is a complete token of the row
+        return self._intersect(words)
+
+    def substring_candidates(self, term):
+        """Rows that may contain ``term`` as a substring, None for all rows"""
+        words = TOKEN_PATTERN.findall(term)
+        if not words:
+            return None
+        # Any occurrence of term puts its longest word inside a single token
+        longest = max(words, key=len)
+        if longest not in self._substring_cache:
+            tokens = np.unique(self.vocabulary_column.match_rows(literal_pattern(longest)))
+            rows = [self.postings(self.vocabulary[t]) for t in tokens]
+            self._substring_cache[longest] = (np.unique(np.concatenate(rows)) if rows
+                                              else np.zeros(0, dtype=np.int32))
+        return self._substring_cache[longest]
+
+    def _is_dense(self, candidates):
+        return candidates is None or len(candidates) > self.size * self.DENSE_FRACTION
+
+    def contains_word(self, term):
+        """Rows where ``re.search(r'\\b' + re.escape(term) + r'\\b', row)`` matches"""
+        if not term or "\n" in term:
+            return self.column.contains_word(term)
+        candidates = self.word_candidates(term)
+        if candidates is None:
+            return self.column.contains_word(term)
+        if _WORDS_ONLY.fullmatch(term) and term.count(' ') <= 1:
+            # A word or bigram posting is already an exact answer
+            return self._mask(candidates)
+        # Verify the remaining candidates, most fail the cheap substring test
+        pattern = word_pattern(term)
+        values = self.column.values
+        return self._mask([row for row in candidates
+                           if term in values[row] and pattern.search(values[row])])
+
+    def contains(self, term):
+        """Rows where ``term in row``"""
+        candidates = self.substring_candidates(term)
+        if self._is_dense(candidates):
+            return self.column.contains(term)
+        values = self.column.values
+        return self._mask([row for row in candidates if term in values[row]])
+
+    def count(self, term):
+        """``row.count(term)`` for every row"""
+        candidates = self.substring_candidates(term)
+        if self._is_dense(candidates):
+            return self.column.count(term)
+        counts = np.zeros(self.size, dtype=np.int64)
+        values = self.column.values
+        for row in candidates:
+            counts[row] = values[row].count(term)
+        return counts
+
+def tokenize_text(text):
+    """Word tokens of ``text`` and the bigrams of words separated by one space"""
+    parts = _WORD_SPLIT.split(text)
+    tokens = parts[1::2]
+    gaps = parts[2::2]
+    bigrams = [f"{a} {b}" for a, gap, b in zip(tokens, gaps, tokens[1:]) if gap == ' ']
+    return tokens, bigrams
+
+class CatalogIndex:
+    """Read-only, precomputed view of the catalog shared by every request.
+
+    Built once when the catalog is loaded. Holds the lowercased title,
+    description and job level text with their tokens and inverted
+    postings, a bit mask of the test types of every row and its display
+    record, so scoring never has to copy the DataFrame or rebuild strings.
+
+    Given the ``previous`` index of an earlier catalog, rows whose text did
+    not change reuse its tokenization, so a catalog refresh only tokenizes
+    added and updated rows before the postings are laid out again.
+    """
+
+    FIELDS = ('title', 'description', 'job_levels')
+
+    def __init__(self, df, previous=None):
+        self.size = len(df)
+
+        titles = df['title'].astype(str)
+        descriptions = df['description'].astype(str)
+
+        self.title = TextColumn(titles.str.lower())
+        self.description = TextColumn(descriptions.str.lower())
+        self.job_levels = TextColumn(df['job_levels'].astype(str).str.lower())
+        # Title and description together, as the skill matchers see them
+        self.text = TextColumn((titles + " " + descriptions).str.lower())
+
+        self.titles = titles.tolist()
+        self.description_length = descriptions.str.len().to_numpy()
+        lengths = df['assessment_length']
+        if pd.api.types.is_numeric_dtype(lengths):
+            self.assessment_length = lengths.to_numpy(dtype=np.float64)
+        else:
+            self.assessment_length, _ = parse_assessment_lengths(lengths)
+        self.durations = DurationIndex(self.assessment_length)
+
+        tokenized = {}
+        self.reused_rows = 0
+        for field in self.FIELDS + ('text',):
+            known = {}
+            if previous is not None:
+                known = dict(zip(previous.field(field).values, previous.tokenized[field]))
+            tokenized[field] = [known.get(value) or tokenize_text(value) for value in self.field(field).values]
+            if field == 'text':
+                self.reused_rows = sum(value in known for value in self.text.values)
+        self.tokenized = tokenized
+        self.inverted = {field: InvertedIndex(self.field(field), tokenized[field]) for field in tokenized}
+
+        # One bit per test type code, "C P" sets two
+        self.test_type_mask = parse_test_types(df['test_type'])
+
+        self.records = df[RESULT_COLUMNS].fillna("N/A").to_dict(orient='records')
+
+    def __len__(self):
+        return self.size
+
+    def field(self, name):
+        return getattr(self, name)
+
+    def result(self, row, score):
+        """Display record of ``row`` with its score attached"""
+        record = dict(self.records[row])
+        record['score'] = score
+        return record
@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+import pandas as pd
+from catalog_index import CatalogIndex
+from catalog_snapshot import build_snapshot, load_catalog, load_url_map
+from local_parser import LocalQueryParser
+from metrics import Histogram
+from response_format import ResponseFragments
+from scoring import ScoringEngine
+from semantic import get_embedder, load_vector_store
+
+# Wall time of catalog reloads, labelled incremental, unchanged or failed
+CATALOG_RELOAD = Histogram("catalog_reload_seconds", buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+                           label_name="result")
+
+def diff_catalogs(old_df, new_df, key="title"):
+    """``{"added", "removed", "updated"}`` lists of ``key`` values between two catalogs"""
+    columns = [c for c in new_df.columns if c in old_df.columns]
+    old = dict(zip(old_df[key], pd.util.hash_pandas_object(old_df[columns].astype(str), index=False)))
+    new = dict(zip(new_df[key], pd.util.hash_pandas_object(new_df[columns].astype(str), index=False)))
+    return {
+        "added": [k for k in new if k not in old],
+        "removed": [k for k in old if k not in new],
+        "updated": [k for k in new if k in old and old[k] != new[k]],
+    }
+
+class CatalogState:
+    """One immutable generation of the catalog and everything built from it.
+
+    Requests take ``manager.current`` once and use that state throughout,
+    so a reload never changes the catalog under a running request. The
+    vector store is opened on first use, or carried forward incrementally
+    by a reload when the previous generation had one.
+    """
+
+    def __init__(self, df, version, urls, semantic_config, previous=None):
+        self.df = df
+        self.version = version
+        self.urls = urls
+        self.loaded_at = time.time()
+        self.semantic_config = semantic_config
+
+        self.index = CatalogIndex(df, previous=previous.index if previous else None)
+        self.engine = ScoringEngine(self.index)
+        self.parser = LocalQueryParser(self.index.titles)
+        # Response objects of every row, rendered once for this generation's URLs
+        self.fragments = ResponseFragments(self.index.records, urls)
+
+        self.embedder = None
+        self._vector_store = None
+        self._vector_lock = threading.Lock()
+
+    def vector_store(self, previous=None):
+        """Catalog embeddings of this generation, built from ``previous`` when stale"""
+        with self._vector_lock:
+            if self._vector_store is None:
+                config = self.semantic_config
+                self.embedder = get_embedder(config["embedder"])
+                self._vector_store = load_vector_store(self.df, self.embedder, config["path"],
+                                                       quantize=config["quantize"], previous=previous)
+            return self._vector_store
+
+    def has_vector_store(self):
+        return self._vector_store is not None
+
+class CatalogManager:
+    """Owns the live catalog and swaps in new generations without a restart.
+
+    ``reload`` reads the sources again, diffs them against the live
+    catalog by title and, when anything changed, builds the next
+    generation off to the side: unchanged rows reuse their tokenization
+    and embeddings, only added and updated rows are processed. The new
+    state then replaces ``current`` in a single reference assignment
+    (read-copy-update): requests already running finish on the generation
+    they started with, which is freed once the last of them drops it.
+
+    ``watch`` polls the source files and the snapshot and reloads when
+    they change; ``subscribe`` registers callbacks run after every swap.
+    """
+
+    def __init__(self, csv_path, url_path, snapshot_path, semantic_config):
+        self.csv_path = csv_path
+        self.url_path = url_path
+        self.snapshot_path = snapshot_path
+        self.semantic_config = semantic_config
+
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._watcher_pid = None
+        self._stop = threading.Event()
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_report = None
+
+        self._stamps = self.source_stamps()
+        df, version = load_catalog(csv_path, snapshot_path, url_path=url_path)
+        self.current = CatalogState(df, version, load_url_map(url_path, snapshot_path), semantic_config)
+
+    def subscribe(self, callback):
+        """Run ``callback(state)`` after every swap"""
+        self._listeners.append(callback)
+
+    def source_stamps(self):
+        """Size and mtime of every file the catalog is read from"""
+        stamps = {}
+        for path in (self.csv_path, self.url_path, self.snapshot_path):
+            if path and os.path.exists(path):
+                stat = os.stat(path)
+                stamps[path] = (stat.st_size, stat.st_mtime_ns)
+        return stamps
+
+    def changed(self):
+        return self.source_stamps() != self._stamps
+
+    def reload(self, rebuild_snapshot=False, force=False):
+        """Load the sources again and swap in a new generation if they changed.
+
+        ``rebuild_snapshot`` first compiles the CSV and URL map into the
+        snapshot, whose new mtime other workers' watchers then pick up.
+        Returns a report of the diff and timings. Failures leave the live
+        catalog untouched.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            old = self.current
+            report = {"version": old.version, "swapped": False}
+            try:
+                if rebuild_snapshot and self.snapshot_path:
+                    build_snapshot(self.csv_path, self.url_path, self.snapshot_path)
+                stamps = self.source_stamps()
+                df, version = load_catalog(self.csv_path, self.snapshot_path, refresh=True, url_path=self.url_path)
+                urls = load_url_map(self.url_path, self.snapshot_path)
+
+                diff = diff_catalogs(old.df, df)
+                report.update({key: len(titles) for key, titles in diff.items()})
+                report["urls_changed"] = urls != old.urls
+                unchanged = not any(diff.values()) and not report["urls_changed"] and version == old.version
+
+                if unchanged and not force:
+                    label = "unchanged"
+                else:
+                    state = CatalogState(df, version, urls, self.semantic_config, previous=old)
+                    report["reused_rows"] = state.index.reused_rows
+                    if old.has_vector_store():
+                        manifest = state.vector_store(previous=old.vector_store()).manifest
+                        report["embedded_rows"] = manifest.get("embedded_rows")
+                    self.current = state
+                    report.update({"version": version, "swapped": True})
+                    label = "incremental"
+                    for callback in self._listeners:
+                        callback(state)
+                self._stamps = stamps
+            except Exception as e:
+                print(f"Catalog reload failed, keeping version {old.version}: {e}")
+                self.failures += 1
+                report["error"] = str(e)
+                label = "failed"
+
+            seconds = time.perf_counter() - start
+            CATALOG_RELOAD.observe(label, seconds)
+            self.reloads += 1
+            report["seconds"] = round(seconds, 3)
+            self.last_report = report
+            print(f"Catalog reload ({label}): {report}")
+            return report
+
+    def watch(self, interval=5.0):
+        """Poll the catalog files every ``interval`` seconds from a daemon thread.
+
+        Threads do not survive a fork, so each worker starts its own.
+        """
+        if self._watcher is not None and self._watcher_pid == os.getpid() and self._watcher.is_alive():
+            return self._watcher
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                if self.changed():
+                    self.reload()
+
+        self._watcher = threading.Thread(target=run, name="catalog-watcher", daemon=True)
+        self._watcher_pid = os.getpid()
+        self._watcher.start()
+        return self._watcher
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        return {
+            "version": self.current.version,
+            "rows": len(self.current.df),
+            "loaded_at": self.current.loaded_at,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_reload": self.last_report,
+            "latency": CATALOG_RELOAD.snapshot(),
+        }
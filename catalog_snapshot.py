@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from durations import parse_assessment_lengths
+
+MAGIC = b"SHLCAT\x00\x01"
+FORMAT_VERSION = 1
+_ALIGN = 64
+# Joins the strings of a column, catalog text never contains it
+_SEPARATOR = "\x1f"
+
+def load_catalog_csv(path="shl_clean.csv"):
+    """Catalog DataFrame from the scraped CSV with normalized columns and parsed durations"""
+    df = pd.read_csv(path, encoding='latin1')
+    df = df.rename(columns=lambda x: x.strip().lower().replace(" ", "_"))
+
+    if "topic" in df.columns:
+        df = df.rename(columns={"topic": "title"})
+
+    if "assessment_length" in df.columns:
+        # Values read "Approximate Completion Time in minutes = 30", parse them to
+        # minutes once. Unknown, untimed and variable durations stay NaN so they
+        # never pass a duration limit
+        minutes, kinds = parse_assessment_lengths(df["assessment_length"])
+        df["assessment_length"] = minutes
+        df["duration_kind"] = kinds
+    return df
+
+def load_url_map_text(path="final.txt"):
+    """Title => URL mapping from the scraper's ``final.txt``"""
+    mappings = {}
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            for line in file:
+                line = line.strip()
+                if "=>" in line:
+                    title, url = line.split("=>", 1)
+                    mappings[title.strip()] = url.strip()
+    return mappings
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {"path": path, "size": stat.st_size, "mtime": stat.st_mtime}
+
+def _catalog_version(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def build_snapshot(csv_path="shl_clean.csv", url_path="final.txt", out_path=".cache/catalog.snap"):
+    """Compile the catalog CSV and the URL map into one binary snapshot.
+
+    Layout: magic, header length, JSON header, then 64-byte aligned blobs.
+    Numeric columns are raw little-endian arrays, text columns one UTF-8
+    string table joined by a separator plus a null mask. The header records
+    the catalog version and the size and mtime of both sources so a stale
+    snapshot is detected without parsing the CSV.
+    """
+    df = load_catalog_csv(csv_path)
+    urls = load_url_map_text(url_path)
+    sources = [p for p in (csv_path, url_path) if os.path.exists(p)]
+
+    blobs = []
+    columns = []
+    offset = 0
+
+    def add(data):
+        nonlocal offset
+        spec = {"offset": offset, "length": len(data)}
+        blobs.append(data)
+        offset += len(data)
+        padding = -offset % _ALIGN
+        blobs.append(b"\x00" * padding)
+        offset += padding
+        return spec
+
+    def add_strings(values):
+        values = list(values)
+        nulls = np.array([v is None or (isinstance(v, float) and np.isnan(v)) for v in values], dtype=np.uint8)
+        texts = ["" if null else str(v) for v, null in zip(values, nulls)]
+        if any(_SEPARATOR in text for text in texts):
+            raise ValueError("catalog text contains the snapshot separator")
+        return {"data": add(_SEPARATOR.join(texts).encode("utf-8")), "nulls": add(nulls.tobytes())}
+
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns.append({"name": name, "type": "category", **add_strings(series.astype(object))})
+        elif pd.api.types.is_float_dtype(series):
+            columns.append({"name": name, "type": "float64",
+                            "values": add(series.to_numpy(dtype="<f8").tobytes())})
+        else:
+            columns.append({"name": name, "type": "string", **add_strings(series.astype(object))})
+
+    header = {
+        "format": FORMAT_VERSION,
+        "catalog_version": _catalog_version(sources),
+        "built_at": time.time(),
+        "rows": len(df),
+        "sources": {"csv": _source_stamp(csv_path),
+                    "urls": _source_stamp(url_path) if os.path.exists(url_path) else None},
+        "columns": columns,
+        "url_map": {"titles": add_strings(urls.keys()), "urls": add_strings(urls.values())},
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix = MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes
+    prefix += b"\x00" * (-len(prefix) % _ALIGN)
+
+    directory = os.path.dirname(out_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".snap", delete=False) as f:
+        f.write(prefix)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(f.name, out_path)
+    return header
+
+class CatalogSnapshot:
+    """A catalog snapshot memory-mapped from disk.
+
+    Only the header is parsed on open. Numeric columns are zero-copy views
+    of the mapping and text columns are decoded when first asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self._buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        (header_length,) = struct.unpack("<Q", bytes(self._buffer[len(MAGIC):len(MAGIC) + 8]))
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(self._buffer[start:start + header_length]))
+        if self.header["format"] != FORMAT_VERSION:
+            raise ValueError(f"{path} has snapshot format {self.header['format']}, expected {FORMAT_VERSION}")
+        self._data_start = start + header_length + (-(start + header_length) % _ALIGN)
+        self._decoded = {}
+
+        self.rows = self.header["rows"]
+        self.catalog_version = self.header["catalog_version"]
+
+    def _bytes(self, spec):
+        begin = self._data_start + spec["offset"]
+        return self._buffer[begin:begin + spec["length"]]
+
+    def _strings(self, spec, count):
+        text = bytes(self._bytes(spec["data"])).decode("utf-8")
+        values = text.split(_SEPARATOR) if count else []
+        nulls = self._bytes(spec["nulls"])
+        # Missing text reads back as NaN, as pandas gives it from the CSV
+        return [np.nan if null else value for value, null in zip(values, nulls)]
+
+    def is_fresh(self):
+        """Whether the source files still match the ones the snapshot was built from"""
+        for stamp in self.header["sources"].values():
+            if stamp is None:
+                continue
+            if not os.path.exists(stamp["path"]):
+                continue
+            stat = os.stat(stamp["path"])
+            if stat.st_size != stamp["size"] or stat.st_mtime != stamp["mtime"]:
+                return False
+        return True
+
+    def column(self, name):
+        if name not in self._decoded:
+            spec = next(c for c in self.header["columns"] if c["name"] == name)
+            if spec["type"] == "float64":
+                values = self._bytes(spec["values"]).view("<f8")
+            elif spec["type"] == "category":
+                values = pd.Categorical(self._strings(spec, self.rows))
+            else:
+                values = np.array(self._strings(spec, self.rows), dtype=object)
+            self._decoded[name] = values
+        return self._decoded[name]
+
+    def to_dataframe(self):
+        columns = [spec["name"] for spec in self.header["columns"]]
+        return pd.DataFrame({name: self.column(name) for name in columns}, columns=columns)
+
+    def url_map(self):
+        if "__url_map__" not in self._decoded:
+            spec = self.header["url_map"]
+            count = int(len(self._bytes(spec["titles"]["nulls"])))
+            titles = self._strings(spec["titles"], count)
+            urls = self._strings(spec["urls"], count)
+            self._decoded["__url_map__"] = dict(zip(titles, urls))
+        return self._decoded["__url_map__"]
+
+_snapshots = {}
+
+def open_snapshot(path, refresh=False):
+    """Shared snapshot at ``path``, None when it is missing, invalid or stale.
+
+    ``refresh`` opens the file again, after it was rebuilt.
+    """
+    if path in _snapshots and not refresh:
+        return _snapshots[path]
+    snapshot = None
+    if path and os.path.exists(path):
+        try:
+            snapshot = CatalogSnapshot(path)
+            if not snapshot.is_fresh():
+                print(f"Catalog snapshot {path} is older than its sources, falling back to CSV")
+                snapshot = None
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"Could not open catalog snapshot {path}: {e}")
+            snapshot = None
+    _snapshots[path] = snapshot
+    return snapshot
+
+def load_catalog(csv_path="shl_clean.csv", snapshot_path=".cache/catalog.snap", refresh=False, url_path="final.txt"):
+    """``(catalog DataFrame, catalog version)`` from the snapshot, or from the CSV without one.
+
+    Without a snapshot the version hashes the CSV and the URL map, like
+    ``build_snapshot`` does, so a changed URL is a new version too.
+    """
+    snapshot = open_snapshot(snapshot_path, refresh)
+    if snapshot is not None:
+        return snapshot.to_dataframe(), snapshot.catalog_version
+    sources = [p for p in (csv_path, url_path) if p and os.path.exists(p)]
+    return load_catalog_csv(csv_path), _catalog_version(sources)
+
+def load_url_map(url_path="final.txt", snapshot_path=".cache/catalog.snap", refresh=False):
+    """Title => URL mapping from the snapshot, or from ``final.txt`` without one"""
+    snapshot = open_snapshot(snapshot_path, refresh)
+    if snapshot is not None:
+        return snapshot.url_map()
+    return load_url_map_text(url_path)
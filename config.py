@@ -1,4 +1,6 @@
 import os
+import json
+import time
 from dotenv import load_dotenv
 import google.generativeai as genai
 
@@ -11,14 +13,157 @@ SCORING_WEIGHTS = {
     "soft_skill_score": 2
 }
 
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+# Catalog sources and the binary snapshot built from them by `runner.py build-catalog`.
+# Set CATALOG_SNAPSHOT to an empty string to always parse the CSV. With
+# CATALOG_WATCH_INTERVAL set, every worker polls these files and reloads on change
+CATALOG = {
+    "csv": os.getenv("CATALOG_CSV", "shl_clean.csv"),
+    "urls": os.getenv("CATALOG_URLS", "final.txt"),
+    "snapshot": os.getenv("CATALOG_SNAPSHOT", ".cache/catalog.snap"),
+    "watch_interval": float(os.getenv("CATALOG_WATCH_INTERVAL", "0")),
+}
+
+# Catalog crawler: listing URL, progress and validator store, requests per
+# second across all threads and concurrent product page fetches
+CRAWLER = {
+    "base_url": os.getenv("CRAWLER_BASE_URL", "https://www.shl.com/solutions/products/product-catalog/"),
+    "state_path": os.getenv("CRAWLER_STATE_PATH", ".cache/crawl_state.sqlite"),
+    "rate": float(os.getenv("CRAWLER_RATE", "2.0")),
+    "workers": int(os.getenv("CRAWLER_WORKERS", "8")),
+}
+
+# Level of the application loggers, DEBUG logs prompts, responses and parsed filters
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Trace export: backend (langsmith, jsonl, http or none; langsmith when an API key
+# is set), JSONL file, collector URL, queue bound and batching of the export thread
+TRACING = {
+    "backend": os.getenv("TRACE_BACKEND", "langsmith" if os.getenv("LANGCHAIN_API_KEY") else "jsonl"),
+    "path": os.getenv("TRACE_PATH", ".cache/traces.jsonl"),
+    "url": os.getenv("TRACE_COLLECTOR_URL", "http://localhost:4318/v1/spans"),
+    "max_queue": int(os.getenv("TRACE_QUEUE_SIZE", "10000")),
+    "batch_size": int(os.getenv("TRACE_BATCH_SIZE", "100")),
+    "flush_interval": float(os.getenv("TRACE_FLUSH_INTERVAL", "1.0")),
+}
+
+# Token expected in the X-Admin-Token header of admin endpoints, unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Skill, role and job level vocabularies
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", "taxonomy.json")
+
+# Cache of filters extracted by parse_query_with_gemini
+QUERY_CACHE = {
+    "path": os.getenv("QUERY_CACHE_PATH", ".cache/query_cache.sqlite"),
+    "max_entries": int(os.getenv("QUERY_CACHE_SIZE", "1024")),
+    "ttl": int(os.getenv("QUERY_CACHE_TTL", str(24 * 3600))),
+}
+
+# Evaluation runs and per-case results, read by the eval dashboard
+EVAL_STORE_PATH = os.getenv("EVAL_STORE_PATH", ".cache/eval_runs.sqlite")
+
+# Rendered recommendation payloads, keyed by canonical filters and the catalog version
+RESPONSE_CACHE = {
+    "max_entries": int(os.getenv("RESPONSE_CACHE_SIZE", "2048")),
+}
+
+# Queries the local rule-based parser answers with at least this confidence skip the LLM
+LOCAL_PARSER_MIN_CONFIDENCE = float(os.getenv("LOCAL_PARSER_MIN_CONFIDENCE", "0.75"))
+
+# Async Gemini client used by the API: deadline per extraction, in-flight limit,
+# and a hedged second request after HEDGE_AFTER seconds (unset: observed p95)
+LLM_CLIENT = {
+    "timeout": float(os.getenv("LLM_TIMEOUT", "8.0")),
+    "max_in_flight": int(os.getenv("LLM_MAX_IN_FLIGHT", "16")),
+    "hedge": os.getenv("LLM_HEDGE", "1") == "1",
+    "hedge_after": float(os.getenv("LLM_HEDGE_AFTER")) if os.getenv("LLM_HEDGE_AFTER") else None,
+}
+
+# Largest number of queries accepted by one /recommend/batch request
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "100"))
+
+# Semantic retrieval: embedder ("hashing" or "minilm"), vector store path
+# (without extension) and the keyword share of hybrid scores
+SEMANTIC = {
+    "embedder": os.getenv("SEMANTIC_EMBEDDER", "hashing"),
+    "path": os.getenv("SEMANTIC_STORE_PATH", ".cache/catalog_vectors"),
+    "quantize": os.getenv("SEMANTIC_QUANTIZE", "0") == "1",
+    "keyword_weight": float(os.getenv("SEMANTIC_KEYWORD_WEIGHT", "0.5")),
+}
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Offline stand-in for the Gemini model.
+
+    Returns ``response`` (or empty filters) for every prompt and counts the
+    calls, so cache hit rates and latency can be measured without network.
+    ``latency`` is seconds per call, or a callable returning them to inject
+    a latency distribution.
+    """
+
+    model_name = "stub"
+
+    def __init__(self, response=None, latency=0.0):
+        self.response = response if response is not None else {"skills": [], "job_level": None, "duration_limit": None}
+        self.latency = latency
+        self.calls = 0
+
+    def _delay(self):
+        return self.latency() if callable(self.latency) else self.latency
+
+    def _respond(self, prompt):
+        response = self.response(prompt) if callable(self.response) else self.response
+        return StubResponse(json.dumps(response))
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._respond(prompt)
+
+    async def generate_content_async(self, prompt):
+        import asyncio
+
+        self.calls += 1
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(prompt)
+
+# One model client per process: created on first use and again after a fork,
+# since gRPC channels must not be shared between a gunicorn master and its workers
+_model = None
+_model_pid = None
+
 def get_model():
     """Get the Gemini model with proper API key configuration"""
+    global _model, _model_pid
+    if _model is not None and _model_pid == os.getpid():
+        return _model
+
     import google.generativeai as genai
-    
-    # Get API key from environment variable
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable not set")
-    
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("gemini-1.5-flash")
\ No newline at end of file
+
+    if os.getenv("LLM_BACKEND") == "stub":
+        _model = StubModel()
+    else:
+        # Get API key from environment variable
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY environment variable not set")
+
+        genai.configure(api_key=api_key)
+        _model = genai.GenerativeModel(MODEL_NAME)
+    _model_pid = os.getpid()
+    return _model
+
+def reset_model():
+    """Drop the cached model so the next ``get_model`` builds a fresh one"""
+    global _model, _model_pid
+    _model = None
+    _model_pid = None
\ No newline at end of file
@@ -2,6 +2,8 @@ import os
 from dotenv import load_dotenv
 import google.generativeai as genai
 from langsmith import Client
+from config import TRACING
+from tracing import TraceExporter, LangSmithSink
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,6 +25,13 @@ except Exception as e:
     print(f"⚠️ Warning: Could not initialize LangSmith client: {e}")
     langsmith_client = None
 
+# Runs are created from a background thread in batches, never on the caller's path
+trace_exporter = None
+if langsmith_client:
+    trace_exporter = TraceExporter(LangSmithSink("shl-recommender", client=langsmith_client),
+                                   max_queue=TRACING["max_queue"], batch_size=TRACING["batch_size"],
+                                   flush_interval=TRACING["flush_interval"])
+
 def get_model():
     """Get the Gemini model with tracing enabled"""
     model = genai.GenerativeModel("gemini-1.5-flash")
@@ -36,21 +45,10 @@ SCORING_WEIGHTS = {
 }
 
 def log_trace(run_type, inputs, outputs=None, error=None, metadata=None):
-    """Helper function to log a trace to LangSmith"""
-    if not langsmith_client:
+    """Helper function to log a trace to LangSmith, queued for the export thread"""
+    if not trace_exporter:
         return None
-    
-    try:
-        # Create a run
-        run = langsmith_client.create_run(
-            project_name="shl-recommender",
-            name=run_type,
-            inputs=inputs,
-            outputs=outputs if outputs else {},
-            error=str(error) if error else None,
-            metadata=metadata if metadata else {}
-        )
-        return run.id
-    except Exception as e:
-        print(f"⚠️ Warning: Failed to log trace: {e}")
-        return None
\ No newline at end of file
+
+    span = trace_exporter.span(run_type, inputs=inputs, metadata=metadata)
+    span.end(outputs=outputs, error=error)
+    return span.id
\ No newline at end of file
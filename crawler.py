@@ -0,0 +1,361 @@
+import csv
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urljoin
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from catalog_snapshot import build_snapshot
+from extractor import extract_detail
+
+# Columns of shl_clean.csv, in order
+CATALOG_FIELDS = ["Topic", "Description", "Job Levels", "Language", "Assessment Length",
+                  "Test Type", "Remote Testing", "Adaptive/IRT"]
+
+USER_AGENT = "Mozilla/5.0"
+
+class RateLimiter:
+    """Token bucket shared by every crawler thread.
+
+    Allows ``rate`` requests per second on average and bursts of up to
+    ``burst`` requests; ``acquire`` blocks until a token is free.
+    """
+
+    def __init__(self, rate=2.0, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def make_session(pool_size=8, retries=3):
+    """Session keeping up to ``pool_size`` connections alive, retrying 429 and 5xx with backoff"""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+class CrawlState:
+    """Crawl progress and HTTP validators in SQLite, kept across runs.
+
+    Every detail page stores its ETag, Last-Modified and parsed row, so a
+    later run sends conditional GETs and reuses the row on 304. Pages
+    finished by an interrupted run are skipped when it is resumed. Pages
+    that could not be fetched or parsed are recorded with their error
+    until a later fetch succeeds.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, row TEXT, "
+                "run_id TEXT, fetched_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, started_at REAL, finished_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS failures ("
+                "url TEXT PRIMARY KEY, error TEXT, run_id TEXT, failed_at REAL)"
+            )
+            self._connection.commit()
+
+    def start_run(self, resume=True):
+        """Id of the last unfinished run when resuming, else of a new run"""
+        with self._lock:
+            if resume:
+                found = self._connection.execute(
+                    "SELECT run_id FROM runs WHERE finished_at IS NULL ORDER BY started_at DESC LIMIT 1"
+                ).fetchone()
+                if found:
+                    return found[0]
+            run_id = uuid.uuid4().hex
+            self._connection.execute("INSERT INTO runs VALUES (?, ?, NULL)", (run_id, time.time()))
+            self._connection.commit()
+            return run_id
+
+    def finish_run(self, run_id):
+        with self._lock:
+            self._connection.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+            self._connection.commit()
+
+    def get(self, url):
+        """``(etag, last_modified, row, run_id)`` stored for ``url`` or None"""
+        with self._lock:
+            found = self._connection.execute(
+                "SELECT etag, last_modified, row, run_id FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if found is None:
+            return None
+        etag, last_modified, row, run_id = found
+        return etag, last_modified, json.loads(row) if row else None, run_id
+
+    def save(self, url, etag, last_modified, row, run_id):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(row), run_id, time.time()),
+            )
+            self._connection.execute("DELETE FROM failures WHERE url = ?", (url,))
+            self._connection.commit()
+
+    def fail(self, url, error, run_id):
+        """Record that ``url`` failed in ``run_id``; its stored row and validators are kept"""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?)",
+                (url, str(error), run_id, time.time()),
+            )
+            self._connection.commit()
+
+    def failures(self, run_id=None):
+        """``{url: error}`` of the pages that failed, in ``run_id`` only when given"""
+        with self._lock:
+            if run_id is None:
+                found = self._connection.execute("SELECT url, error FROM failures").fetchall()
+            else:
+                found = self._connection.execute(
+                    "SELECT url, error FROM failures WHERE run_id = ?", (run_id,)
+                ).fetchall()
+        return dict(found)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+def extract_after_last_product_catalog(title):
+    keyword = "Product Catalog"
+    idx = title.rfind(keyword)
+    if idx != -1:
+        return title[idx + len(keyword):].strip()
+    return title.strip()  # if not found, return original (trimmed)
+
+def parse_listing(html, base_url):
+    """Products of one listing page: title, URL and the listing's remote/adaptive flags"""
+    soup = BeautifulSoup(html, 'html.parser')
+    products = []
+    for table in soup.find_all("table"):
+        for tr in table.find_all("tr"):
+            link = tr.find("a", href=True)
+            if link is None or "/view/" not in link["href"]:
+                continue
+            cells = tr.find_all("td")
+            flag = lambda i: "Yes" if len(cells) > i and cells[i].find(class_="-yes") else ""
+            products.append({
+                "title": link.text.strip(),
+                "url": urljoin(base_url, link["href"].strip()),
+                "remote_testing": flag(1),
+                "adaptive": flag(2),
+            })
+    return products
+
+def parse_detail_old(html):
+    """Catalog fields of a product page, from its text as ``scrapper/scrapper.py`` reads it"""
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text(separator=" ", strip=True)
+
+    # Every field is anchored on the labels around it, navigation text before
+    # "Product Catalog" never reaches a field
+    get_value = lambda match: match.group(1).strip() if match else ""
+    title = get_value(re.search(r'Product Catalog\s+([^\n]+?)\s+Description', text, re.DOTALL))
+    return {
+        "Topic": extract_after_last_product_catalog(title),
+        "Description": get_value(re.search(r'Description\s+(.*?)\s+Job levels', text, re.DOTALL)),
+        "Job Levels": get_value(re.search(r'Job levels\s+(.*?)\s+Languages', text)),
+        "Language": get_value(re.search(r'Languages\s+(.*?)\s+Assessment length', text)),
+        "Assessment Length": get_value(re.search(r'Assessment length\s+(.*?)\s+Test Type', text)),
+        "Test Type": get_value(re.search(r'Test Type:\s*(.*?)\s+Remote Testing', text)),
+        "Remote Testing": "Yes" if "Remote Testing" in text else "No",
+    }
+
+class Crawler:
+    """Catalog crawler: paginates the listing, then fetches product pages concurrently.
+
+    All requests share one pooled session and one rate limiter. Product
+    pages are fetched with ``If-None-Match``/``If-Modified-Since`` from the
+    crawl state; a 304 reuses the stored row without parsing. ``crawl``
+    yields one catalog row per product, in listing order, as soon as it
+    and every row before it are ready.
+
+    With ``processes`` set, pages are parsed in a process pool of that
+    size while the threads keep downloading, for bulk rescrapes where
+    parsing rather than the network is the bottleneck.
+    """
+
+    def __init__(self, base_url, state_path, rate=2.0, workers=8, page_size=12, max_pages=100,
+                 listing_params="type=1", timeout=10, session=None, parse=extract_detail, processes=0):
+        self.base_url = base_url
+        self.state = CrawlState(state_path)
+        self.limiter = RateLimiter(rate, burst=max(1, workers // 2))
+        self.workers = workers
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.listing_params = listing_params
+        self.timeout = timeout
+        self.session = session or make_session(pool_size=workers)
+        self.parse = parse
+        self.processes = processes
+        self._pool = None
+
+        self.stats = {"listing_pages": 0, "fetched": 0, "not_modified": 0, "resumed": 0,
+                      "failed": 0, "bytes": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def get(self, url, headers=None):
+        self.limiter.acquire()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self._count("bytes", len(response.content))
+        return response
+
+    def listing(self):
+        """Products of every listing page, until a page lists none"""
+        products, seen = [], set()
+        for page in range(self.max_pages):
+            url = f"{self.base_url}?start={page * self.page_size}&{self.listing_params}"
+            print(f"🔍 Scraping page: {url}")
+            response = self.get(url)
+            response.raise_for_status()
+            self._count("listing_pages")
+            found = [p for p in parse_listing(response.text, self.base_url) if p["url"] not in seen]
+            if not found:
+                break
+            seen.update(p["url"] for p in found)
+            products.extend(found)
+        return products
+
+    def fetch_product(self, product, run_id):
+        """Catalog row of one product, from the page or from the crawl state"""
+        url = product["url"]
+        stored = self.state.get(url)
+        if stored is not None and stored[3] == run_id and stored[2] is not None:
+            self._count("resumed")
+            return stored[2]
+
+        headers = {}
+        if stored is not None and stored[2] is not None:
+            etag, last_modified, _, _ = stored
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = self.get(url, headers=headers)
+            if response.status_code == 304:
+                self._count("not_modified")
+                row = stored[2]
+            else:
+                response.raise_for_status()
+                self._count("fetched")
+                if self._pool is not None:
+                    row = self._pool.submit(self.parse, response.text).result()
+                else:
+                    row = self.parse(response.text)
+                row["Topic"] = row["Topic"] or product["title"]
+                row["Remote Testing"] = product["remote_testing"] or row["Remote Testing"]
+                row["Adaptive/IRT"] = product["adaptive"] or row.get("Adaptive/IRT", "")
+            self.state.save(url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                            row, run_id)
+            return row
+        except Exception as e:
+            # Network errors and pages the extractor cannot read fail this page only
+            print(f"⛔ Error on {url}: {e!r}")
+            self._count("failed")
+            self.state.fail(url, repr(e), run_id)
+            # A page that fails now keeps its last known row
+            return stored[2] if stored is not None else None
+
+    def crawl(self, resume=True):
+        """Yield ``(product, row)`` for every listed product, in listing order"""
+        run_id = self.state.start_run(resume)
+        products = self.listing()
+        self._pool = ProcessPoolExecutor(self.processes) if self.processes else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for product, row in zip(products, executor.map(lambda p: self.fetch_product(p, run_id), products)):
+                    if row is not None:
+                        yield product, row
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        self.state.finish_run(run_id)
+
+def write_catalog(rows, csv_path="shl_clean.csv", url_path="final.txt"):
+    """Stream ``(product, row)`` pairs into the catalog CSV and the URL map.
+
+    Rows are written as they arrive to temporary files that replace the
+    catalog only once the crawl has finished, so an interrupted crawl never
+    leaves a partial catalog behind. Returns the number of rows.
+    """
+    count = 0
+    paths = []
+    for path in (csv_path, url_path):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        paths.append(tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False,
+                                                 newline="", encoding="utf-8"))
+    csv_file, url_file = paths
+    try:
+        writer = csv.DictWriter(csv_file, fieldnames=CATALOG_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for product, row in rows:
+            writer.writerow(row)
+            url_file.write(f"{row['Topic']} => {product['url']}\n")
+            count += 1
+    except BaseException:
+        for file in paths:
+            file.close()
+            os.unlink(file.name)
+        raise
+    for file, path in zip(paths, (csv_path, url_path)):
+        file.close()
+        os.replace(file.name, path)
+    return count
+
+def crawl_catalog(crawler, csv_path="shl_clean.csv", url_path="final.txt", snapshot_path=".cache/catalog.snap",
+                  resume=True):
+    """Crawl into the catalog files and rebuild the snapshot; watching workers then reload"""
+    count = write_catalog(crawler.crawl(resume=resume), csv_path, url_path)
+    if snapshot_path:
+        build_snapshot(csv_path, url_path, snapshot_path)
+    return count
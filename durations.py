@@ -0,0 +1,91 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Every catalog value starts with this label, the duration follows the "="
+_LABEL = re.compile(r'^\s*approximate completion time in minutes\s*=\s*', re.IGNORECASE)
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_RANGE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:to|-|–)\s*(\d+(?:\.\d+)?)')
+
+# Values that say there is no usable duration
+_UNTIMED = {'untimed'}
+_VARIABLE = {'variable'}
+_MISSING = {'', '-', 'tbc', 'n/a', 'na', 'nan', 'none'}
+
+def parse_assessment_length(value):
+    """``(minutes, kind)`` for one catalog ``assessment_length`` value.
+
+    ``kind`` is one of ``fixed``, ``range``, ``max``, ``approximate``,
+    ``untimed``, ``variable`` or ``unknown``. Ranges such as "15 to 35" and
+    caps such as "max 60" give their upper bound, the longest a candidate
+    may need; "Untimed, approx. 25" gives the approximate time. Values
+    without a duration give None.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None, 'unknown'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value), 'fixed'
+
+    text = _LABEL.sub('', str(value)).strip().lower()
+    text = re.sub(r'\s*(?:minutes?|mins?)\s*$', '', text)
+
+    if text in _MISSING:
+        return None, 'unknown'
+    if text in _UNTIMED:
+        return None, 'untimed'
+    if text in _VARIABLE:
+        return None, 'variable'
+
+    match = _RANGE.fullmatch(text)
+    if match:
+        return float(match.group(2)), 'range'
+    if text.startswith('max'):
+        number = _NUMBER.search(text)
+        return (float(number.group()), 'max') if number else (None, 'unknown')
+    if text.startswith('untimed'):
+        number = _NUMBER.search(text)
+        return (float(number.group()), 'approximate') if number else (None, 'untimed')
+    if _NUMBER.fullmatch(text):
+        return float(text), 'fixed'
+    return None, 'unknown'
+
+def parse_assessment_lengths(values):
+    """Minutes (NaN when unknown) and kind for a column of catalog values"""
+    parsed = [parse_assessment_length(value) for value in values]
+    minutes = np.array([np.nan if m is None else m for m, _ in parsed], dtype=np.float64)
+    kinds = pd.Categorical([kind for _, kind in parsed])
+    return minutes, kinds
+
+class DurationIndex:
+    """Catalog durations sorted once so limit queries are binary searches.
+
+    Rows without a known duration sort last and never fall within a limit.
+    """
+
+    def __init__(self, minutes):
+        self.minutes = np.asarray(minutes, dtype=np.float64)
+        self.order = np.argsort(self.minutes, kind='stable')
+        self.sorted_minutes = self.minutes[self.order]
+
+    def count_within(self, limit):
+        """Number of rows with ``minutes <= limit``"""
+        if np.isnan(limit):
+            return 0
+        return int(np.searchsorted(self.sorted_minutes, limit, side='right'))
+
+    def rows_within(self, limit):
+        """Row ids with ``minutes <= limit``, shortest first"""
+        return self.order[:self.count_within(limit)]
+
+    def mask_within(self, limit):
+        found = np.zeros(len(self.minutes), dtype=bool)
+        found[self.rows_within(limit)] = True
+        return found
+
+    def match_score(self, limit, within=3, near=1, near_factor=1.5):
+        """``within`` points up to ``limit``, ``near`` up to ``limit * near_factor``"""
+        score = np.zeros(len(self.minutes), dtype=np.int64)
+        inside = self.count_within(limit)
+        score[self.order[inside:self.count_within(limit * near_factor)]] = near
+        score[self.order[:inside]] = within
+        return score
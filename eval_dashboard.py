@@ -2,13 +2,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import json
 import os
 from pathlib import Path
 import uvicorn
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pandas as pd
 from datetime import datetime
+from config import EVAL_STORE_PATH
+from eval_store import EvalStore, CHECKS
 
 app = FastAPI()
 
@@ -18,8 +19,7 @@ templates_dir.mkdir(exist_ok=True)
 
 # Create a basic HTML template
 template_path = templates_dir / "dashboard.html"
-if not template_path.exists():
-    template_content = """
+template_content = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -36,6 +36,15 @@ if not template_path.exists():
     <body>
         <div class="container mt-4">
             <h1>Assessment Recommender Evaluation Dashboard</h1>
+            <form class="mt-3" method="get">
+                <select name="run_id" class="form-select" onchange="this.form.submit()">
+                    {% for r in runs %}
+                    <option value="{{ r.run_id }}" {{ 'selected' if r.run_id == run.run_id else '' }}>
+                        {{ r.run_id }} - {{ r.pass_rate }}% passed
+                    </option>
+                    {% endfor %}
+                </select>
+            </form>
             <div class="row mt-4">
                 <div class="col-md-6">
                     <div class="card">
@@ -46,6 +55,7 @@ if not template_path.exists():
                             <p>Run Date: {{ run_date }}</p>
                             <p>Total Cases: {{ total_cases }}</p>
                             <p>Passed: {{ passed_cases }} ({{ pass_rate }}%)</p>
+                            <p>Recall@k: {{ run.recall }} | MAP@k: {{ run.map }}</p>
                             <div class="chart-container">
                                 <canvas id="summaryChart"></canvas>
                             </div>
@@ -65,6 +75,35 @@ if not template_path.exists():
                     </div>
                 </div>
             </div>
+
+            <div class="card mt-4">
+                <div class="card-header">
+                    <h5>Trend over the last {{ trend | length }} runs</h5>
+                </div>
+                <div class="card-body">
+                    <div class="chart-container">
+                        <canvas id="trendChart"></canvas>
+                    </div>
+                </div>
+            </div>
+
+            {% if diff %}
+            <div class="card mt-4">
+                <div class="card-header">
+                    <h5>Changes since {{ diff.base }}</h5>
+                </div>
+                <div class="card-body">
+                    {% for kind in ['fixed', 'broken', 'changed'] %}
+                    {% for case in diff[kind] %}
+                    <p><span class="badge {{ 'bg-success' if kind == 'fixed' else 'bg-danger' if kind == 'broken' else 'bg-secondary' }}">{{ kind }}</span>
+                       {{ case.query }} (recall {{ case.recall[0] }} &rarr; {{ case.recall[1] }})</p>
+                    {% endfor %}
+                    {% endfor %}
+                    {% for query in diff.added %}<p><span class="badge bg-info">added</span> {{ query }}</p>{% endfor %}
+                    {% for query in diff.removed %}<p><span class="badge bg-warning">removed</span> {{ query }}</p>{% endfor %}
+                </div>
+            </div>
+            {% endif %}
             
             <div class="card mt-4">
                 <div class="card-header">
@@ -85,7 +124,7 @@ if not template_path.exists():
                         <tbody>
                             {% for result in results %}
                             <tr class="{{ 'passed' if result.passed else 'failed' }}">
-                                <td>{{ loop.index }}</td>
+                                <td>{{ offset + loop.index }}</td>
                                 <td>{{ result.query }}</td>
                                 <td>{{ result.expected | tojson }}</td>
                                 <td>{{ result.extracted | tojson }}</td>
@@ -108,6 +147,11 @@ if not template_path.exists():
                             {% endfor %}
                         </tbody>
                     </table>
+                    <nav>
+                        {% if page > 1 %}<a class="btn btn-sm btn-outline-primary" href="?run_id={{ run.run_id }}&page={{ page - 1 }}">Previous</a>{% endif %}
+                        Page {{ page }} of {{ pages }}
+                        {% if page < pages %}<a class="btn btn-sm btn-outline-primary" href="?run_id={{ run.run_id }}&page={{ page + 1 }}">Next</a>{% endif %}
+                    </nav>
                 </div>
             </div>
         </div>
@@ -164,70 +208,145 @@ if not template_path.exists():
                     }
                 }
             });
+
+            // Trend chart
+            const trend = {{ trend | tojson }};
+            const trendCtx = document.getElementById('trendChart').getContext('2d');
+            const trendChart = new Chart(trendCtx, {
+                type: 'line',
+                data: {
+                    labels: trend.map(r => r.run_id),
+                    datasets: [{
+                        label: 'Pass rate %',
+                        data: trend.map(r => r.pass_rate),
+                        borderColor: '#28a745'
+                    }, {
+                        label: 'Recall@k %',
+                        data: trend.map(r => r.recall === null ? null : r.recall * 100),
+                        borderColor: '#007bff'
+                    }, {
+                        label: 'MAP@k %',
+                        data: trend.map(r => r.map === null ? null : r.map * 100),
+                        borderColor: '#6f42c1'
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    scales: {
+                        x: { display: false },
+                        y: { beginAtZero: true, max: 100 }
+                    }
+                }
+            });
         </script>
     </body>
     </html>
     """
+# Rewritten when the template above changes
+if not template_path.exists() or template_path.read_text() != template_content:
     with open(template_path, "w") as f:
         f.write(template_content)
 
 templates = Jinja2Templates(directory="templates")
 
+# Every run of `runner.py run-eval` is appended here
+store = EvalStore(EVAL_STORE_PATH)
+
+# Statistics computed from the store, dropped as soon as a new run lands
+_stats_cache = {"version": None, "entries": {}}
+
+def cached(key, compute):
+    """``compute()`` once per store version"""
+    version = store.version()
+    if version != _stats_cache["version"] or len(_stats_cache["entries"]) > 1024:
+        _stats_cache.update(version=version, entries={})
+    entries = _stats_cache["entries"]
+    if key not in entries:
+        entries[key] = compute()
+    return entries[key]
+
+@app.on_event("startup")
+async def import_result_files():
+    # Result files written before the store existed become runs once
+    for eval_file in sorted(Path(".").glob("eval_results*.json"), key=lambda p: p.stat().st_mtime):
+        try:
+            store.import_json(str(eval_file))
+        except (ValueError, KeyError) as e:
+            print(f"Skipping {eval_file}: {e}")
+
+def _diff_with_previous(run):
+    previous = store.previous_run(run)
+    return store.diff(previous["run_id"], run["run_id"]) if previous else None
+
+def render_dashboard(run, page, page_size):
+    pages = max(1, -(-run["cases"] // page_size))
+    page = max(1, min(page, pages))
+    offset = (page - 1) * page_size
+    results, _ = store.results(run["run_id"], limit=page_size, offset=offset)
+
+    return templates.get_template("dashboard.html").render(
+        run=run,
+        runs=cached(("runs",), lambda: store.runs(limit=100)[0]),
+        results=results,
+        offset=offset,
+        page=page,
+        pages=pages,
+        total_cases=run["cases"],
+        passed_cases=run["passed"],
+        pass_rate=run["pass_rate"],
+        check_stats={check: run[check] for check in CHECKS},
+        run_date=datetime.fromtimestamp(run["created_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+        trend=cached(("trend", 500), lambda: store.trend(500)),
+        diff=cached(("diff", run["run_id"]), lambda: _diff_with_previous(run)),
+    )
+
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
-    """Render the evaluation dashboard"""
-    # Default to the latest eval file
-    eval_files = sorted(Path(".").glob("eval_results*.json"), reverse=True)
-    
-    if not eval_files:
+async def dashboard(request: Request, run_id: Optional[str] = None, page: int = 1, page_size: int = 50):
+    """Render the evaluation dashboard for one run, the latest by default"""
+    run = cached(("run", run_id), lambda: store.get_run(run_id))
+    if run is None:
         return HTMLResponse(content="<h1>No evaluation results found</h1>")
-    
-    eval_file = eval_files[0]
-    
-    # Load the evaluation results
-    with open(eval_file, "r") as f:
-        results = json.load(f)
-    
-    # Calculate statistics
-    total_cases = len(results)
-    passed_cases = sum(1 for r in results if r["passed"])
-    pass_rate = round((passed_cases / total_cases) * 100, 1) if total_cases > 0 else 0
-    
-    # Check type statistics
-    check_stats = {
-        "skills_pass": sum(1 for r in results if r["checks"]["skills_pass"]),
-        "job_level_pass": sum(1 for r in results if r["checks"]["job_level_pass"]),
-        "duration_pass": sum(1 for r in results if r["checks"]["duration_pass"])
-    }
-    
-    # Get run date from file modification time
-    run_date = datetime.fromtimestamp(eval_file.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-    
-    return templates.TemplateResponse(
-        "dashboard.html", 
-        {
-            "request": request,
-            "results": results,
-            "total_cases": total_cases,
-            "passed_cases": passed_cases,
-            "pass_rate": pass_rate,
-            "check_stats": check_stats,
-            "run_date": run_date
-        }
-    )
+
+    # The rendered page is kept until a new run lands
+    page_size = max(1, min(page_size, 500))
+    html = cached(("page", run["run_id"], page, page_size), lambda: render_dashboard(run, page, page_size))
+    return HTMLResponse(content=html)
 
 @app.get("/api/results")
-async def get_results():
-    """API endpoint to get the evaluation results"""
-    eval_files = sorted(Path(".").glob("eval_results*.json"), reverse=True)
-    
-    if not eval_files:
+async def get_results(run_id: Optional[str] = None, limit: int = 50, offset: int = 0, status: Optional[str] = None):
+    """API endpoint to get the evaluation results of a run, a page at a time"""
+    run = cached(("run", run_id), lambda: store.get_run(run_id))
+    if run is None:
         return {"error": "No evaluation results found"}
-    
-    with open(eval_files[0], "r") as f:
-        results = json.load(f)
-    
-    return {"results": results}
+
+    limit = max(1, min(limit, 500))
+    results, total = cached(("results", run["run_id"], offset, limit, status),
+                            lambda: store.results(run["run_id"], limit=limit, offset=offset, status=status))
+    return {"run": run, "results": results, "total": total, "limit": limit, "offset": offset}
+
+@app.get("/api/runs")
+async def get_runs(limit: int = 50, offset: int = 0):
+    """Runs with their aggregates, newest first"""
+    limit = max(1, min(limit, 500))
+    runs, total = cached(("runs", limit, offset), lambda: store.runs(limit=limit, offset=offset))
+    return {"runs": runs, "total": total, "limit": limit, "offset": offset}
+
+@app.get("/api/diff")
+async def get_diff(run_id: Optional[str] = None, base: Optional[str] = None):
+    """Cases fixed, broken or changed between two runs, by default the latest and the one before"""
+    run = store.get_run(run_id)
+    if run is None:
+        return {"error": "No evaluation results found"}
+    if base is None:
+        return cached(("diff", run["run_id"]), lambda: _diff_with_previous(run)) or {"error": "No earlier run"}
+    return cached(("diff", base, run["run_id"]), lambda: store.diff(base, run["run_id"]))
+
+@app.get("/api/trend")
+async def get_trend(limit: int = 500):
+    """Pass rate, recall and MAP of the last runs, oldest first"""
+    limit = max(1, min(limit, 5000))
+    return {"trend": cached(("trend", limit), lambda: store.trend(limit))}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from query_cache import normalize_query
+
+CHECKS = ("skills_pass", "job_level_pass", "duration_pass")
+
+def case_id(query: str) -> str:
+    """Stable id of a case across runs, from its normalized query"""
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()[:16]
+
+def _metric(result, prefix):
+    for name, value in (result.get("metrics") or {}).items():
+        if name.startswith(prefix):
+            return value
+    return None
+
+class EvalStore:
+    """Evaluation runs and their per-case results in a local SQLite file.
+
+    Every run is appended once with its aggregates (pass counts per check,
+    mean recall and MAP) computed at insert time, so listing runs and
+    drawing trends never touches the per-case rows. Results are indexed
+    by run and by case, for paging through one run and diffing two.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+    def _db(self):
+        # SQLite connections must not cross a fork, reopen in every worker
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY, created_at REAL NOT NULL, label TEXT,"
+                " cases INTEGER NOT NULL, passed INTEGER NOT NULL, errors INTEGER NOT NULL,"
+                " skills_pass INTEGER NOT NULL, job_level_pass INTEGER NOT NULL, duration_pass INTEGER NOT NULL,"
+                " recall REAL, map REAL, summary TEXT NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);"
+                "CREATE TABLE IF NOT EXISTS results ("
+                " run_id TEXT NOT NULL, case_id TEXT NOT NULL, position INTEGER NOT NULL,"
+                " query TEXT NOT NULL, passed INTEGER NOT NULL, recall REAL, ap REAL, payload TEXT NOT NULL,"
+                " PRIMARY KEY (run_id, case_id));"
+                "CREATE INDEX IF NOT EXISTS results_position ON results (run_id, position);"
+                "CREATE INDEX IF NOT EXISTS results_case ON results (case_id, run_id);"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def add_run(self, results, summary=None, run_id=None, created_at=None, label=None) -> str:
+        """Append a run, returns its id"""
+        run_id = run_id or uuid.uuid4().hex[:12]
+        created_at = created_at or time.time()
+        recalls = [v for v in (_metric(r, "recall@") for r in results) if v is not None]
+        precisions = [v for v in (_metric(r, "ap@") for r in results) if v is not None]
+        checks = {check: sum(bool((r.get("checks") or {}).get(check)) for r in results) for check in CHECKS}
+
+        rows = {}
+        for position, result in enumerate(results):
+            # Repeated queries keep their first position
+            rows.setdefault(case_id(result["query"]), (
+                run_id, case_id(result["query"]), position, result["query"], int(bool(result.get("passed"))),
+                _metric(result, "recall@"), _metric(result, "ap@"), json.dumps(result),
+            ))
+
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT INTO runs (run_id, created_at, label, cases, passed, errors, skills_pass,"
+                    " job_level_pass, duration_pass, recall, map, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, created_at, label, len(results), sum(bool(r.get("passed")) for r in results),
+                     sum("error" in r for r in results), checks["skills_pass"], checks["job_level_pass"],
+                     checks["duration_pass"], sum(recalls) / len(recalls) if recalls else None,
+                     sum(precisions) / len(precisions) if precisions else None, json.dumps(summary or {})),
+                )
+                db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows.values())
+        return run_id
+
+    def import_json(self, path, label=None):
+        """Append a results file written by ``run-eval``, dated by its mtime. Returns the run id"""
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+        run_id = os.path.splitext(os.path.basename(path))[0] + "-" + str(int(os.path.getmtime(path)))
+        with self._lock:
+            known = self._db().execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if known:
+            return run_id
+        return self.add_run(results, run_id=run_id, created_at=os.path.getmtime(path), label=label or path)
+
+    def version(self):
+        """Changes whenever a run is added, for invalidating cached statistics.
+
+        Runs are append-only, so the largest rowid is enough and is read
+        from the end of the table's b-tree without a scan.
+        """
+        with self._lock:
+            return self._db().execute("SELECT MAX(rowid) FROM runs").fetchone()[0]
+
+    def _run(self, row):
+        run = dict(row)
+        run["summary"] = json.loads(run["summary"])
+        run["pass_rate"] = round(run["passed"] / run["cases"] * 100, 1) if run["cases"] else 0
+        return run
+
+    def get_run(self, run_id=None):
+        """One run with its aggregates, the latest when ``run_id`` is None"""
+        with self._lock:
+            if run_id is None:
+                row = self._db().execute("SELECT * FROM runs ORDER BY created_at DESC LIMIT 1").fetchone()
+            else:
+                row = self._db().execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return self._run(row) if row else None
+
+    def previous_run(self, run):
+        """The run added just before ``run``"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT * FROM runs WHERE created_at < ? ORDER BY created_at DESC LIMIT 1", (run["created_at"],)
+            ).fetchone()
+        return self._run(row) if row else None
+
+    def runs(self, limit=50, offset=0):
+        """``(runs, total)``, newest first"""
+        with self._lock:
+            db = self._db()
+            rows = db.execute("SELECT * FROM runs ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                              (limit, offset)).fetchall()
+            total = db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return [self._run(row) for row in rows], total
+
+    def results(self, run_id, limit=50, offset=0, status=None):
+        """``(results, total)`` of one run in case order, ``status`` ``passed`` or ``failed`` filters them"""
+        where, params = "run_id = ?", [run_id]
+        if status in ("passed", "failed"):
+            where += " AND passed = ?"
+            params.append(1 if status == "passed" else 0)
+        with self._lock:
+            db = self._db()
+            rows = db.execute(f"SELECT case_id, payload FROM results WHERE {where} ORDER BY position LIMIT ? OFFSET ?",
+                              (*params, limit, offset)).fetchall()
+            total = db.execute(f"SELECT COUNT(*) FROM results WHERE {where}", params).fetchone()[0]
+        return [{"case_id": row["case_id"], **json.loads(row["payload"])} for row in rows], total
+
+    def trend(self, limit=500):
+        """Aggregates of the last ``limit`` runs, oldest first"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT run_id, created_at, cases, passed, recall, map FROM runs"
+                " ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{**dict(row), "pass_rate": round(row["passed"] / row["cases"] * 100, 1) if row["cases"] else 0}
+                for row in reversed(rows)]
+
+    def diff(self, base_run_id, run_id):
+        """Cases that changed between two runs.
+
+        ``fixed`` and ``broken`` flipped their pass status, ``changed``
+        kept it but moved in recall or AP, ``added`` and ``removed`` exist
+        in one run only.
+        """
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT run_id, case_id, query, passed, recall, ap FROM results WHERE run_id IN (?, ?)",
+                (base_run_id, run_id),
+            ).fetchall()
+        base = {row["case_id"]: dict(row) for row in rows if row["run_id"] == base_run_id}
+        head = {row["case_id"]: dict(row) for row in rows if row["run_id"] == run_id}
+
+        report = {"base": base_run_id, "run": run_id, "fixed": [], "broken": [], "changed": [],
+                  "added": [head[c]["query"] for c in head if c not in base],
+                  "removed": [base[c]["query"] for c in base if c not in head]}
+        for case, new in head.items():
+            old = base.get(case)
+            if old is None:
+                continue
+            entry = {"case_id": case, "query": new["query"],
+                     "recall": [old["recall"], new["recall"]], "ap": [old["ap"], new["ap"]]}
+            if old["passed"] != new["passed"]:
+                report["fixed" if new["passed"] else "broken"].append(entry)
+            elif old["recall"] != new["recall"] or old["ap"] != new["ap"]:
+                report["changed"].append(entry)
+        return report
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import MODEL_NAME, StubResponse, get_model
+from recommender import parse_query, recommend_assessments
+
+class FixtureMissing(KeyError):
+    pass
+
+def prompt_hash(prompt: str, model_name: str) -> str:
+    return hashlib.sha256(f"{model_name}\x1f{prompt}".encode("utf-8")).hexdigest()[:32]
+
+class FixtureStore:
+    """Recorded model responses, keyed by a hash of the model name and prompt.
+
+    Kept as one JSON file so fixtures can be committed next to the cases
+    and reviewed in diffs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry["response"] if entry else None
+
+    def set(self, key, model_name, response):
+        with self._lock:
+            self._entries[key] = {"model": model_name, "response": response, "recorded_at": time.time()}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(self.path + ".tmp", self.path)
+            self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+class FixtureModel:
+    """Model wrapper that replays recorded responses and records new ones.
+
+    ``mode`` is ``replay`` (recorded responses only, a missing fixture
+    raises ``FixtureMissing``), ``record`` (always call the model and store
+    its answer) or ``auto`` (replay when recorded, record otherwise). The
+    wrapped model is only created on the first real call, so a full replay
+    needs neither network nor API key.
+    """
+
+    def __init__(self, store, mode="auto", model_factory=get_model, model_name=None):
+        if mode not in ("replay", "record", "auto"):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.model_factory = model_factory
+        self._model = None
+        self._lock = threading.Lock()
+        self.model_name = model_name or MODEL_NAME
+        self.replayed = 0
+        self.recorded = 0
+
+    def _inner(self):
+        with self._lock:
+            if self._model is None:
+                self._model = self.model_factory()
+            return self._model
+
+    def generate_content(self, prompt):
+        key = prompt_hash(prompt, self.model_name)
+        if self.mode != "record":
+            text = self.store.get(key)
+            if text is not None:
+                self.replayed += 1
+                return StubResponse(text)
+            if self.mode == "replay":
+                raise FixtureMissing(f"No recorded response for prompt {key}")
+
+        text = self._inner().generate_content(prompt).text
+        self.store.set(key, self.model_name, text)
+        self.recorded += 1
+        return StubResponse(text)
+
+def load_cases(path):
+    """Evaluation cases from a JSONL file, one ``{"query", "expected_filters", "relevant"}`` per line"""
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            case = json.loads(line)
+            if "query" not in case or "expected_filters" not in case:
+                raise ValueError(f"{path}:{number}: a case needs query and expected_filters")
+            cases.append(case)
+    return cases
+
+def recall_at_k(recommended, relevant, k):
+    """Share of the relevant assessments found in the first ``k`` recommendations"""
+    if not relevant:
+        return None
+    return len(set(recommended[:k]) & set(relevant)) / len(relevant)
+
+def average_precision_at_k(recommended, relevant, k):
+    """Mean of precision@i over the ranks i <= k holding a relevant assessment"""
+    if not relevant:
+        return None
+    relevant = set(relevant)
+    hits, total = 0, 0.0
+    for i, title in enumerate(recommended[:k], 1):
+        if title in relevant:
+            hits += 1
+            total += hits / i
+    return total / min(len(relevant), k)
+
+def check_filters(filters, expected):
+    """Skills, job level and duration checks of extracted filters against the expected ones"""
+    extracted_skills = [s.lower() for s in filters.get("skills", [])] if filters.get("skills") else []
+    extracted_job_level = filters.get("job_level", "").lower() if filters.get("job_level") else None
+
+    skills_pass = all(any(expected_skill in extracted_skill for extracted_skill in extracted_skills)
+                      for expected_skill in expected["skills"])
+
+    job_level_pass = expected["job_level"] is None or bool(
+        extracted_job_level and expected["job_level"].lower() in extracted_job_level
+    )
+
+    duration_pass = expected["duration_limit"] is None or (
+        filters.get("duration_limit") is not None and
+        abs(filters.get("duration_limit") - expected["duration_limit"]) <= 5
+    )
+
+    return {"skills_pass": skills_pass, "job_level_pass": job_level_pass, "duration_pass": duration_pass}
+
+def evaluate_case(case, model=None, k=10, no_llm=False, tracer=None, name="Evaluation run"):
+    """Result of one case: extracted filters, checks, top recommendations and ranking metrics"""
+    query, expected = case["query"], case["expected_filters"]
+    relevant = case.get("relevant") or []
+    start = time.perf_counter()
+    result = {"query": query, "expected": expected, "relevant": relevant, "langsmith_run_id": None}
+    # The span covers parsing and scoring, failures are recorded as its error
+    run = tracer.span(name, inputs={"query": query}, tags=["evaluation"]) if tracer is not None else None
+    if run is not None:
+        result["langsmith_run_id"] = run.id
+    try:
+        # --no-llm keeps every query on the local parser, whatever its confidence.
+        # The query cache is bypassed so every run sees the fixtures
+        filters = parse_query(query, model=model, cache=None, min_confidence=0.0 if no_llm else None)
+        recommendations = [r["title"] for r in recommend_assessments(filters, top_k=k)]
+    except Exception as e:
+        if run is not None:
+            run.end(error=repr(e))
+        result.update({"extracted": None, "passed": False, "error": repr(e),
+                       "checks": {}, "top_recommendations": [], "metrics": {}})
+        return result
+    if run is not None:
+        run.end(outputs={"filters": filters, "recommendations": recommendations[:3]})
+
+    checks = check_filters(filters, expected)
+    result.update({
+        "extracted": filters,
+        "passed": all(checks.values()),
+        "checks": checks,
+        "top_recommendations": recommendations[:3],
+        "recommendations": recommendations,
+        "metrics": {f"recall@{k}": recall_at_k(recommendations, relevant, k),
+                    f"ap@{k}": average_precision_at_k(recommendations, relevant, k)},
+        "seconds": round(time.perf_counter() - start, 4),
+    })
+    return result
+
+def run_evaluation(cases, model=None, workers=8, k=10, no_llm=False, tracer=None):
+    """Evaluate ``cases`` concurrently, results in case order plus a summary.
+
+    The summary holds the pass count, mean recall@k and MAP@k over the
+    cases with labeled relevant assessments, and the wall time.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(cases)))) as pool:
+        results = list(pool.map(
+            lambda item: evaluate_case(item[1], model=model, k=k, no_llm=no_llm, tracer=tracer,
+                                       name=f"Evaluation run for query {item[0]}"),
+            enumerate(cases)))
+
+    recalls = [r["metrics"][f"recall@{k}"] for r in results if r["metrics"].get(f"recall@{k}") is not None]
+    precisions = [r["metrics"][f"ap@{k}"] for r in results if r["metrics"].get(f"ap@{k}") is not None]
+    summary = {
+        "cases": len(results),
+        "passed": sum(r["passed"] for r in results),
+        "errors": sum("error" in r for r in results),
+        "labeled": len(recalls),
+        f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        f"map@{k}": round(sum(precisions) / len(precisions), 4) if precisions else None,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    return results, summary
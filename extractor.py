@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+# Section headings of a product page, mapped to catalog columns
+SECTION_FIELDS = {
+    "description": "Description",
+    "job levels": "Job Levels",
+    "languages": "Language",
+    "assessment length": "Assessment Length",
+}
+# Inline labels followed by keys or a yes/no circle
+_TEST_TYPE = "test type:"
+_FLAGS = {"remote testing": "Remote Testing", "adaptive/irt": "Adaptive/IRT"}
+
+# Feed pages in chunks so parsing can stop as soon as the product section ends
+_CHUNK = 16 * 1024
+
+class _Done(Exception):
+    pass
+
+class DetailExtractor(HTMLParser):
+    """Streaming extractor of the product section of a catalog page.
+
+    Ignores everything before the product title (``<h1>``), then reads the
+    ``<h4>`` section headings and the text after each, the test type keys
+    and the remote testing and adaptive circles. Stops at the ``<footer>``
+    without tokenizing the rest of the page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+        self._in_product = False
+        self._tag = None
+        self._heading = []
+        self._section = None
+        self._flag = None
+
+    def _close_section(self):
+        if self._section is not None:
+            self.fields[self._section] = " ".join(" ".join(self.fields.get(self._section, [])).split())
+        self._section = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "footer" and self._in_product:
+            raise _Done
+        if tag == "h1" and "Topic" not in self.fields:
+            self._in_product = True
+            self._tag, self._heading = "h1", []
+            return
+        if not self._in_product:
+            return
+        if tag == "h4":
+            self._close_section()
+            self._tag, self._heading = "h4", []
+        elif self._flag is not None:
+            classes = (dict(attrs).get("class") or "").split()
+            if "-yes" in classes:
+                self.fields[self._flag] = "Yes"
+
+    def handle_endtag(self, tag):
+        if tag == self._tag:
+            text = " ".join("".join(self._heading).split())
+            if tag == "h1":
+                self.fields["Topic"] = text
+            else:
+                field = SECTION_FIELDS.get(text.lower())
+                if field is not None:
+                    self._section = field
+                    self.fields[field] = []
+            self._tag = None
+
+    def handle_data(self, data):
+        if not self._in_product:
+            return
+        if self._tag is not None:
+            self._heading.append(data)
+            return
+        label = data.strip().lower()
+        if label.startswith(_TEST_TYPE):
+            self._close_section()
+            self._flag = None
+            self._section = "Test Type"
+            self.fields["Test Type"] = [data.strip()[len(_TEST_TYPE):]]
+            return
+        flag = _FLAGS.get(label.rstrip(":").strip())
+        if flag is not None:
+            self._close_section()
+            self._flag = flag
+            self.fields.setdefault(flag, "No" if flag == "Remote Testing" else "")
+            return
+        if self._section is not None:
+            self.fields[self._section].append(data)
+
+    def result(self):
+        self._close_section()
+        row = {field: self.fields.get(field, "") for field in
+               ("Topic", *SECTION_FIELDS.values(), "Test Type", "Remote Testing", "Adaptive/IRT")}
+        row["Remote Testing"] = row["Remote Testing"] or "No"
+        return row
+
+def extract_detail(html):
+    """Catalog row of a product page, read from its DOM structure"""
+    parser = DetailExtractor()
+    # Navigation markup before the title is never tokenized
+    begin = max(html.find("<h1"), 0)
+    try:
+        for start in range(begin, len(html), _CHUNK):
+            parser.feed(html[start:start + _CHUNK])
+        parser.close()
+    except _Done:
+        pass
+    return parser.result()
+
+def extract_details(pages, processes=None, chunksize=16):
+    """``extract_detail`` of many pages across a process pool, in order"""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(extract_detail, pages, chunksize=chunksize))
@@ -0,0 +1,41 @@
+# Preload-and-fork serving: the master imports the app once, builds the
+# catalog, indexes and vector store, freezes them out of the garbage
+# collector and forks workers that share those pages copy-on-write.
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, multiprocessing.cpu_count() * 2))))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+# Import app.py (and with it recommender.py) in the master instead of every worker
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+def when_ready(server):
+    if not preload_app:
+        return
+    import recommender
+
+    recommender.warm_up(semantic=os.getenv("SEMANTIC_PRELOAD", "1") == "1")
+
+    # Everything allocated so far lives for the whole process. Moving it to
+    # the permanent generation keeps collections in the workers from
+    # touching (and so copying) those pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Preloaded catalog and indexes, froze {gc.get_freeze_count()} objects")
+
+def post_fork(server, worker):
+    # Per-process handles (model client, SQLite connection, asyncio primitives)
+    # are created lazily and keyed by pid, nothing inherited needs reopening
+    server.log.info(f"Worker {worker.pid} forked")
+
+def post_worker_init(worker):
+    # Threads do not survive a fork and workers without preload load the app
+    # themselves: either way every worker starts its own catalog watcher here
+    from config import CATALOG
+    if CATALOG["watch_interval"] > 0:
+        import recommender
+        recommender.catalog_manager.watch(CATALOG["watch_interval"])
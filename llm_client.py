@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+from config import get_model
+from metrics import Histogram
+
+# Latency of single model calls, labelled primary or hedge
+LLM_LATENCY = Histogram("llm_call_seconds", label_name="attempt")
+
+class AsyncLLMClient:
+    """Non-blocking access to the extraction model for async handlers.
+
+    Every extraction has a deadline of ``timeout`` seconds and at most
+    ``max_in_flight`` model calls run at once per process. When ``hedge`` is
+    on and the first call has not answered after ``hedge_after`` seconds
+    (by default the observed p95 once enough calls were seen), a second
+    identical call is sent if a slot is free and the first answer wins.
+
+    Models exposing ``generate_content_async`` are awaited directly, others
+    run in a worker thread so the event loop never blocks.
+    """
+
+    # Calls needed before the observed p95 replaces the initial hedge delay
+    MIN_SAMPLES = 20
+    INITIAL_HEDGE_AFTER = 2.0
+
+    def __init__(self, timeout=8.0, max_in_flight=16, hedge=True, hedge_after=None,
+                 model_factory=get_model, latency=LLM_LATENCY):
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.model_factory = model_factory
+        self.latency = latency
+
+        self._model = None
+        self._model_pid = None
+        self._semaphore = None
+        self._semaphore_loop = None
+
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def model(self):
+        """Model shared by this process, created again after a fork"""
+        if self._model is None or self._model_pid != os.getpid():
+            self._model = self.model_factory()
+            self._model_pid = os.getpid()
+        return self._model
+
+    def _slots(self):
+        # asyncio primitives belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, None when hedging is off"""
+        if not self.hedge:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        snapshot = self.latency.snapshot().get("primary")
+        if snapshot is None or snapshot["count"] < self.MIN_SAMPLES:
+            return self.INITIAL_HEDGE_AFTER
+        return snapshot["p95_ms"] / 1000
+
+    async def _call(self, model, prompt, label):
+        async with self._slots():
+            self.calls += 1
+            start = time.perf_counter()
+            if hasattr(model, "generate_content_async"):
+                response = await model.generate_content_async(prompt)
+            else:
+                response = await asyncio.to_thread(model.generate_content, prompt)
+            self.latency.observe(label, time.perf_counter() - start)
+            return response.text
+
+    async def generate(self, prompt, model=None):
+        """Response text for ``prompt``.
+
+        Raises ``asyncio.TimeoutError`` when no call answers within the
+        deadline, or the model's error when every attempt failed.
+        """
+        model = model or self.model()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        primary = asyncio.ensure_future(self._call(model, prompt, "primary"))
+        pending = {primary}
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and delay < self.timeout:
+                await asyncio.wait(pending, timeout=delay)
+                # Only hedge with a free slot, a queued hedge would just add load
+                if not primary.done() and not self._slots().locked():
+                    pending.add(asyncio.ensure_future(self._call(model, prompt, "hedge")))
+                    self.hedges += 1
+
+            error = None
+            while pending:
+                remaining = deadline - loop.time()
+                done, pending = await asyncio.wait(pending, timeout=max(remaining, 0),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+
+            if error is not None and not pending:
+                self.errors += 1
+                raise error
+            self.timeouts += 1
+            raise asyncio.TimeoutError(f"no model response within {self.timeout}s")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency": self.latency.snapshot(),
+        }
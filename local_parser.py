@@ -0,0 +1,165 @@
+import re
+from assessment_types import extract_test_types
+from taxonomy import (SOFT_SKILLS, SUPERSET_MAP, ROLE_SKILL_MAP, JOB_LEVEL_MAPPING,
+                      SKILL_ALIASES, ASSESSMENT_FOCUS_SKILLS, ROLE_TITLES, SENIORITY_TERMS)
+
+# Title segments that name a product line or report rather than a skill
+_TITLE_NOISE = {'new', 'form', 'names', 'numbers', 'fix', 'ic', 'essentials', 'report',
+                'candidate report', 'digital report', 'next generation', 'verify',
+                'short form', 'interactive', 'solution', 'assessment', 'test', 'simulation',
+                'indust.', 'manufac.', 'training'}
+# "C++ Programming" or "Android Development" should also match a bare "C++" or "Android"
+_TITLE_SUFFIXES = (' programming', ' development')
+# Role map skills too generic to read as a requested skill
+_GENERIC_SKILLS = {'team', 'technical'}
+
+_TITLE_SPLIT = re.compile(r'\s+-\s+|[,:/&|]')
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+_VERSION = re.compile(r'\b(?:v?\d+(?:\.\d+)*|r\d+|us|uk|new)\b')
+
+_NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'twelve': 12, 'fifteen': 15, 'twenty': 20,
+    'thirty': 30, 'forty': 40, 'forty-five': 45, 'fifty': 50, 'sixty': 60, 'ninety': 90,
+}
+_NUMBER = r'(\d+(?:\.\d+)?|' + '|'.join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r')'
+_MINUTES = r'(?:minutes?|mins?|m)\b'
+_HOURS = r'(?:hours?|hrs?|h)\b'
+
+# Spelled-out durations, longest first so "an hour and a half" beats "an hour"
+_FIXED_DURATIONS = [
+    (re.compile(r'\b(?:an?|one) hour and a half\b'), 90),
+    (re.compile(r'\b(?:one and a half|1\.5) hours?\b'), 90),
+    (re.compile(r'\bhalf (?:an )?hour\b'), 30),
+    (re.compile(r'\bquarter (?:of an )?hour\b'), 15),
+    (re.compile(r'\b(?:an?|one) hour\b'), 60),
+]
+_DURATION_RANGE = re.compile(_NUMBER + r'\s*(?:-|–|to)\s*' + _NUMBER + r'\s*(' + _MINUTES + '|' + _HOURS + ')')
+_DURATION = re.compile(_NUMBER + r'[\s-]*(' + _MINUTES + '|' + _HOURS + ')')
+# Words that show the query asks for a duration at all
+_DURATION_CUE = re.compile(r'\b(?:min|mins|minutes?|hours?|hrs?|duration|time limit|timed)\b')
+
+def _number(text):
+    return float(text) if text[0].isdigit() else _NUMBER_WORDS[text]
+
+def _to_minutes(value, unit):
+    return int(round(value * 60)) if unit.startswith('h') else int(round(value))
+
+def _boundary_pattern(terms, suffix=''):
+    """Alternation of ``terms`` on word boundaries, longest first"""
+    alternatives = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(r'(?<!\w)(' + alternatives + r')' + suffix + r'(?!\w)')
+
+def catalog_skill_terms(titles):
+    """Skill names taken from the segments of catalog titles.
+
+    Titles read like "Core Java (Advanced Level) (New)" or
+    "Microsoft Excel 365 - Essentials", so parentheticals, versions and
+    product suffixes are dropped and the one or two word segments kept.
+    """
+    terms = set()
+    for title in titles:
+        title = _PARENTHETICAL.sub(' ', str(title).lower())
+        for segment in _TITLE_SPLIT.split(title):
+            segment = ' '.join(_VERSION.sub(' ', segment).split())
+            if not segment or segment in _TITLE_NOISE or len(segment) < 2:
+                continue
+            if len(segment.split()) <= 2:
+                terms.add(segment)
+                for suffix in _TITLE_SUFFIXES:
+                    head = segment[:-len(suffix)]
+                    if segment.endswith(suffix) and len(head) > 1 and head not in _TITLE_NOISE:
+                        terms.add(head)
+    return terms
+
+def extract_duration(text):
+    """Smallest duration in minutes mentioned in lowercased ``text``, or None"""
+    found = []
+    for pattern, minutes in _FIXED_DURATIONS:
+        if pattern.search(text):
+            found.append(minutes)
+            text = pattern.sub(' ', text)
+    for match in _DURATION_RANGE.finditer(text):
+        # "30-45 minutes" allows up to the upper bound
+        found.append(_to_minutes(_number(match.group(2)), match.group(3)))
+    text = _DURATION_RANGE.sub(' ', text)
+    for match in _DURATION.finditer(text):
+        found.append(_to_minutes(_number(match.group(1)), match.group(2)))
+    found = [minutes for minutes in found if minutes > 0]
+    return min(found) if found else None
+
+class LocalQueryParser:
+    """Rule-based extraction of skills, job level, duration and test types from a query.
+
+    Uses the recommender's own vocabularies (soft skills, superset and role
+    maps, job levels) plus skill names from the catalog titles, so short
+    formulaic queries are answered without a model call. ``parse`` returns
+    the filters and a confidence in [0, 1]; callers fall back to the LLM
+    when it is low.
+    """
+
+    # Free text beyond this many words usually carries nuance rules miss
+    LONG_QUERY_WORDS = 60
+
+    def __init__(self, titles=()):
+        canonical = {}
+        known_skills = set(SOFT_SKILLS) | set(ASSESSMENT_FOCUS_SKILLS)
+        known_skills.update(SUPERSET_MAP)
+        for supers in SUPERSET_MAP.values():
+            known_skills.update(supers)
+        for skills in ROLE_SKILL_MAP.values():
+            known_skills.update(skills)
+        known_skills -= _GENERIC_SKILLS
+        for skill in known_skills | catalog_skill_terms(titles):
+            canonical[skill] = [skill]
+        for alias, skill in SKILL_ALIASES.items():
+            # An alias that is itself a known skill ("ml") is kept next to its canonical form
+            canonical[alias] = [skill, alias] if alias in known_skills else [skill]
+
+        level_terms = set(SENIORITY_TERMS) | set(ROLE_TITLES)
+        for terms in JOB_LEVEL_MAPPING.values():
+            level_terms.update(terms)
+        self.skills = {term: forms for term, forms in canonical.items() if term not in level_terms}
+
+        self._skill_pattern = _boundary_pattern(self.skills)
+        self._seniority_pattern = _boundary_pattern(SENIORITY_TERMS)
+        self._role_pattern = _boundary_pattern(ROLE_TITLES, suffix=r'(?:s|es)?')
+
+    def extract_skills(self, text):
+        skills = []
+        for match in self._skill_pattern.finditer(text):
+            for skill in self.skills[match.group(1)]:
+                if skill not in skills:
+                    skills.append(skill)
+        return skills
+
+    def extract_job_level(self, text):
+        seniority = self._seniority_pattern.search(text)
+        roles = [match.group(1) for match in self._role_pattern.finditer(text)]
+        # The most specific role wins ("research engineer" over "engineer")
+        role = max(roles, key=len) if roles else None
+        parts = [part for part in (seniority and seniority.group(1), role) if part]
+        return " ".join(parts) if parts else None
+
+    def parse(self, query):
+        text = ' '.join(query.lower().split())
+        filters = {
+            "skills": self.extract_skills(text),
+            "job_level": self.extract_job_level(text),
+            "duration_limit": extract_duration(text),
+            "test_types": extract_test_types(text),
+        }
+
+        # Skills carry most of the ranking, a query without any needs the model
+        confidence = 0.55 if filters["skills"] else 0.0
+        if filters["duration_limit"] is not None:
+            confidence += 0.25
+        elif not _DURATION_CUE.search(text):
+            confidence += 0.25
+        confidence += 0.2 if filters["job_level"] else 0.1
+
+        words = len(text.split())
+        if words > self.LONG_QUERY_WORDS:
+            confidence -= min(0.2, (words - self.LONG_QUERY_WORDS) / 500)
+
+        return filters, round(max(0.0, min(1.0, confidence)), 3)
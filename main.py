@@ -1,49 +1,150 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response, HTTPException, Header
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from recommender import parse_query_with_gemini, recommend_assessments
-from langsmith import Client
+from recommender import (parse_query_async, parse_queries_async, cached_recommendations,
+                         recommend_assessments_batch, recommend_semantic, response_cache,
+                         catalog_manager, metrics_text)
+from response_cache import etag_matches
+from config import BATCH_MAX_QUERIES, CATALOG, ADMIN_TOKEN, LOG_LEVEL
+from typing import List, Optional
+import asyncio
+from tracing import get_exporter
 from uuid import uuid4
 import logging
 import uvicorn
 
 # Setup logging for tracing
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=LOG_LEVEL)
 logger = logging.getLogger("recommender-api")
 
 app = FastAPI(title="Assessment Recommender API")
 
 class QueryModel(BaseModel):
     query: str
+    top_k: int = 10
+    # keyword, semantic (embedding similarity) or hybrid (both fused)
+    mode: str = "keyword"
+    # Test type codes, labels or words, replacing the ones extracted from the query
+    test_types: Optional[List[str]] = None
 
-client = Client()
+class BatchQueryModel(BaseModel):
+    queries: List[str]
+
+class ReloadModel(BaseModel):
+    rebuild_snapshot: bool = False
+    force: bool = False
+
+# Spans are queued and exported in batches from a background thread,
+# the tracing backend is never waited on by a request
+tracer = get_exporter()
+
+@app.on_event("startup")
+async def watch_catalog():
+    # Reload the catalog when its files change, without restarting the server
+    if CATALOG["watch_interval"] > 0:
+        catalog_manager.watch(CATALOG["watch_interval"])
 
 @app.post("/recommend")
-async def recommend(query: QueryModel, request: Request):
+async def recommend(query: QueryModel, request: Request, response: Response):
     """
     Recommend assessments based on natural language query
+
+    The body is ``{"recommendations": [...]}`` in every mode. The run ID of
+    the request is sent in the ``X-Run-Id`` header, not the body, so the
+    body of a keyword query stays identical for its ETag.
     """
     run_id = str(uuid4())
-    logger.info(f"🔍 Received query: {query.query} (run_id: {run_id})")
+    logger.info("🔍 Received query: %s (run_id: %s)", query.query, run_id)
     
-    with client.trace(
-        project_name="shl-recommender",
-        run_id=run_id,
-        name="recommend_api_call"
-    ) as run:
-        filters = parse_query_with_gemini(query.query)
-        logger.info(f"🧠 Parsed filters: {filters}")
+    with tracer.span("recommend_api_call", inputs={"query": query.query, "mode": query.mode},
+                     run_id=run_id) as run:
+        # Awaiting keeps the event loop serving other requests during the model call
+        filters = await parse_query_async(query.query)
+        if query.test_types:
+            filters = {**filters, "test_types": query.test_types}
+        logger.debug("🧠 Parsed filters: %s", filters)
         
-        results = recommend_assessments(filters)
-        logger.info(f"✅ Top recommendations: {[r['title'] for r in results]}")
+        if query.mode in ("semantic", "hybrid"):
+            results = recommend_semantic(query.query, filters=filters if query.mode == "hybrid" else None,
+                                         top_k=query.top_k)
+            etag = None
+        else:
+            # Keyword results depend on the filters only, serve them from the response cache
+            results, etag = cached_recommendations(filters, top_k=query.top_k, view="fastapi")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✅ Top recommendations: %s", [r['title'] for r in results])
         
         # Add metadata
         run.end(outputs={"recommendations_count": len(results)})
-    
+
+    # The run ID changes on every request, a cacheable body must not carry it
+    response.headers["X-Run-Id"] = run_id
+    if etag is not None:
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            response_cache.not_modified += 1
+            return Response(status_code=304, headers={"ETag": f'"{etag}"', "X-Run-Id": run_id})
+        response.headers["ETag"] = f'"{etag}"'
+
+    return {"recommendations": results}
+
+@app.post("/recommend/batch")
+async def recommend_batch(batch: BatchQueryModel):
+    """
+    Recommend assessments for a list of queries in one scoring pass
+    """
+    if not batch.queries:
+        raise HTTPException(status_code=400, detail="Provide a non-empty list of queries")
+    if len(batch.queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_QUERIES} queries per batch")
+
+    run_id = str(uuid4())
+    logger.info("🔍 Received batch of %d queries (run_id: %s)", len(batch.queries), run_id)
+
+    with tracer.span("recommend_batch_api_call", inputs={"queries": batch.queries}, run_id=run_id) as run:
+        # Repeated queries are parsed once, the rest concurrently
+        filters_list = await parse_queries_async(batch.queries)
+        batch_results = recommend_assessments_batch(filters_list)
+        run.end(outputs={"queries": len(batch.queries)})
+
     return {
-        "recommendations": results,
-        "run_id": run_id  # Include the run ID in response for debugging
+        "results": [
+            {"query": query, "recommendations": results}
+            for query, results in zip(batch.queries, batch_results)
+        ],
+        "run_id": run_id
     }
 
+def check_admin_token(token: Optional[str]):
+    if not ADMIN_TOKEN or token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.post("/admin/reload")
+async def admin_reload(reload: ReloadModel = ReloadModel(), x_admin_token: Optional[str] = Header(None)):
+    """
+    Reload the catalog of this process, requests keep being served meanwhile
+    """
+    check_admin_token(x_admin_token)
+    # Building the next catalog generation is CPU work, keep it off the event loop
+    report = await asyncio.to_thread(catalog_manager.reload, reload.rebuild_snapshot, reload.force)
+    if "error" in report:
+        raise HTTPException(status_code=500, detail=report)
+    return report
+
+@app.get("/admin/catalog")
+async def admin_catalog(x_admin_token: Optional[str] = Header(None)):
+    """
+    Live catalog version, reload counts and reload latency
+    """
+    check_admin_token(x_admin_token)
+    return catalog_manager.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Stage latency histograms and cache counters of this process, for Prometheus
+    """
+    return PlainTextResponse(metrics_text(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     """
@@ -53,7 +154,9 @@ async def root():
         "name": "Assessment Recommender API",
         "description": "API for recommending assessments based on natural language queries",
         "endpoints": {
-            "/recommend": "POST endpoint for getting assessment recommendations"
+            "/recommend": "POST endpoint for getting assessment recommendations",
+            "/recommend/batch": "POST endpoint for recommendations for a list of queries",
+            "/metrics": "GET endpoint with latency histograms and cache counters"
         }
     }
 
@@ -0,0 +1,139 @@
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from sub-millisecond local work to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Latency histogram with one series per label.
+
+    Observations fall into cumulative-friendly fixed buckets, and the raw
+    samples of the last ``window`` observations per label are kept for
+    percentile estimates.
+    """
+
+    def __init__(self, name, buckets=DEFAULT_BUCKETS, window=1000, label_name="label"):
+        self.name = name
+        self.label_name = label_name
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, label):
+        series = self._series.get(label)
+        if series is None:
+            series = {"counts": [0] * (len(self.buckets) + 1), "count": 0, "sum": 0.0,
+                      "samples": deque(maxlen=self.window)}
+            self._series[label] = series
+        return series
+
+    def observe(self, label, seconds):
+        with self._lock:
+            series = self._get(label)
+            series["counts"][bisect.bisect_left(self.buckets, seconds)] += 1
+            series["count"] += 1
+            series["sum"] += seconds
+            # The deque drops the oldest sample itself, in constant time
+            series["samples"].append(seconds)
+
+    def labels(self):
+        return list(self._series)
+
+    def totals(self):
+        """``{label: (bucket counts, count, sum)}`` without the samples"""
+        with self._lock:
+            return {label: (list(series["counts"]), series["count"], series["sum"])
+                    for label, series in self._series.items()}
+
+    def percentile(self, label, q):
+        with self._lock:
+            samples = sorted(self._series.get(label, {}).get("samples", []))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def snapshot(self):
+        """Counts, totals, bucket counts and p50/p95 per label"""
+        report = {}
+        for label in self.labels():
+            with self._lock:
+                series = self._series[label]
+                counts = list(series["counts"])
+                count, total = series["count"], series["sum"]
+            report[label] = {
+                "count": count,
+                "avg_ms": round(total / count * 1000, 3) if count else 0.0,
+                "p50_ms": round(self.percentile(label, 50) * 1000, 3),
+                "p95_ms": round(self.percentile(label, 95) * 1000, 3),
+                "buckets": dict(zip([*self.buckets, float("inf")], counts)),
+            }
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+@contextmanager
+def timed(histogram, label):
+    """Observe the wall time of the block under ``label``.
+
+    The yielded dict lets the block change the label once it knows which
+    path it took.
+    """
+    span = {"label": label}
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        histogram.observe(span["label"], time.perf_counter() - start)
+
+# Time to turn a query into filters, labelled by the path that answered it
+PARSE_LATENCY = Histogram("parse_query_seconds", label_name="path")
+
+# Time spent in each stage of a recommendation: expand, score components, filter, top_k, serialize
+STAGE_LATENCY = Histogram("recommend_stage_seconds", label_name="stage")
+
+def format_histogram(histogram):
+    """One printable line per label"""
+    lines = []
+    for label, stats in histogram.snapshot().items():
+        lines.append(f"{histogram.name}{{{histogram.label_name}={label}}} count={stats['count']} "
+                     f"avg={stats['avg_ms']}ms p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms")
+    return lines
+
+def _labels(pairs):
+    """``{name="value",...}`` of ``(name, value)`` pairs, escaped for the text format"""
+    if not pairs:
+        return ""
+    escaped = [(key, str(value).replace("\\", "\\\\").replace('"', '\\"')) for key, value in pairs]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+def render_prometheus(histograms=(), counters=None, gauges=None):
+    """Prometheus text exposition format of the given metrics.
+
+    ``counters`` and ``gauges`` map a metric name to ``{labels: value}``,
+    where ``labels`` is a tuple of ``(name, value)`` pairs, empty for an
+    unlabelled series.
+    """
+    lines = []
+    for histogram in histograms:
+        lines += [f"# TYPE {histogram.name} histogram"]
+        for label, (counts, count, total) in histogram.totals().items():
+            base = ((histogram.label_name, label),)
+            cumulative = 0
+            for bound, bucket in zip([*histogram.buckets, "+Inf"], counts):
+                cumulative += bucket
+                lines.append(f"{histogram.name}_bucket{_labels(base + (('le', bound),))} {cumulative}")
+            lines.append(f"{histogram.name}_sum{_labels(base)} {total}")
+            lines.append(f"{histogram.name}_count{_labels(base)} {count}")
+    for kind, metrics in (("counter", counters), ("gauge", gauges)):
+        for name, series in (metrics or {}).items():
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series.items():
+                lines.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
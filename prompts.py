@@ -22,11 +22,13 @@ Extract ONLY the following fields:
 - "skills": list of strings (e.g., ["Python", "Machine Learning"])
 - "job_level": string (e.g., "Entry", "Mid", "Senior")
 - "duration_limit": integer (duration in minutes)
+- "test_types": list of test type codes the query asks for: A (ability, aptitude, cognitive), B (biodata, situational judgement), C (competencies), D (development, 360), E (assessment exercises), K (knowledge and skills), P (personality, behavior), S (simulations)
 
 Rules:
 - Be concise. Do not include extra explanation.
 - If the query mentions specific fields like "Generative AI", infer parent skills like "AI".
 - If the job level is unclear, leave it as null.
+- Only list test types the query names explicitly, otherwise return an empty list.
 - Always respond with a valid JSON object only.
 - Convert all skill names to their standard forms (e.g., "Java Script" should be "JavaScript", "ML" should be "Machine Learning")
 - Pay special attention to job roles mentioned (e.g., "research engineer", "developer", "analyst") and include them in job_level
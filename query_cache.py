@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from prompts import build_extraction_prompt
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used for cache keys"""
+    return re.sub(r'\s+', ' ', query).strip().casefold()
+
+def prompt_fingerprint() -> str:
+    """Hash of the extraction prompt template, so editing the prompt invalidates old entries"""
+    template = build_extraction_prompt("{query}")
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+class QueryCache:
+    """Two-tier cache of filters extracted from queries.
+
+    The first tier is an in-process LRU with a TTL. The second is a SQLite
+    file shared by every worker process and kept across restarts. Entries
+    are addressed by a hash of the normalized query, the prompt template
+    and the model name.
+    """
+
+    def __init__(self, path=None, max_entries=1024, ttl=24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prompt_hash = prompt_fingerprint()
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, query: str, model_name: str) -> str:
+        content = "\x1f".join([normalize_query(query), self.prompt_hash, model_name])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _db(self):
+        # SQLite connections must not cross a fork, reopen in every worker
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache ("
+                "key TEXT PRIMARY KEY, filters TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, filters, created_at):
+        self._memory[key] = (filters, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str):
+        """Cached filters for ``key`` or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                filters, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return json.loads(filters)
+                del self._memory[key]
+                self.evictions += 1
+
+            if self.path:
+                try:
+                    row = self._db().execute(
+                        "SELECT filters, created_at FROM query_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Query cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    filters, created_at = row
+                    if now - created_at <= self.ttl:
+                        self._remember(key, filters, created_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(filters)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, filters: dict):
+        """Store extracted filters in both tiers"""
+        created_at = time.time()
+        serialized = json.dumps(filters)
+        with self._lock:
+            self._remember(key, serialized, created_at)
+            if self.path:
+                try:
+                    db = self._db()
+                    db.execute(
+                        "INSERT OR REPLACE INTO query_cache (key, filters, created_at) VALUES (?, ?, ?)",
+                        (key, serialized, created_at),
+                    )
+                    db.execute("DELETE FROM query_cache WHERE created_at < ?", (created_at - self.ttl,))
+                    db.commit()
+                except sqlite3.Error as e:
+                    print(f"Query cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.path:
+                db = self._db()
+                db.execute("DELETE FROM query_cache")
+                db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._memory),
+        }
@@ -1,33 +1,58 @@
-import pandas as pd
 import os
 import json
 from dotenv import load_dotenv
 import google.generativeai as genai
 from prompts import build_extraction_prompt
 import re
-from config import SCORING_WEIGHTS, get_model
+import asyncio
+import logging
+from config import (SCORING_WEIGHTS, MODEL_NAME, QUERY_CACHE, LOCAL_PARSER_MIN_CONFIDENCE, LLM_CLIENT,
+                    SEMANTIC, CATALOG, RESPONSE_CACHE, get_model)
+from query_cache import QueryCache, normalize_query
+from response_cache import ResponseCache, canonical_filters
+from concurrent.futures import ThreadPoolExecutor
+from taxonomy import classify_skills, expand_technical_skills, match_job_level_category
+from catalog_manager import CatalogManager, CATALOG_RELOAD
+from scoring import ScoringEngine, top_k_rows
+from semantic import fuse_scores
+from assessment_types import mask_codes, test_types_mask
+from metrics import PARSE_LATENCY, STAGE_LATENCY, timed, render_prometheus
+from llm_client import AsyncLLMClient
+import numpy as np
 from langsmith import traceable
 
+# Request details are logged at DEBUG, behind isEnabledFor so the hot path
+# formats nothing when debug logging is off
+logger = logging.getLogger("recommender")
+
 # Load API key from .env
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Load and clean SHL dataset
-shl_df = pd.read_csv("shl_clean.csv", encoding='latin1')
-shl_df = shl_df.rename(columns=lambda x: x.strip().lower().replace(" ", "_"))
+# Load and clean SHL dataset, from the prebuilt snapshot when there is one.
+# The manager owns the live catalog generation and swaps in new ones on reload
+catalog_manager = CatalogManager(CATALOG["csv"], CATALOG["urls"], CATALOG["snapshot"], SEMANTIC)
+
+def _use_catalog(state):
+    """Point the module-level catalog names at a catalog generation"""
+    global shl_df, catalog_version, catalog_index, scoring_engine, local_parser
+    shl_df, catalog_version = state.df, state.version
+    # The read-only catalog index, built once per generation, every scorer shares it
+    catalog_index, scoring_engine, local_parser = state.index, state.engine, state.parser
+
+_use_catalog(catalog_manager.current)
+catalog_manager.subscribe(_use_catalog)
 
-if "topic" in shl_df.columns:
-    shl_df = shl_df.rename(columns={"topic": "title"})
+# Extracted filters, shared by every request in this process and backed by
+# SQLite across workers and restarts
+query_cache = QueryCache(**QUERY_CACHE)
 
-if "assessment_length" in shl_df.columns:
-    # Keep original values, don't fill with 60
-    shl_df["assessment_length"] = pd.to_numeric(shl_df["assessment_length"], errors="coerce")
-    # Only fill NaN values with 0 instead of 60
-    shl_df["assessment_length"] = shl_df["assessment_length"].fillna(0)
+# Final payloads of keyword recommendations; entries are per catalog version
+response_cache = ResponseCache(**RESPONSE_CACHE, catalog_version=catalog_version)
+catalog_manager.subscribe(lambda state: response_cache.set_catalog_version(state.version))
 
-def exact_skill_match_count(row, skills):
-    text = f"{row['title']} {row['description']}".lower()
-    return sum(1 for skill in skills if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text))
+# Async Gemini calls from the API share one client so the in-flight limit is per process
+llm_client = AsyncLLMClient(**LLM_CLIENT)
 
 def parse_query_with_gemini_old(query: str) -> dict:
     prompt = build_extraction_prompt(query)
@@ -44,341 +69,430 @@ def parse_query_with_gemini_old(query: str) -> dict:
         print(f"Gemini parsing failed: {e}")
         return {}
     
-#@traceable(name="parse_query_with_gemini")
-def parse_query_with_gemini(query: str) -> dict:
-    prompt = build_extraction_prompt(query)
-    print("Gemini prompt:\n", prompt)
-
-    model = get_model()
-    response = model.generate_content(prompt)
-
-    print("\nGemini response:\n", response.text)
+def filters_from_response(text: str):
+    """Filters from a model response, None when it holds no valid JSON"""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Gemini response:\n%s", text)
     
     # Extract JSON from response (it might be wrapped in markdown code blocks)
     json_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-    match = re.search(json_pattern, response.text)
+    match = re.search(json_pattern, text)
     
     if match:
         json_str = match.group(1)
     else:
-        json_str = response.text
+        json_str = text
     
     # Clean up any remaining non-JSON content
     json_str = json_str.strip()
-    print("\n🧪 Cleaned JSON string:\n", json_str)
+    if debug:
+        logger.debug("🧪 Cleaned JSON string:\n%s", json_str)
     
     try:
         filters = json.loads(json_str)
-        
-        # Convert all lists and strings to lowercase
-        if "skills" in filters and filters["skills"]:
-            filters["skills"] = [skill.lower() for skill in filters["skills"]]
-            
-        if "job_level" in filters and filters["job_level"]:
-            filters["job_level"] = filters["job_level"].lower()
-            
-        return filters
     except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}")
+        logger.warning("Error parsing JSON: %s", e)
+        return None
+
+    # Convert all lists and strings to lowercase
+    if "skills" in filters and filters["skills"]:
+        filters["skills"] = [skill.lower() for skill in filters["skills"]]
+        
+    if "job_level" in filters and filters["job_level"]:
+        filters["job_level"] = filters["job_level"].lower()
+
+    # Codes, labels or words all become codes
+    if "test_types" in filters:
+        filters["test_types"] = mask_codes(test_types_mask(filters["test_types"]))
+
+    return filters
+
+#@traceable(name="parse_query_with_gemini")
+def parse_query_with_gemini(query: str, model=None, cache=query_cache) -> dict:
+    model = model or get_model()
+
+    # Same normalized query, prompt and model: reuse the earlier extraction
+    if cache is not None:
+        cache_key = cache.key(query, getattr(model, "model_name", MODEL_NAME))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    prompt = build_extraction_prompt(query)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Gemini prompt:\n%s", prompt)
+
+    response = model.generate_content(prompt)
+
+    filters = filters_from_response(response.text)
+    if filters is None:
         return {"skills": [], "job_level": None, "duration_limit": None}
 
-def apply_scores(df):
-    df['score'] = (
-        df['technical_score'] * SCORING_WEIGHTS['technical_score'] +
-        df['title_relevance'] * SCORING_WEIGHTS['title_relevance'] +
-        df['inferred_score'] * SCORING_WEIGHTS['inferred_score'] +
-        df['soft_skill_score'] * SCORING_WEIGHTS['soft_skill_score']
-    )
-    return df
-
-def recommend(df, top_k=5):
-    df = apply_scores(df)
-    df = df.sort_values(by='score', ascending=False)
-    return df.head(top_k)
-
-def tokenize_term(term):
-    """Break a term into its component words and parts"""
-    # Convert to lowercase
-    term = term.lower()
-    
-    # Replace hyphens and underscores with spaces
-    term = term.replace('-', ' ').replace('_', ' ')
-    
-    # Split into words
-    words = term.split()
-    
-    # Add the original term and individual words
-    tokens = [term] + words
-    
-    # Add combinations of adjacent words
-    for i in range(len(words) - 1):
-        tokens.append(words[i] + ' ' + words[i+1])
-    
-    return set(tokens)
+    if cache is not None:
+        cache.set(cache_key, filters)
+    return filters
 
-def terms_overlap(term1, term2):
-    """Check if two terms overlap by breaking them into tokens"""
-    tokens1 = tokenize_term(term1)
-    tokens2 = tokenize_term(term2)
-    
-    # Check for any overlap between token sets
-    return bool(tokens1.intersection(tokens2))
+async def parse_query_with_gemini_async(query: str, fallback=None, client=None, cache=query_cache) -> dict:
+    """Non-blocking ``parse_query_with_gemini`` for the async API.
+
+    The call goes through the shared ``AsyncLLMClient`` (timeout, in-flight
+    limit, hedging). When the deadline passes or the model fails, the
+    ``fallback`` filters are returned instead, marked as degraded. So are
+    they when the model cannot be created, e.g. without an API key.
+    """
+    client = client or llm_client
+    try:
+        model = client.model()
+
+        if cache is not None:
+            cache_key = cache.key(query, getattr(model, "model_name", MODEL_NAME))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        prompt = build_extraction_prompt(query)
+        text = await client.generate(prompt, model=model)
+    except Exception as e:
+        reason = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+        logger.warning("Gemini call failed (%s: %r), using local filters", reason, e)
+        degraded = dict(fallback or {"skills": [], "job_level": None, "duration_limit": None})
+        degraded["degraded"] = True
+        return degraded
+
+    filters = filters_from_response(text)
+    if filters is None:
+        return {"skills": [], "job_level": None, "duration_limit": None}
+
+    if cache is not None:
+        cache.set(cache_key, filters)
+    return filters
+
+def parse_query(query: str, model=None, cache=query_cache, min_confidence=None) -> dict:
+    """Extract filters with the local rule-based parser, asking Gemini only when it is unsure"""
+    if min_confidence is None:
+        min_confidence = LOCAL_PARSER_MIN_CONFIDENCE
+
+    with timed(PARSE_LATENCY, "local") as span:
+        filters, confidence = local_parser.parse(query)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Local parser confidence %s: %s", confidence, filters)
+        if confidence >= min_confidence:
+            return filters
+
+        span["label"] = "llm"
+        return parse_query_with_gemini(query, model=model, cache=cache)
+
+async def parse_query_async(query: str, client=None, cache=query_cache, min_confidence=None) -> dict:
+    """``parse_query`` for async handlers, the local filters double as the degraded answer"""
+    if min_confidence is None:
+        min_confidence = LOCAL_PARSER_MIN_CONFIDENCE
+
+    with timed(PARSE_LATENCY, "local") as span:
+        filters, confidence = local_parser.parse(query)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Local parser confidence %s: %s", confidence, filters)
+        if confidence >= min_confidence:
+            return filters
+
+        span["label"] = "llm"
+        result = await parse_query_with_gemini_async(query, fallback=filters, client=client, cache=cache)
+        if result.get("degraded"):
+            span["label"] = "degraded"
+        return result
+
+def parse_queries(queries, max_workers=8) -> list:
+    """``parse_query`` for a batch: repeated queries are parsed once, the rest concurrently"""
+    unique = list(dict.fromkeys(normalize_query(query) for query in queries))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+        parsed = dict(zip(unique, pool.map(parse_query, unique)))
+    return [parsed[normalize_query(query)] for query in queries]
+
+async def parse_queries_async(queries, client=None) -> list:
+    """``parse_query_async`` for a batch, repeated queries are parsed once"""
+    unique = list(dict.fromkeys(normalize_query(query) for query in queries))
+    parsed = await asyncio.gather(*(parse_query_async(query, client=client) for query in unique))
+    parsed = dict(zip(unique, parsed))
+    return [parsed[normalize_query(query)] for query in queries]
 
 #@traceable(name="recommend_assessments")
-def recommend_assessments(filters: dict):
+def recommend_assessments(filters: dict, engine: ScoringEngine = None, top_k: int = 10):
+    engine = engine or scoring_engine
+    score, description_match_score, keep = score_assessments(filters, engine)
+    return top_results(engine, score, description_match_score, keep, top_k)
 
-    df = shl_df.copy()
-    
-    # Initialize scoring columns for all possible paths
-    df['technical_score'] = 0
-    df['soft_skill_score'] = 0
-    df['inferred_score'] = 0
-    df['job_level_score'] = 0
-    df['description_match_score'] = 0
-    df['title_relevance'] = 0
-
-    # --- Skill filtering - But don't filter, just score ---
-    if 'skills' in filters and filters['skills']:
-        # Identify soft skills
-        soft_skills = {'collaboration', 'communication', 'teamwork', 'leadership', 
-                     'problem solving', 'critical thinking', 'adaptability', 
-                     'time management', 'interpersonal', 'work ethic', 'creativity',
-                     'organization', 'attention to detail', 'management', 'negotiation'}
-        
-        # Separate technical and soft skills
-        technical_skills = []
-        identified_soft_skills = []
-        
-        for skill in filters['skills']:
-            is_soft = False
-            for soft_skill in soft_skills:
-                if soft_skill.lower() in skill.lower():
-                    identified_soft_skills.append(skill)
-                    is_soft = True
-                    break
-            if not is_soft:
-                technical_skills.append(skill)
-        
-        # Expand known skills into supersets
-        superset_map = {
-            'generative ai': ['ai', 'machine learning', 'deep learning', 'llm', 'large language models'],
-            'llm': ['ai', 'machine learning', 'nlp', 'natural language processing'],
-            'nlp': ['ai', 'machine learning', 'natural language processing'],
-            'computer vision': ['ai', 'ml', 'machine learning', 'deep learning', 'image processing'],
-            'chatgpt': ['generative ai', 'llm', 'ai', 'language model', 'nlp'],
-            'data science': ['statistics', 'analytics', 'data analysis', 'ml'],
-            'frontend': ['javascript', 'html', 'css', 'web development', 'ui'],
-            'backend': ['api', 'server', 'database', 'web development'],
-            'machine learning': ['ai', 'algorithms', 'data science'],
-            'deep learning': ['ai', 'neural networks', 'machine learning'],
-            'devops': ['ci/cd', 'cloud', 'infrastructure', 'deployment'],
-            'cloud computing': ['aws', 'azure', 'gcp', 'infrastructure']
-        }
-        
-        expanded_tech_skills = set()
-        for skill in technical_skills:
-            expanded_tech_skills.add(skill)
-            for super_key, supers in superset_map.items():
-                if skill.lower() in super_key or super_key in skill.lower():
-                    expanded_tech_skills.update(supers)
-        
-        technical_skills = list(expanded_tech_skills)
-        
-        print(f"Technical skills (expanded): {technical_skills}")
-        print(f"Soft skills: {identified_soft_skills}")
-
-        # Function to infer skills from role titles
-        def infer_skills_from_role(title):
-            title = str(title).lower()
-            inferred = []
-            
-            role_skill_map = {
-                'research': ['ai', 'ml', 'data science', 'analytics', 'algorithms'],
-                'engineer': ['software development', 'programming', 'technical'],
-                'research engineer': ['ai', 'ml', 'machine learning', 'data science', 'algorithms'],
-                'data scientist': ['data science', 'statistics', 'machine learning', 'python'],
-                'developer': ['programming', 'software development', 'coding'],
-                'analyst': ['data analysis', 'analytics', 'statistics'],
-                'designer': ['ui', 'ux', 'design', 'creative'],
-                'manager': ['leadership', 'management', 'team', 'project management'],
-                'product': ['product management', 'strategy', 'roadmap']
-            }
-            
-            for role, skills in role_skill_map.items():
-                if role in title:
-                    inferred.extend(skills)
-            
-            return inferred
-        
-        # SCORE technical skills matches (but don't filter)
+def cached_recommendations(filters: dict, render=None, top_k: int = 10, view: str = "records",
+                           cache: ResponseCache = response_cache, engine: ScoringEngine = None):
+    """``(payload, etag)`` of ``render(recommend_assessments(filters))``, from the response cache.
+
+    Keys use the canonical filters the scorer ranks by, so queries
+    differing only in skill order or case, or in a duration limit
+    selecting the same assessments, share one entry. ``view`` names the rendering so different payload
+    formats never collide.
+    """
+    state = catalog_manager.current
+    engine = engine or state.engine
+    render = render or (lambda results: results)
+    key = cache.key(filters, engine.durations, version=state.version, top_k=top_k, view=view)
+    entry = cache.get(key)
+    if entry is None:
+        results = recommend_assessments(filters, engine=engine, top_k=top_k)
+        with timed(STAGE_LATENCY, "render"):
+            entry = cache.set(key, render(results))
+    return entry
+
+def cached_response(filters: dict, top_k: int = 10, cache: ResponseCache = response_cache):
+    """``(body, etag)`` of the ``/recommend`` JSON body, from the response cache.
+
+    On a miss the body is joined from the precomputed JSON fragments of
+    the top rows, no result dicts are built or encoded.
+    """
+    state = catalog_manager.current
+    engine = state.engine
+    key = cache.key(filters, engine.durations, version=state.version, top_k=top_k, view="fragments")
+    entry = cache.get(key)
+    if entry is None:
+        score, description_match_score, keep = score_assessments(filters, engine)
+        rows = top_rows(score, description_match_score, keep, top_k)
+        with timed(STAGE_LATENCY, "render"):
+            entry = cache.set(key, state.fragments.render(rows))
+    return entry
+
+def score_assessments(filters: dict, engine: ScoringEngine):
+    """Keyword score, description match and duration mask of every catalog row.
+
+    Filters are canonicalized first, duplicate skills count once. Each
+    stage is timed into ``STAGE_LATENCY``.
+    """
+    filters = canonical_filters(filters)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    score = np.zeros(engine.size, dtype=np.int64)
+    description_match_score = np.zeros(engine.size)
+
+    # --- Skill scoring - But don't filter, just score ---
+    if filters.get('skills'):
+        with timed(STAGE_LATENCY, "expand"):
+            technical_skills, identified_soft_skills = classify_skills(filters['skills'])
+            technical_skills = expand_technical_skills(technical_skills)
+
+        if debug:
+            logger.debug("Technical skills (expanded): %s", technical_skills)
+            logger.debug("Soft skills: %s", identified_soft_skills)
+
+        # Technical skills have more weight than soft skills
         if technical_skills:
-            # Calculate scores even for entries that don't have exact matches
-            df['technical_score'] = df.apply(lambda row: exact_skill_match_count(row, technical_skills), axis=1)
-            
-            # Add title relevance score for more relevant weighting
-            df['title_relevance'] = df.apply(
-                lambda row: sum(
-                    str(row['title']).lower().count(skill.lower()) * 2  # Title matches worth double
-                    for skill in technical_skills
-                ), 
-                axis=1
-            )
-            
-            # Add inferred skills score
-            df['inferred_skills'] = df['title'].apply(infer_skills_from_role)
-            df['inferred_score'] = df.apply(
-                lambda row: sum(
-                    1 for skill in row['inferred_skills'] 
-                    if not any(tech.lower() in skill.lower() or skill.lower() in tech.lower() for tech in technical_skills)
-                ), 
-                axis=1
-            )
-            
-        # Score soft skills as bonus
+            with timed(STAGE_LATENCY, "technical_score"):
+                score += engine.technical_score(technical_skills) * SCORING_WEIGHTS['technical_score']
+            with timed(STAGE_LATENCY, "title_relevance"):
+                score += engine.title_relevance(technical_skills) * SCORING_WEIGHTS['title_relevance']
+            with timed(STAGE_LATENCY, "inferred_score"):
+                score += engine.inferred_score(technical_skills) * SCORING_WEIGHTS['inferred_score']
+
         if identified_soft_skills:
-            df['soft_skill_score'] = df.apply(
-                lambda row: sum(
-                    skill.lower() in f"{str(row['title'])} {str(row['description'])}".lower()
-                    for skill in identified_soft_skills
-                ),
-                axis=1
-            )
-            
-        # Calculate score from combination of technical, inferred, and soft skills
-        # Technical skills have more weight than soft skills
-        df['score'] = apply_scores(df)['score']
-        
-        # Add description relevance score
+            with timed(STAGE_LATENCY, "soft_skill_score"):
+                score += engine.soft_skill_score(identified_soft_skills) * SCORING_WEIGHTS['soft_skill_score']
+
         all_skills = technical_skills + identified_soft_skills
         if all_skills:
-            # Calculate how much of the description matches any skill
-            df['description_match_score'] = df.apply(
-                lambda row: sum(
-                    str(row['description']).lower().count(skill.lower()) 
-                    for skill in all_skills
-                ) / (len(str(row['description'])) + 1) * 100,  # Normalize by description length
-                axis=1
-            )
-    else:
-        df['score'] = 0
-        df['description_match_score'] = 0
+            with timed(STAGE_LATENCY, "description_match"):
+                description_match_score = engine.description_match_score(all_skills)
 
     # --- Job level scoring (not filtering) ---
     job_level = filters.get('job_level')
-    if job_level and isinstance(job_level, str) and 'job_levels' in df.columns:
-        # Base job level categories
-        job_level_mapping = {
-            'entry': ['entry', 'junior', 'beginner', 'novice', 'entry level', 'entry-level'],
-            'mid': ['mid', 'intermediate', 'middle', 'mid-level', 'mid level', 'mid-career', 'mid professional'],
-            'senior': ['senior', 'advanced', 'expert', 'lead', 'senior level', 'senior-level'],
-            'executive': ['executive', 'c-level', 'director', 'manager', 'management']
-        }
-        
-        # Infer job level from role name
-        role_level_mapping = {
-            'research engineer': ['mid', 'senior'],
-            'senior': ['senior'],
-            'lead': ['senior'],
-            'principal': ['senior'],
-            'director': ['executive'],
-            'manager': ['executive'],
-            'head': ['executive'],
-            'chief': ['executive'],
-            'junior': ['entry'],
-            'associate': ['entry', 'mid'],
-            'intern': ['entry']
-        }
-        
-        # Find category using token overlap
-        matched_category = None
-        for category, terms in job_level_mapping.items():
-            if any(terms_overlap(job_level, term) for term in terms):
-                matched_category = category
-                break
-                
-        # Apply job level scoring based on matched category (but don't filter)
-        if 'job_levels' in df.columns:
+    if job_level and isinstance(job_level, str):
+        with timed(STAGE_LATENCY, "job_level"):
+            matched_category = match_job_level_category(job_level)
             if matched_category:
-                # Get all terms from the matched category for pattern matching
-                category_terms = job_level_mapping[matched_category]
-                print(f"Job level '{job_level}' matched to category: {matched_category}")
-                print(f"Using terms for scoring: {category_terms}")
-                
-                # Score based on matched category
-                df['job_level_score'] = df.apply(
-                    lambda row: 2 if any(
-                        term.lower() in str(row['job_levels']).lower() 
-                        for term in category_terms
-                    ) else 0,
-                    axis=1
-                )
-                
-                # Also try to match from job title for roles
-                for role, levels in role_level_mapping.items():
-                    if matched_category in levels:
-                        df['job_level_score'] += df.apply(
-                            lambda row: 3 if role.lower() in str(row['title']).lower() else 0,
-                            axis=1
-                        )
+                score += engine.job_level_category_score(matched_category)
             else:
-                # Try to infer from the job title itself
-                print(f"No direct category match for '{job_level}', inferring from title/description")
-                
-                tokens = tokenize_term(job_level)
-                # Only use tokens that are meaningful (3+ characters)
-                meaningful_tokens = [t for t in tokens if len(t) >= 3]
-                
-                df['job_level_score'] = df.apply(
-                    lambda row: sum(
-                        2 for token in meaningful_tokens 
-                        if token in str(row['title']).lower() or token in str(row['job_levels']).lower()
-                    ),
-                    axis=1
-                )
-            
-            # Add job level score to total score
-            df['score'] += df['job_level_score']
+                score += engine.job_level_token_score(job_level)
+        if debug:
+            if matched_category:
+                logger.debug("Job level '%s' matched to category: %s", job_level, matched_category)
+            else:
+                logger.debug("No direct category match for '%s', inferring from title/description", job_level)
 
     # --- Duration limit filtering (only if strict match available) ---
+    keep = np.ones(engine.size, dtype=bool)
     duration_limit = filters.get('duration_limit')
     if duration_limit is not None:
         try:
             duration_limit = float(duration_limit)
-            
+
             # More relaxed filtering approach - add as a score factor first
-            df['duration_match'] = df.apply(
-                lambda row: 3 if row['assessment_length'] <= duration_limit else 
-                           (1 if row['assessment_length'] <= duration_limit*1.5 else 0),
-                axis=1
-            )
-            
-            df['score'] += df['duration_match']
-            
-            # Only filter if we'd still have results
-            filtered_df = df[df['assessment_length'] <= duration_limit]
-            if len(filtered_df) >= 3:  # Make sure we have at least 3 results
-                df = filtered_df
-            else:
-                print(f"Keeping all results despite duration limit {duration_limit}, added as score factor instead")
-                
+            with timed(STAGE_LATENCY, "duration_score"):
+                score += engine.duration_match(duration_limit)
+
+            # Only filter if we'd still have results, counted by binary search
+            with timed(STAGE_LATENCY, "filter"):
+                if engine.durations.count_within(duration_limit) >= 3:  # Make sure we have at least 3 results
+                    keep = engine.durations.mask_within(duration_limit)
+                elif debug:
+                    logger.debug("Keeping all results despite duration limit %s, added as score factor instead",
+                                 duration_limit)
+
         except ValueError:
             pass
 
-    # --- Final cleanup ---
-    if df.empty:
-        return []
+    # --- Test type filtering, any of the requested types ---
+    test_types = test_types_mask(filters.get('test_types'))
+    if test_types:
+        with timed(STAGE_LATENCY, "test_types"):
+            typed = keep & engine.test_type_match(test_types)
+            # Same guard as the duration filter
+            if np.count_nonzero(typed) >= 3:
+                keep = typed
+            elif debug:
+                logger.debug("Keeping all results despite test types %s, too few matches",
+                             filters.get('test_types'))
 
-    # Select relevant columns
-    result_df = df[[
-        'title', 'description', 'job_levels', 'language',
-        'assessment_length', 'test_type', 'remote_testing',
-        'adaptive/irt', 'score', 'description_match_score'
-    ]]
+    return score, description_match_score, keep
 
-    # Always return results, sorted by score
-    result_df = result_df.fillna("N/A").sort_values(by=['score', 'description_match_score'], ascending=[False, False]).head(10)
-    
-    # Drop the scoring columns from the final output
-    result_df = result_df.drop(columns=['description_match_score'])
+def top_rows(score, description_match_score, keep, top_k=10):
+    """Catalog rows of the ``top_k`` best scores left in ``keep``, best first"""
+    with timed(STAGE_LATENCY, "top_k"):
+        rows = np.flatnonzero(keep)
+        if len(rows) == 0:
+            return rows
+
+        # Best by score then description match, ties keep catalog order.
+        # Only the winners are sorted
+        return rows[top_k_rows(score[rows], description_match_score[rows], top_k)]
+
+def top_results(engine, score, description_match_score, keep, top_k=10):
+    """Response records of the ``top_k`` best rows left in ``keep``"""
+    top = top_rows(score, description_match_score, keep, top_k)
+    return [engine.index.result(row, int(score[row])) for row in top]
+
+def metrics_text() -> str:
+    """Latency histograms and cache counters in the Prometheus text format"""
+    caches = {"query": query_cache.stats(), "response": response_cache.stats()}
+    counters = {f"cache_{result}_total": {(("cache", name),): stats[result] for name, stats in caches.items()}
+                for result in ("hits", "misses", "evictions")}
+    counters["cache_not_modified_total"] = {(("cache", "response"),): caches["response"]["not_modified"]}
+    llm = llm_client.stats()
+    counters["llm_calls_total"] = {(): llm["calls"]}
+    counters["llm_hedges_total"] = {(): llm["hedges"]}
+    counters["llm_timeouts_total"] = {(): llm["timeouts"]}
+    counters["llm_errors_total"] = {(): llm["errors"]}
+
+    state = catalog_manager.current
+    gauges = {
+        "catalog_rows": {(("version", state.version),): len(state.df)},
+        "catalog_loaded_at_seconds": {(): state.loaded_at},
+    }
+    return render_prometheus(histograms=(PARSE_LATENCY, STAGE_LATENCY, llm_client.latency, CATALOG_RELOAD),
+                             counters=counters, gauges=gauges)
+
+def get_vector_store():
+    """Catalog embeddings for semantic retrieval, opened on first use.
+
+    Memory-mapped, so every worker shares the page cache copy of the vectors
+    """
+    return catalog_manager.current.vector_store()
+
+def warm_up(semantic=True):
+    """Build the lazily created read-only structures now.
+
+    Called in the gunicorn master before forking so workers inherit them
+    instead of building their own copy on their first request.
+    """
+    if semantic:
+        get_vector_store()
+
+def recommend_semantic(query: str, filters: dict = None, keyword_weight: float = None,
+                       engine: ScoringEngine = None, top_k: int = 10):
+    """Recommend by embedding similarity to ``query``, optionally fused with the keyword score.
+
+    With ``filters`` the keyword score and duration filter of
+    ``recommend_assessments`` are blended in with ``keyword_weight``
+    (0 is purely semantic). The returned ``score`` is the fused score and
+    ``similarity`` the cosine similarity.
+    """
+    state = catalog_manager.current
+    engine = engine or state.engine
+    store = state.vector_store()
+    if keyword_weight is None:
+        keyword_weight = SEMANTIC["keyword_weight"] if filters else 0.0
+
+    similarity = store.similarities(state.embedder.encode([query])[0], catalog_size=engine.size)
+    keep = np.ones(engine.size, dtype=bool)
+    score = similarity.astype(np.float64)
+    if filters:
+        keyword_score, _, keep = score_assessments(filters, engine)
+        score = fuse_scores(keyword_score, similarity, keyword_weight)
+
+    rows = np.flatnonzero(keep)
+    top = rows[top_k_rows(score[rows], k=top_k)]
+    results = []
+    for row in top:
+        result = engine.index.result(row, round(float(score[row]), 4))
+        result['similarity'] = round(float(similarity[row]), 4)
+        results.append(result)
+    return results
+
+def recommend_assessments_batch(filters_list, engine: ScoringEngine = None, top_k: int = 10):
+    """``recommend_assessments`` for many filter sets at once.
+
+    Scores form one (queries x catalog rows) matrix: each distinct skill of
+    the batch is looked up once and combined per query with a matrix
+    product. Filter sets are canonicalized as in ``score_assessments``.
+    Returns one result list per filter set, in order.
+    """
+    engine = engine or scoring_engine
+    filters_list = [canonical_filters(filters) for filters in filters_list]
+    count = len(filters_list)
+    logger.debug("Scoring a batch of %d filter sets", count)
+
+    technical, soft = [], []
+    for filters in filters_list:
+        technical_skills, identified_soft_skills = [], []
+        if filters.get('skills'):
+            technical_skills, identified_soft_skills = classify_skills(filters['skills'])
+            technical_skills = expand_technical_skills(technical_skills)
+        technical.append(technical_skills)
+        soft.append(identified_soft_skills)
+
+    score = (engine.technical_scores(technical) * SCORING_WEIGHTS['technical_score']
+             + engine.title_relevances(technical) * SCORING_WEIGHTS['title_relevance']
+             + engine.inferred_scores(technical) * SCORING_WEIGHTS['inferred_score']
+             + engine.soft_skill_scores(soft) * SCORING_WEIGHTS['soft_skill_score'])
+    description_match_score = engine.description_match_scores([t + s for t, s in zip(technical, soft)])
+
+    # Job levels repeat across a batch, score each distinct one once
+    job_level_scores = {}
+    for q, filters in enumerate(filters_list):
+        job_level = filters.get('job_level')
+        if job_level and isinstance(job_level, str):
+            if job_level not in job_level_scores:
+                matched_category = match_job_level_category(job_level)
+                job_level_scores[job_level] = (engine.job_level_category_score(matched_category)
+                                               if matched_category else engine.job_level_token_score(job_level))
+            score[q] += job_level_scores[job_level]
+
+    keep = np.ones((count, engine.size), dtype=bool)
+    timed_queries, limits = [], []
+    for q, filters in enumerate(filters_list):
+        duration_limit = filters.get('duration_limit')
+        if duration_limit is not None:
+            try:
+                limits.append(float(duration_limit))
+                timed_queries.append(q)
+            except ValueError:
+                pass
+    if timed_queries:
+        timed_queries = np.array(timed_queries)
+        duration_score, within_limit = engine.duration_matches(limits)
+        score[timed_queries] += duration_score
+        # Only filter if we'd still have at least 3 results
+        enough = within_limit.sum(axis=1) >= 3
+        keep[timed_queries[enough]] = within_limit[enough]
+
+    masks = [test_types_mask(filters.get('test_types')) for filters in filters_list]
+    typed_queries = np.array([q for q, mask in enumerate(masks) if mask], dtype=np.int64)
+    if len(typed_queries):
+        typed = keep[typed_queries] & engine.test_type_matches([masks[q] for q in typed_queries])
+        enough = typed.sum(axis=1) >= 3
+        keep[typed_queries[enough]] = typed[enough]
 
-    return result_df.to_dict(orient='records')
+    return [top_results(engine, score[q], description_match_score[q], keep[q], top_k) for q in range(count)]
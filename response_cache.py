@@ -0,0 +1,129 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from assessment_types import mask_codes, test_types_mask
+
+def canonical_filters(filters: dict) -> dict:
+    """The filters every scorer ranks by, also the basis of the cache key.
+
+    Skills are lowercased, deduplicated and sorted, the job level is
+    lowercased and anything that is not a string dropped, and the duration
+    limit is parsed to a float (unparseable limits are ignored). Test
+    types become their codes in a fixed order, unknown ones dropped.
+    ``score_assessments`` and ``recommend_assessments_batch`` rank the
+    canonical form whatever they are given, so filters with the same
+    canonical form rank the same on every path, cached or not.
+    """
+    skills = filters.get('skills') or []
+    skills = sorted({str(skill).strip().lower() for skill in skills if str(skill).strip()})
+
+    job_level = filters.get('job_level')
+    job_level = job_level.lower() if isinstance(job_level, str) and job_level.strip() else None
+
+    duration_limit = filters.get('duration_limit')
+    try:
+        duration_limit = float(duration_limit) if duration_limit is not None else None
+    except (TypeError, ValueError):
+        duration_limit = None
+
+    test_types = mask_codes(test_types_mask(filters.get('test_types')))
+
+    return {"skills": skills, "job_level": job_level, "duration_limit": duration_limit, "test_types": test_types}
+
+def duration_bucket(duration_limit, durations):
+    """Limits that select the same rows for the 3 and 1 point bands rank identically.
+
+    With a ``DurationIndex`` the bucket is the pair of binary-search
+    positions of ``limit`` and ``1.5 * limit``, so e.g. 40 and 42 share an
+    entry when no assessment lasts 41 or 42 minutes (or 61 to 63).
+    """
+    if duration_limit is None:
+        return None
+    if durations is None:
+        return duration_limit
+    return [durations.count_within(duration_limit), durations.count_within(duration_limit * 1.5)]
+
+class ResponseCache:
+    """Bounded LRU of rendered recommendation payloads.
+
+    Keys combine canonical filters, the duration bucket, any extra request
+    options and the catalog version, so a rebuilt catalog never serves old
+    payloads; switching versions also empties the cache. Every entry keeps
+    a strong ETag of its payload for conditional requests.
+    """
+
+    def __init__(self, max_entries=2048, catalog_version=None):
+        self.max_entries = max_entries
+        self.catalog_version = catalog_version
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def key(self, filters: dict, durations=None, version=None, **options) -> str:
+        """Cache key; ``version`` is the catalog the payload is built from, by default the current one"""
+        canonical = canonical_filters(filters)
+        canonical["duration_limit"] = duration_bucket(canonical["duration_limit"], durations)
+        version = self.catalog_version if version is None else version
+        content = json.dumps([version, canonical, options], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def set_catalog_version(self, version):
+        """Switch to a new catalog, dropping every payload rendered from the old one"""
+        with self._lock:
+            if version != self.catalog_version:
+                self._entries.clear()
+                self.catalog_version = version
+
+    def get(self, key):
+        """``(payload, etag)`` or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, payload):
+        """Store ``payload`` and return ``(payload, etag)``, an encoded body is hashed as is"""
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        entry = (payload, hashlib.sha256(body).hexdigest()[:32])
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "catalog_version": self.catalog_version,
+        }
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag``"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/").strip('"') == etag for tag in tags)
@@ -0,0 +1,80 @@
+import json
+import re
+from assessment_types import TEST_TYPE_LABELS, mask_labels, parse_test_type
+
+try:
+    import orjson
+except ImportError:
+    # Optional: ``pip install orjson`` encodes the fragments faster, the output is the same JSON
+    orjson = None
+
+# Test type mapping of single codes, multi-code rows are expanded by ``mask_labels``
+TEST_TYPE_MAP = {code: [label] for code, label in TEST_TYPE_LABELS.items()}
+
+CATALOG_URL = "https://www.shl.com/solutions/products/product-catalog/view/"
+
+# Returned when nothing matches, so a response never has an empty list
+GENERIC_ASSESSMENT = {
+    "url": CATALOG_URL + "general-assessment/",
+    "adaptive_support": "No",
+    "description": "General assessment for evaluating candidate skills.",
+    "duration": 30,
+    "remote_support": "Yes",
+    "test_type": ["Mixed"]
+}
+
+# At most this many assessments per response
+MAX_RECOMMENDATIONS = 10
+
+def dumps(obj) -> bytes:
+    """Compact JSON with sorted keys, as Flask's ``jsonify`` writes it"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def assessment_url(title, urls):
+    """Catalog URL of ``title``, or the URL its slug would have"""
+    slug = re.sub(r'[^\w-]', '-', title.lower())
+    return urls.get(title, CATALOG_URL + slug + "/")
+
+class Assessment:
+    """Response fields of one catalog row"""
+
+    __slots__ = ("url", "adaptive_support", "description", "duration", "remote_support", "test_type")
+
+    def __init__(self, record, urls):
+        self.url = assessment_url(record["title"], urls)
+        self.adaptive_support = "Yes" if str(record.get("adaptive/irt", "")).lower() == "yes" else "No"
+        self.description = record.get("description", "")
+        try:
+            self.duration = int(record.get("assessment_length", 0))
+        except (ValueError, TypeError):
+            self.duration = 0
+        self.remote_support = "Yes" if str(record.get("remote_testing", "")).lower() == "yes" else "No"
+        # "C P" lists both labels, a row without a known code is "Mixed"
+        self.test_type = mask_labels(parse_test_type(record.get("test_type", "M")))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class ResponseFragments:
+    """``/recommend`` response fields of every catalog row, rendered once per catalog generation.
+
+    Each row's assessment object is kept both as an ``Assessment`` and as
+    its encoded JSON; a response body is the top rows' fragments joined
+    into the envelope, without building or encoding any dict per request.
+    """
+
+    def __init__(self, records, urls):
+        self.assessments = [Assessment(record, urls) for record in records]
+        self.fragments = [dumps(assessment.to_dict()) for assessment in self.assessments]
+        self.generic = dumps(GENERIC_ASSESSMENT)
+
+    def render(self, rows, key="recommended_assessments") -> bytes:
+        """JSON body ``{key: [assessment, ...]}`` of the first ``MAX_RECOMMENDATIONS`` rows"""
+        parts = [self.fragments[row] for row in rows[:MAX_RECOMMENDATIONS]] or [self.generic]
+        return b'{"' + key.encode("utf-8") + b'":[' + b",".join(parts) + b"]}"
+
+    def records(self, rows):
+        """Assessment dicts of ``rows``, the generic one when there are none"""
+        return [self.assessments[row].to_dict() for row in rows[:MAX_RECOMMENDATIONS]] or [dict(GENERIC_ASSESSMENT)]
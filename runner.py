@@ -1,7 +1,10 @@
 import typer
-from recommender import recommend_assessments, parse_query_with_gemini
+from recommender import recommend_assessments, recommend_semantic, parse_query_with_gemini, parse_query
+from metrics import PARSE_LATENCY, STAGE_LATENCY, format_histogram
 import pandas as pd
 import sys
+import os
+import time
 
 app = typer.Typer()
 
@@ -16,170 +19,412 @@ def prompt_debug(query: str):
     print("🧠 Extracted Filters:", filters)
 
 @app.command()
-def recommend(query: str):
-    """Recommend assessments based on a natural language query"""
-    filters = parse_query_with_gemini(query)
-    results = recommend_assessments(filters)
+def recommend(query: str, top_k: int = 10, mode: str = "keyword"):
+    """Recommend assessments based on a natural language query (mode: keyword, semantic or hybrid)"""
+    if mode == "semantic":
+        results = recommend_semantic(query, top_k=top_k)
+    else:
+        filters = parse_query(query)
+        results = (recommend_semantic(query, filters=filters, top_k=top_k) if mode == "hybrid"
+                   else recommend_assessments(filters, top_k=top_k))
     for r in results:
         print(f"✅ {r['title']} — Score: {r['score']} — Duration: {r['assessment_length']}")
 
 @app.command()
-def run_eval(output_file: str = "eval_results.json"):
-    """Run a comprehensive evaluation of the recommender system and save results to a file"""
+def recommend_file(input_path: str = typer.Argument(..., help="JSONL or CSV file of job descriptions, - for stdin"),
+                   output: str = "recommendations.jsonl", fmt: str = "", column: str = "", top_k: int = 10,
+                   workers: int = 8, window: int = 64, resume: bool = True, checkpoint_every: int = 100,
+                   include_query: bool = False, no_llm: bool = False):
+    """Recommend assessments for every job description of a file, streamed to JSONL.
+
+    Interrupted runs continue from the checkpoint next to the output (--no-resume starts over)
+    """
+    from bulk import recommend_file as run
+
+    source = "stdin" if input_path == "-" else input_path
+    print(f"📥 Streaming job descriptions from {source} to {output}", file=sys.stderr)
+    try:
+        summary = run(input_path, output, fmt=fmt or None, column=column or None, top_k=top_k, workers=workers,
+                      window=window, resume=resume, checkpoint_every=checkpoint_every,
+                      min_confidence=0.0 if no_llm else None, include_query=include_query)
+    except KeyboardInterrupt:
+        print(f"⏸️ Interrupted, run again to resume from the checkpoint of {output}", file=sys.stderr)
+        raise typer.Exit(code=130)
+
+    if summary["resumed_from"]:
+        print(f"⏩ Resumed from row {summary['resumed_from']}", file=sys.stderr)
+    print(f"✅ {summary['rows']} rows in {summary['seconds']}s ({summary['rows_per_sec']} rows/s), "
+          f"parse cache hit rate {summary['parse_cache_hit_rate']:.1%}"
+          + (f", LLM cache hit rate {summary['llm_cache_hit_rate']:.1%}"
+             if summary["llm_cache_hit_rate"] is not None else ""), file=sys.stderr)
+    if summary["errors"]:
+        print(f"⚠️ {summary['errors']} rows could not be processed, see the error records in {output}", file=sys.stderr)
+
+@app.command()
+def run_eval(output_file: str = "eval_results.json", no_llm: bool = False, cases: str = "eval_cases.jsonl",
+             workers: int = 8, k: int = 10, fixtures: str = "eval_fixtures.json", fixture_mode: str = "auto",
+             store: str = "", label: str = ""):
+    """Run a comprehensive evaluation of the recommender system and save results to a file.
+
+    Cases are read from a JSONL file and run concurrently. Model responses
+    are recorded to the fixture file and replayed on later runs
+    (--fixture-mode replay never calls the model). Every run is appended to
+    the eval store read by the dashboard.
+    """
     import json
     from datetime import datetime
-    
-    # Optional: initialize LangSmith client only if needed for logging
-    try:
-        from langsmith import Client
-        client = Client()
-        use_langsmith = True
+    from config import TRACING, EVAL_STORE_PATH
+    from eval_store import EvalStore
+    from evaluation import FixtureModel, FixtureStore, load_cases, run_evaluation
+    from tracing import get_exporter
+
+    # Runs go through the trace exporter, queued and shipped off the evaluation path
+    tracer = get_exporter()
+    use_langsmith = TRACING["backend"] == "langsmith"
+    if use_langsmith:
         dataset_name = f"shl-recommender-eval-{datetime.now().strftime('%Y%m%d')}"
         print(f"🚀 Running evaluation and saving to LangSmith dataset: {dataset_name}")
-    except:
-        use_langsmith = False
-        print("🚀 Running evaluation without LangSmith integration")
-    
-    test_cases = [
-        {
-            "query": "Looking for assessments on Python and ML, 45 mins max",
-            "expected_filters": {
-                "skills": ["python", "machine learning"],
-                "duration_limit": 45,
-                "job_level": None
-            }
-        },
-        {
-            "query": "Need something for a research engineer on generative AI and NLP",
-            "expected_filters": {
-                "skills": ["ai", "nlp"],
-                "job_level": "research engineer",
-                "duration_limit": None
-            }
-        },
-        {
-            "query": "I am hiring for Java developers who can also collaborate effectively with my business teams. Looking for an assessment(s) that can be completed in 40 minutes.",
-            "expected_filters": {
-                "skills": ["java", "collaboration"],
-                "job_level": "developer",
-                "duration_limit": 40
-            }
-        },
-        {
-            "query": "Looking to hire mid-level professionals who are proficient in Python, SQL and Java Script. Need an assessment package that can test all skills with max duration of 60 minutes.",
-            "expected_filters": {
-                "skills": ["python", "sql", "javascript"],
-                "job_level": "mid",
-                "duration_limit": 60
-            }
-        },
-        {
-            "query": "Are you an AI enthusiast with visionary thinking to conceptualize AI-based products? Are you looking to apply these skills in an environment where teamwork and collaboration are key to developing our digital product experiences? We are seeking a Research Engineer to join our team to deliver robust AI/ML models. You will closely work with the product team to spot opportunities to use AI in the current product stack and influence the product roadmap by incorporating AI-led features/products. Can you recommend some assessment that can help me screen applications? Time limit is less than 30 minutes.",
-            "expected_filters": {
-                "skills": ["ai", "ml", "collaboration"],
-                "job_level": "research engineer",
-                "duration_limit": 30
-            }
-        },
-        {
-            "query": "I am hiring for an analyst and want applications to screen using Cognitive and personality tests, what options are available within 45 mins",
-            "expected_filters": {
-                "skills": ["cognitive", "personality"],
-                "job_level": "analyst",
-                "duration_limit": 45
-            }
-        }
-    ]
-
-    results = []
-    passed = 0
-    
-    for i, case in enumerate(test_cases):
-        query = case["query"]
-        expected = case["expected_filters"]
-        
-        # Process the recommendation without depending on LangSmith
-        filters = parse_query_with_gemini(query)
-        recommendations = recommend_assessments(filters)
-        
-        # Log to LangSmith if available (optional)
-        run_id = None
-        if use_langsmith:
-            try:
-                # Create a simple run to log results
-                run = client.create_run(
-                    project_name="shl-recommender",
-                    name=f"Evaluation run for query {i}",
-                    inputs={"query": query},
-                    outputs={"filters": filters, "recommendations": [r["title"] for r in recommendations[:3]]},
-                    tags=["evaluation"]
-                )
-                run_id = run.id
-            except Exception as e:
-                print(f"Warning: Could not log to LangSmith: {e}")
-        
-        # Standard evaluation criteria
-        extracted_skills = [s.lower() for s in filters.get("skills", [])] if filters.get("skills") else []
-        extracted_job_level = filters.get("job_level", "").lower() if filters.get("job_level") else None
-        
-        skills_pass = all(any(expected_skill in extracted_skill for extracted_skill in extracted_skills) 
-                        for expected_skill in expected["skills"])
-        
-        job_level_pass = expected["job_level"] is None or (
-            extracted_job_level and expected["job_level"].lower() in extracted_job_level
-        )
-        
-        duration_pass = expected["duration_limit"] is None or (
-            filters.get("duration_limit") is not None and 
-            abs(filters.get("duration_limit") - expected["duration_limit"]) <= 5
-        )
-        
-        case_passed = skills_pass and duration_pass and job_level_pass
-        
-        # Save detailed results
-        result = {
-            "query": query,
-            "expected": expected,
-            "extracted": filters,
-            "passed": case_passed,
-            "checks": {
-                "skills_pass": skills_pass,
-                "job_level_pass": job_level_pass,
-                "duration_pass": duration_pass
-            },
-            "top_recommendations": [r["title"] for r in recommendations[:3]],
-            "langsmith_run_id": run_id
-        }
-        
-        results.append(result)
-        
-        if case_passed:
+    else:
+        print(f"🚀 Running evaluation with {TRACING['backend']} tracing")
+
+    test_cases = load_cases(cases)
+    fixture_store = FixtureStore(fixtures)
+    model = FixtureModel(fixture_store, mode=fixture_mode)
+    print(f"📚 {len(test_cases)} cases from {cases}, {len(fixture_store)} recorded model responses ({fixture_mode})")
+
+    results, summary = run_evaluation(test_cases, model=model, workers=workers, k=k, no_llm=no_llm, tracer=tracer)
+    fixture_store.save()
+
+    for result in results:
+        query = result["query"]
+        if result["passed"]:
             print(f"✅ Passed for: {query}")
-            passed += 1
-        else:
-            print(f"❌ Failed for: {query}")
-            print("   ↪ Extracted:", filters)
-            print("   ↪ Expected :", expected)
-            
-            # Debug which checks failed
-            if not skills_pass:
-                print("   ↪ Skills check failed")
-            if not job_level_pass:
-                print("   ↪ Job level check failed")
-            if not duration_pass:
-                print("   ↪ Duration check failed")
-
-    print(f"\n📊 Eval summary: {passed}/{len(test_cases)} passed.")
+            continue
+        print(f"❌ Failed for: {query}")
+        if "error" in result:
+            print(f"   ↪ Error: {result['error']}")
+            continue
+        print("   ↪ Extracted:", result["extracted"])
+        print("   ↪ Expected :", result["expected"])
+
+        # Debug which checks failed
+        checks = result["checks"]
+        if not checks["skills_pass"]:
+            print("   ↪ Skills check failed")
+        if not checks["job_level_pass"]:
+            print("   ↪ Job level check failed")
+        if not checks["duration_pass"]:
+            print("   ↪ Duration check failed")
+
+    print(f"\n📊 Eval summary: {summary['passed']}/{summary['cases']} passed.")
+    print(f"🎯 Ranking over {summary['labeled']} labeled cases: recall@{k}={summary[f'recall@{k}']} "
+          f"MAP@{k}={summary[f'map@{k}']}")
+    print(f"🎞️ Model responses: {model.replayed} replayed, {model.recorded} recorded in {fixtures}")
+    print(f"⏱️ {summary['cases']} cases in {summary['seconds']}s with {workers} workers")
+    print("⏱️ Query parsing latency by path:")
+    for line in format_histogram(PARSE_LATENCY):
+        print(f"   {line}")
+    print("⏱️ Recommendation latency by stage:")
+    for line in format_histogram(STAGE_LATENCY):
+        print(f"   {line}")
     
     # Save results to file
     with open(output_file, "w") as f:
         json.dump(results, f, indent=2)
     
     print(f"📝 Evaluation results saved to {output_file}")
+    run_id = EvalStore(store or EVAL_STORE_PATH).add_run(results, summary, label=label or None)
+    print(f"🗄️ Run {run_id} added to {store or EVAL_STORE_PATH}")
+    tracer.flush()
+    print(f"🛰️ Traces: {tracer.stats()}")
     if use_langsmith:
         print(f"🔗 View detailed runs in LangSmith: https://smith.langchain.com/projects/shl-recommender")
 
 
+@app.command()
+def bench_dashboard(histories: str = "10,100,1000", cases: int = 50):
+    """Eval dashboard latency as the run history grows"""
+    from benchmarks import bench_eval_dashboard
+
+    report = bench_eval_dashboard(histories=[int(h) for h in histories.split(",")], cases=cases)
+    for history, stats in report.items():
+        print(f"🗂️ {history} runs: re-reading JSON {stats['json_read_ms']} ms | store first request "
+              f"{stats['store_cold_ms']} ms | cached {stats['store_warm_ms']} ms")
+
+@app.command()
+def check_recommend_file(rows: int = 3000, stop_after: int = 1000):
+    """Resume of an interrupted recommend-file run, and its memory bounds across input sizes"""
+    from benchmarks import check_recommend_file
+
+    failures, report = check_recommend_file(rows=rows, stop_after=stop_after)
+    for name, stats in report.items():
+        print(f"📦 {name}: {stats}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        raise typer.Exit(code=1)
+    print("✅ Resumed output matches an uninterrupted run, the parse window and memo stay bounded")
+
+@app.command()
+def bench_serialize(distinct: int = 200, repeats: int = 5):
+    """Per-request cost of the /recommend JSON body, response dicts vs precomputed fragments"""
+    from benchmarks import bench_serialization
+
+    failures, report = bench_serialization(distinct=distinct, repeats=repeats)
+    print(f"🧾 {report['requests']} bodies of {report['catalog_rows']} catalog rows ({report['encoder']} encoder)")
+    print(f"   dicts + jsonify: {report['dicts_us']} µs/request | fragments: {report['fragments_us']} µs/request "
+          f"({report['speedup']}x) | fragments built once in {report['build_ms']} ms")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        raise typer.Exit(code=1)
+    print("✅ Fragment bodies decode to the same JSON as the jsonify path")
+
+@app.command()
+def check_test_types(rows: int = 100_000):
+    """Multi-label test type labels, the test_types filter and its cost"""
+    from benchmarks import check_test_types
+
+    failures, report = check_test_types(rows=rows)
+    print(f"🏷️ {report['multi_label_rows']} multi-code rows now list every label | analyst query asks for "
+          f"{report['analyst_test_types']}, {report['analyst_kept_rows']} rows kept")
+    print(f"   filter on {report['rows']} rows: bit mask {report['mask_ms']} ms | "
+          f"string match {report['string_ms']} ms ({report['speedup']}x)")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        raise typer.Exit(code=1)
+    print("✅ The analyst query gets cognitive and personality tests")
+
+@app.command()
+def bench(scales: str = "1,10,100", skill_counts: str = "1,3,6", llm_latency: float = 0.05,
+          repeats: int = 5, output: str = "bench_results.json", baseline: str = "",
+          tolerance: float = 0.25, save_baseline: str = ""):
+    """Offline latency of every pipeline stage, compared against a stored baseline"""
+    import json
+    from benchmarks import run_bench_suite, compare_bench_results
+
+    report = run_bench_suite(scales=[int(s) for s in scales.split(",")],
+                             skill_counts=[int(c) for c in skill_counts.split(",")],
+                             llm_latency=llm_latency, repeats=repeats)
+
+    stage = None
+    for key, stats in report["results"].items():
+        if key.split("/")[0] != stage:
+            stage = key.split("/")[0]
+            print(f"⏱️ {stage}")
+        print(f"   {key:<55} {stats['median_ms']:>10} ms median | {stats['p95_ms']:>10} ms p95")
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📁 Results saved to {output}")
+    if save_baseline:
+        with open(save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Baseline saved to {save_baseline}")
+
+    if baseline:
+        with open(baseline) as f:
+            regressions, improvements = compare_bench_results(report, json.load(f), tolerance=tolerance)
+        for key, old, new, ratio in improvements:
+            print(f"   🚀 {key}: {old} ms → {new} ms ({ratio}x)")
+        for key, old, new, ratio in regressions:
+            print(f"   🐢 {key}: {old} ms → {new} ms ({ratio}x)")
+        if regressions:
+            print(f"❌ {len(regressions)} measurements regressed more than {tolerance:.0%} against {baseline}")
+            raise typer.Exit(code=1)
+        print(f"✅ No regressions against {baseline}")
+
+@app.command()
+def bench_scoring(replicate: int = 100, repeats: int = 3, include_old: bool = True):
+    """Check parity with the legacy scorer and benchmark per-request latency"""
+    from benchmarks import check_scoring_parity, bench_scoring as run_bench
+
+    mismatches = check_scoring_parity()
+    if mismatches:
+        print(f"❌ Vectorized results differ from the legacy scorer for {len(mismatches)} filter sets:")
+        for filters in mismatches:
+            print("   ↪", filters)
+    else:
+        print("✅ Vectorized scorer matches the legacy scorer on all sample filters")
+
+    print(f"⏱️ Benchmarking with the catalog replicated {replicate}x")
+    for row in run_bench(replicate=replicate, repeats=repeats, include_old=include_old):
+        line = f"   {row['vectorized_ms']:>9} ms vectorized"
+        if include_old:
+            line += f" | {row['legacy_ms']:>9} ms legacy | {row['speedup']}x | parity={row['parity']}"
+        print(f"{line} — {row['filters']}")
+
+@app.command()
+def bench_index(rows: int = 100_000, repeats: int = 3):
+    """Benchmark inverted-index candidate pruning on a synthetic catalog"""
+    from benchmarks import bench_inverted_index
+
+    print(f"⏱️ Building a synthetic catalog of {rows} assessments")
+    report = bench_inverted_index(rows=rows, repeats=repeats)
+    print(f"   Index built in {report['build_s']} s")
+    for row in report["results"]:
+        print(f"   {row['pruned_ms']:>9} ms pruned | {row['scan_ms']:>9} ms full scan | "
+              f"{row['speedup']}x | parity={row['parity']} — {row['filters']}")
+
+@app.command()
+def bench_cache(rounds: int = 5, max_entries: int = 1024, latency: float = 0.0):
+    """Measure query cache hit rates offline with a stub model"""
+    from benchmarks import bench_query_cache
+
+    report = bench_query_cache(rounds=rounds, max_entries=max_entries, latency=latency)
+    print(f"📦 {report['requests']} requests, {report['model_calls']} model calls, {report['avg_ms']} ms per request")
+    print(f"   In-process cache: {report['cache']}")
+    print(f"   After restart   : {report['restarted_cache']}")
+
+@app.command()
+def bench_responses(requests: int = 2000, distinct: int = 50, max_entries: int = 2048):
+    """Measure response cache hit rates and latency on a skewed stream of filters"""
+    from benchmarks import bench_response_cache
+
+    report = bench_response_cache(requests=requests, distinct=distinct, max_entries=max_entries)
+    stats = report["cache"]
+    print(f"📦 {report['requests']} requests: {report['uncached_ms']} ms uncached, "
+          f"{report['cached_ms']} ms through the cache ({report['speedup']}x)")
+    print(f"   Hit rate {stats['hit_rate']:.1%}, {stats['evictions']} evictions, "
+          f"{stats['entries']} entries left after a catalog rebuild")
+    if report["mismatches"]:
+        print(f"❌ {len(report['mismatches'])} cached payloads differ from uncached scoring")
+    else:
+        print("✅ Every cached payload matches uncached scoring of its canonical filters")
+
+@app.command()
+def bench_llm(requests: int = 200, concurrency: int = 50, latency: float = 0.2,
+              slow_fraction: float = 0.05, slow_latency: float = 2.0, timeout: float = 1.5):
+    """Load-test the async LLM client against a fake model with injected latency"""
+    from benchmarks import bench_llm_client
+
+    print(f"⏱️ {requests} queries, {concurrency} concurrent, {latency}s calls "
+          f"({slow_fraction:.0%} take {slow_latency}s), {timeout}s deadline")
+    report = bench_llm_client(requests=requests, concurrency=concurrency, latency=latency,
+                              slow_fraction=slow_fraction, slow_latency=slow_latency, timeout=timeout)
+    for name, row in report.items():
+        print(f"   {name:<13} {row['throughput_rps']:>8} req/s | p50 {row['p50_ms']} ms | "
+              f"p95 {row['p95_ms']} ms | p99 {row['p99_ms']} ms | degraded {row['degraded']}/{row['requests']}")
+        if "hedges" in row:
+            print(f"   {'':<13} {row['calls']} calls, {row['hedges']} hedges ({row['hedge_wins']} won), "
+                  f"{row['timeouts']} timeouts")
+
+@app.command()
+def bench_batch(replicate: int = 1, repeats: int = 3):
+    """Compare batched and sequential scoring at batch sizes 1, 10 and 100"""
+    from benchmarks import bench_batch as run_bench
+
+    rows = run_bench(sizes=(1, 10, 100), replicate=replicate, repeats=repeats)
+    print(f"⏱️ Batched vs sequential scoring over {rows[0]['rows']} assessments")
+    for row in rows:
+        print(f"   batch {row['batch_size']:>4}: {row['sequential_qps']:>9} q/s sequential | "
+              f"{row['batched_qps']:>9} q/s batched | {row['speedup']}x | parity={row['parity']}")
+
+@app.command()
+def bench_top_k(top_k: int = 10, repeats: int = 5):
+    """Microbenchmark partial top-k selection against full sorts as the catalog grows"""
+    from benchmarks import bench_top_k as run_bench
+
+    for row in run_bench(top_k=top_k, repeats=repeats):
+        print(f"   {row['rows']:>9} rows: {row['legacy_ms']:>9} ms legacy | {row['full_sort_ms']:>8} ms lexsort | "
+              f"{row['top_k_ms']:>7} ms top-k | {row['speedup_vs_sort']}x | parity={row['parity']}")
+
+@app.command()
+def build_catalog(out: str = "", measure: bool = True):
+    """Compile shl_clean.csv and final.txt into the binary catalog snapshot"""
+    from config import CATALOG
+    from catalog_snapshot import build_snapshot, CatalogSnapshot
+
+    out = out or CATALOG["snapshot"]
+    header = build_snapshot(CATALOG["csv"], CATALOG["urls"], out)
+    snapshot = CatalogSnapshot(out)
+    print(f"📦 Catalog {header['catalog_version']}: {snapshot.rows} assessments and "
+          f"{len(snapshot.url_map())} URLs written to {out} ({os.path.getsize(out) / 1024:.0f} KB)")
+
+    if measure:
+        from benchmarks import bench_cold_start
+
+        for name, row in bench_cold_start(out).items():
+            print(f"⏱️ {name:<8} catalog {row['catalog_ms']:>7} ms ({row['catalog_rss_mb']} MB) | "
+                  f"import recommender {row['import_ms']:>7} ms ({row['rss_mb']} MB peak RSS)")
+
+@app.command()
+def crawl(resume: bool = True, base_url: str = "", rate: float = 0.0, workers: int = 0, snapshot: bool = True):
+    """Crawl the SHL catalog into shl_clean.csv and final.txt, then rebuild the snapshot"""
+    from config import CATALOG, CRAWLER
+    from crawler import Crawler, crawl_catalog
+
+    crawler = Crawler(base_url or CRAWLER["base_url"], CRAWLER["state_path"],
+                      rate=rate or CRAWLER["rate"], workers=workers or CRAWLER["workers"])
+    start = time.time()
+    count = crawl_catalog(crawler, CATALOG["csv"], CATALOG["urls"],
+                          snapshot_path=CATALOG["snapshot"] if snapshot else "", resume=resume)
+    print(f"✅ {count} assessments crawled in {time.time() - start:.1f} s: {crawler.stats}")
+
+@app.command()
+def bench_extract(rows: int = 0, nav_links: int = 200, processes: int = 4):
+    """Pages per second of product page parsing on a saved corpus: legacy, streaming, process pool"""
+    from benchmarks import bench_extractor
+
+    report = bench_extractor(rows=rows, nav_links=nav_links, processes=processes)
+    print(f"⏱️ {report['pages']} saved product pages of {report['avg_kb']} KB")
+    print(f"   BeautifulSoup + regex : {report['legacy_pps']:>7} pages/s")
+    print(f"   Streaming extractor   : {report['streaming_pps']:>7} pages/s")
+    print(f"   {report['processes']} processes          : {report['pool_pps']:>7} pages/s")
+    if report["mismatches"]:
+        print(f"❌ {len(report['mismatches'])} fields differ from the legacy parser:")
+        for mismatch in report["mismatches"][:10]:
+            print("   ↪", mismatch)
+    else:
+        print("✅ Streaming extractor agrees with the legacy parser on every field")
+
+@app.command()
+def load_test(workers: str = "1,2,4", requests: int = 400, concurrency: int = 16, compare: bool = True):
+    """Load-test gunicorn with growing worker counts, with and without preload"""
+    from benchmarks import load_test as run_load_test
+
+    worker_counts = [int(w) for w in workers.split(",")]
+    for preload in ([True, False] if compare else [True]):
+        print(f"🚀 preload_app={preload}")
+        for row in run_load_test(worker_counts, requests=requests, concurrency=concurrency, preload=preload):
+            print(f"   {row['workers']} workers: {row['throughput_rps']:>7} req/s | p50 {row['p50_ms']} ms | "
+                  f"p99 {row['p99_ms']} ms | per worker RSS {row['rss_mb']} MB, PSS {row['pss_mb']} MB")
+
+@app.command()
+def check_durations():
+    """How the live catalog's assessment_length values parse; tests/test_durations.py covers every format"""
+    from recommender import shl_df
+
+    print("⏱️ Durations by kind:", shl_df["duration_kind"].value_counts().to_dict())
+    unknown = shl_df.loc[shl_df["duration_kind"] == "unknown", "assessment_length"].astype(str).unique()
+    if len(unknown):
+        print(f"❔ {len(unknown)} values without a duration:", ", ".join(unknown))
+
+@app.command()
+def build_vectors(embedder: str = "", path: str = "", quantize: bool = False):
+    """Embed the catalog offline into a memory-mapped vector store"""
+    from config import SEMANTIC
+    from recommender import shl_df
+    from semantic import get_embedder, build_vector_store
+
+    embedder = get_embedder(embedder or SEMANTIC["embedder"])
+    path = path or SEMANTIC["path"]
+    manifest = build_vector_store(shl_df, embedder, path, quantize=quantize)
+    print(f"📦 {manifest['rows']} x {manifest['dim']} {manifest['dtype']} vectors from {manifest['embedder']} "
+          f"written to {path}.npy in {manifest['build_seconds']} s")
+
+@app.command()
+def check_semantic(rows: int = 100_000):
+    """Time memory-mapped search; tests/test_semantic.py checks the store itself"""
+    from benchmarks import bench_semantic
+
+    report = bench_semantic(rows=rows)
+    for name in ("float32", "int8"):
+        row = report[name]
+        print(f"⏱️ {name}: top-10 of {report['rows']} x {report['dim']} in {row['ms']} ms "
+              f"({row['mb']} MB mapped, self found first: {row['top1_is_self']})")
+
 @app.command()
 def view_recent_traces(limit: int = 10):
     """View recent traces from LangSmith"""
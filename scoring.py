@@ -0,0 +1,212 @@
+import numpy as np
+from taxonomy import (ROLE_SKILL_MAP, JOB_LEVEL_MAPPING, infer_skills_from_role,
+                      infer_levels_from_role, tokenize_term)
+
+def _best_positions(values, positions, k):
+    """The ``k`` positions with the largest values, ties broken by position"""
+    picked = values[positions]
+    threshold = np.partition(picked, len(picked) - k)[len(picked) - k]
+    above = positions[picked > threshold]
+    ties = positions[picked == threshold]
+    return above, ties, k - len(above)
+
+def top_k_rows(score, tiebreak=None, k=10):
+    """Positions of the ``k`` best entries, best first.
+
+    Same order as a stable sort by ``score`` then ``tiebreak``, both
+    descending, with remaining ties in position order, but only the
+    winners are sorted: a partial selection finds the k-th best score,
+    everything above it is in and ties at it are settled by ``tiebreak``
+    and then position.
+    """
+    size = len(score)
+    if k <= 0 or size == 0:
+        return np.zeros(0, dtype=np.int64)
+    positions = np.arange(size)
+    if size > k:
+        above, ties, need = _best_positions(score, positions, k)
+        if len(ties) > need and tiebreak is not None:
+            tie_above, tie_ties, tie_need = _best_positions(tiebreak, ties, need)
+            ties = np.concatenate((tie_above, tie_ties[:tie_need]))
+        positions = np.sort(np.concatenate((above, ties[:need] if tiebreak is None else ties)))
+
+    keys = (-score[positions],) if tiebreak is None else (-tiebreak[positions], -score[positions])
+    return positions[np.lexsort(keys)[:k]]
+
+class ScoringEngine:
+    """Column-oriented scorers over a shared ``CatalogIndex``.
+
+    Every scorer returns a NumPy array aligned with the catalog rows and
+    mirrors one of the per-row lambdas of the legacy scorer in
+    ``benchmarks_legacy.py``.
+    """
+
+    def __init__(self, index, prune=True):
+        self.index = index
+        self.size = index.size
+
+        # The inverted indexes only visit rows that can contain a term,
+        # the plain columns scan every row
+        fields = index.inverted if prune else {name: index.field(name) for name in index.inverted}
+        self.title = fields['title']
+        self.description = fields['description']
+        self.text = fields['text']
+        self.job_levels = fields['job_levels']
+        self.description_length = index.description_length
+        self.assessment_length = index.assessment_length
+        self.durations = index.durations
+        self.test_type_mask = index.test_type_mask
+
+        # Role-inferred skills only depend on the title, so count them up front.
+        # Few titles name a role: keep (row, skill, count) triples, not a dense matrix
+        self.inferred_vocabulary = sorted({s for skills in ROLE_SKILL_MAP.values() for s in skills})
+        position = {skill: i for i, skill in enumerate(self.inferred_vocabulary)}
+        rows, columns = [], []
+        for row, title in enumerate(index.titles):
+            for skill in infer_skills_from_role(title):
+                rows.append(row)
+                columns.append(position[skill])
+        stride = max(len(position), 1)
+        pairs, counts = np.unique(np.array(rows, dtype=np.int64) * stride + np.array(columns, dtype=np.int64),
+                                  return_counts=True)
+        self.inferred_rows = pairs // stride
+        self.inferred_columns = pairs % stride
+        self.inferred_counts = counts
+
+        # Job level category scores depend on the row only: 2 when its job
+        # levels mention a category term, 3 per title role implying the category
+        self.level_scores = {}
+        for category, terms in JOB_LEVEL_MAPPING.items():
+            matches = np.zeros(self.size, dtype=bool)
+            for term in terms:
+                matches |= self.job_levels.contains(term.lower())
+            self.level_scores[category] = np.where(matches, 2, 0).astype(np.int64)
+        for row, title in enumerate(index.title.values):
+            for category in infer_levels_from_role(title):
+                self.level_scores[category][row] += 3
+
+    def _zeros(self):
+        return np.zeros(self.size, dtype=np.int64)
+
+    def technical_score(self, skills):
+        """Number of skills found as whole words in title + description"""
+        score = self._zeros()
+        for skill in skills:
+            score += self.text.contains_word(skill.lower())
+        return score
+
+    def title_relevance(self, skills):
+        """Substring occurrences of the skills in the title, worth double"""
+        score = self._zeros()
+        for skill in skills:
+            score += self.title.count(skill.lower()) * 2
+        return score
+
+    def novel_inferred(self, technical_skills):
+        """Mask of the inferred vocabulary not already covered by a technical skill"""
+        technical = [tech.lower() for tech in technical_skills]
+        return np.array([
+            not any(tech in skill or skill in tech for tech in technical)
+            for skill in self.inferred_vocabulary
+        ], dtype=bool)
+
+    def inferred_score(self, technical_skills):
+        """Role-inferred skills that are not already covered by a technical skill"""
+        novel = self.novel_inferred(technical_skills)
+        weights = self.inferred_counts * novel[self.inferred_columns]
+        return np.bincount(self.inferred_rows, weights=weights, minlength=self.size).astype(np.int64)
+
+    def soft_skill_score(self, soft_skills):
+        """Number of soft skills mentioned anywhere in title + description"""
+        score = self._zeros()
+        for skill in soft_skills:
+            score += self.text.contains(skill.lower())
+        return score
+
+    def description_match_score(self, skills):
+        """Skill mentions in the description, normalized by description length"""
+        counts = self._zeros()
+        for skill in skills:
+            counts += self.description.count(skill.lower())
+        return counts / (self.description_length + 1) * 100
+
+    def job_level_category_score(self, category):
+        """Score rows against a known job level category and its role words"""
+        return self.level_scores[category].copy()
+
+    def job_level_token_score(self, job_level):
+        """Score rows by the meaningful tokens of an unrecognized job level"""
+        score = self._zeros()
+        # Only use tokens that are meaningful (3+ characters)
+        meaningful_tokens = [t for t in tokenize_term(job_level) if len(t) >= 3]
+        for token in meaningful_tokens:
+            found = self.title.contains(token) | self.job_levels.contains(token)
+            score += np.where(found, 2, 0)
+        return score
+
+    # --- Batch scorers: one row of the result per query, one column per catalog row ---
+
+    def term_matrix(self, lookup, terms):
+        """Column ``i`` holds ``lookup(terms[i])`` for every catalog row"""
+        matrix = np.zeros((self.size, len(terms)), dtype=np.int64)
+        for i, term in enumerate(terms):
+            matrix[:, i] = lookup(term)
+        return matrix
+
+    def batch_term_score(self, lookup, skill_lists, weight=1):
+        """``sum(lookup(skill) * weight)`` per query as one (queries x rows) product.
+
+        Every distinct skill of the batch is looked up once, however many
+        queries mention it.
+        """
+        terms = sorted({skill.lower() for skills in skill_lists for skill in skills})
+        if not terms:
+            return np.zeros((len(skill_lists), self.size), dtype=np.int64)
+        position = {term: i for i, term in enumerate(terms)}
+        weights = np.zeros((len(skill_lists), len(terms)), dtype=np.int64)
+        for q, skills in enumerate(skill_lists):
+            for skill in skills:
+                weights[q, position[skill.lower()]] += weight
+        return weights @ self.term_matrix(lookup, terms).T
+
+    def technical_scores(self, skill_lists):
+        return self.batch_term_score(self.text.contains_word, skill_lists)
+
+    def title_relevances(self, skill_lists):
+        return self.batch_term_score(self.title.count, skill_lists, weight=2)
+
+    def soft_skill_scores(self, skill_lists):
+        return self.batch_term_score(self.text.contains, skill_lists)
+
+    def description_match_scores(self, skill_lists):
+        counts = self.batch_term_score(self.description.count, skill_lists)
+        return counts / (self.description_length + 1) * 100
+
+    def inferred_scores(self, skill_lists):
+        """``inferred_score`` per query, zero for queries without technical skills"""
+        scores = np.zeros((len(skill_lists), self.size), dtype=np.int64)
+        for q, skills in enumerate(skill_lists):
+            if skills:
+                scores[q] = self.inferred_score(skills)
+        return scores
+
+    def duration_matches(self, duration_limits):
+        """``duration_match`` and the within-limit mask for a column of limits"""
+        scores = np.zeros((len(duration_limits), self.size), dtype=np.int64)
+        within = np.zeros((len(duration_limits), self.size), dtype=bool)
+        for q, limit in enumerate(duration_limits):
+            scores[q] = self.durations.match_score(limit)
+            within[q] = self.durations.mask_within(limit)
+        return scores, within
+
+    def duration_match(self, duration_limit):
+        """3 points within the limit, 1 point within 1.5x the limit"""
+        return self.durations.match_score(duration_limit)
+
+    def test_type_match(self, mask):
+        """Rows having any of the test types in ``mask``"""
+        return (self.test_type_mask & np.uint8(mask)) != 0
+
+    def test_type_matches(self, masks):
+        """``test_type_match`` for a column of masks"""
+        return (self.test_type_mask[None, :] & np.asarray(masks, dtype=np.uint8)[:, None]) != 0
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import numpy as np
+from scoring import top_k_rows
+
+_TOKEN = re.compile(r'\w+')
+
+# Function words, and words every catalog description uses, carry no meaning for retrieval
+_STOP_WORDS = frozenset("""
+a an the and or of to in for on with by is are be as at from this that it its your you we our
+their can will which who how what candidates candidate test tests assessment measures ability knowledge
+""".split())
+
+# int8 vectors store round(x * 127), dot products come back scaled by this
+INT8_SCALE = 127.0
+
+# Rows per matrix-vector block: the float copy of an int8 block stays in cache
+_BLOCK_ROWS = 2048
+
+def catalog_texts(df):
+    """Text embedded for every catalog row: title and description"""
+    return (df['title'].astype(str) + ". " + df['description'].astype(str)).tolist()
+
+def catalog_fingerprint(texts):
+    """Hash of the embedded texts, a store built from other texts is stale"""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+def text_hash(text):
+    """Per-row hash recorded in the manifest so a rebuild can reuse unchanged rows"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder with no model download.
+
+    Words other than stop words, and adjacent pairs of them, are hashed
+    into ``dim`` signed buckets, so texts sharing vocabulary get a high
+    cosine similarity. Runs on CPU
+    in microseconds and gives identical vectors on every machine.
+    """
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if (value >> 63) & 1 else -1.0
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = [word for word in _TOKEN.findall(text.lower()) if word not in _STOP_WORDS]
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                bucket, sign = self._bucket(feature)
+                vectors[row, bucket] += sign
+        return _normalize(vectors)
+
+class SentenceTransformerEmbedder:
+    """MiniLM sentence embeddings, as in the ``scrapper/runner_me.py`` prototype.
+
+    Needs the optional ``sentence-transformers`` package and downloads the
+    model on first use.
+    """
+
+    def __init__(self, model_name="all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("The minilm embedder needs `pip install sentence-transformers`") from e
+        self.model = SentenceTransformer(model_name)
+        self.name = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts):
+        return _normalize(self.model.encode(list(texts), convert_to_numpy=True))
+
+def get_embedder(name="hashing"):
+    """Embedder by config name: ``hashing`` or ``minilm``"""
+    if name == "minilm":
+        return SentenceTransformerEmbedder()
+    if name.startswith("hashing"):
+        dim = int(name.split("-", 1)[1]) if "-" in name else 1024
+        return HashingEmbedder(dim)
+    raise ValueError(f"Unknown embedder: {name}")
+
+def _quantize(vectors):
+    return np.clip(np.round(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+
+def build_vector_store(df, embedder, path, quantize=False, previous=None):
+    """Embed the catalog and write ``<path>.npy`` plus a ``<path>.json`` manifest.
+
+    Vectors are L2-normalized float32, or int8 when ``quantize`` is set.
+    With the ``previous`` store of the same embedder and precision, rows
+    whose text it already holds are copied from it and only new or
+    changed rows are embedded. Both files are written to temporary names
+    and renamed into place so workers never load a half-written store,
+    and processes still mapping the old file keep reading it.
+    """
+    texts = catalog_texts(df)
+    hashes = [text_hash(text) for text in texts]
+    start = time.perf_counter()
+
+    known = {}
+    if (previous is not None and previous.embedder_name == embedder.name
+            and previous.quantized == quantize and "row_hashes" in previous.manifest):
+        known = {h: i for i, h in enumerate(previous.manifest["row_hashes"])}
+    reused = [known.get(h) for h in hashes]
+    missing = [row for row, old in enumerate(reused) if old is None]
+
+    encoded = embedder.encode([texts[row] for row in missing]) if missing else None
+    if quantize and encoded is not None:
+        encoded = _quantize(encoded)
+    vectors = np.empty((len(texts), embedder.dim), dtype=np.int8 if quantize else np.float32)
+    if missing:
+        vectors[missing] = encoded
+    kept = [(row, old) for row, old in enumerate(reused) if old is not None]
+    if kept:
+        rows, old_rows = map(list, zip(*kept))
+        vectors[rows] = previous.vectors[old_rows]
+
+    manifest = {
+        "embedder": embedder.name,
+        "dim": int(vectors.shape[1]),
+        "dtype": str(vectors.dtype),
+        "rows": len(texts),
+        "row_ids": list(range(len(texts))),
+        "titles": df['title'].astype(str).tolist(),
+        "catalog_fingerprint": catalog_fingerprint(texts),
+        "row_hashes": hashes,
+        "embedded_rows": len(missing),
+        "build_seconds": round(time.perf_counter() - start, 3),
+        "created_at": time.time(),
+    }
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".npy", delete=False) as f:
+        np.save(f, vectors)
+    os.replace(f.name, path + ".npy")
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".json", delete=False) as f:
+        json.dump(manifest, f)
+    os.replace(f.name, path + ".json")
+    return manifest
+
+class VectorStore:
+    """Catalog embeddings memory-mapped from disk.
+
+    The ``.npy`` file is opened with ``mmap_mode='r'``, so every process on
+    the host shares the page cache copy of the vectors instead of holding
+    its own. Row ``i`` of the store is catalog row ``row_ids[i]``.
+    """
+
+    def __init__(self, path):
+        with open(path + ".json") as f:
+            self.manifest = json.load(f)
+        self.vectors = np.load(path + ".npy", mmap_mode='r')
+        self.row_ids = np.asarray(self.manifest["row_ids"], dtype=np.int64)
+        self.embedder_name = self.manifest["embedder"]
+        self.quantized = self.vectors.dtype == np.int8
+        self.size = len(self.row_ids)
+
+    def matches(self, texts, embedder_name):
+        """Whether the store was built from ``texts`` with this embedder"""
+        return (self.embedder_name == embedder_name
+                and self.manifest["catalog_fingerprint"] == catalog_fingerprint(texts))
+
+    def similarities(self, query_vector, catalog_size=None):
+        """Cosine similarity of the query to every catalog row"""
+        query_vector = np.asarray(query_vector, dtype=np.float32).ravel()
+        scores = np.empty(self.size, dtype=np.float32)
+        for start in range(0, self.size, _BLOCK_ROWS):
+            block = self.vectors[start:start + _BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32, copy=False) @ query_vector
+        if self.quantized:
+            scores /= INT8_SCALE
+
+        if catalog_size is None:
+            catalog_size = int(self.row_ids.max()) + 1 if self.size else 0
+        aligned = np.zeros(catalog_size, dtype=np.float32)
+        aligned[self.row_ids] = scores
+        return aligned
+
+    def search(self, query_vector, k=10):
+        """``(catalog rows, similarities)`` of the ``k`` nearest rows, best first"""
+        scores = self.similarities(query_vector)
+        rows = top_k_rows(scores, k=k)
+        return rows, scores[rows]
+
+def load_vector_store(df, embedder, path, quantize=False, previous=None):
+    """Open the store at ``path``, building it first when missing or stale.
+
+    A stale store is rebuilt incrementally from ``previous``, or from the
+    stale store itself, so only changed rows are embedded again.
+    """
+    texts = catalog_texts(df)
+    if os.path.exists(path + ".npy") and os.path.exists(path + ".json"):
+        store = VectorStore(path)
+        if store.matches(texts, embedder.name) and store.quantized == quantize:
+            return store
+        print(f"Vector store at {path} is stale, rebuilding")
+        previous = previous or store
+    else:
+        print(f"No vector store at {path}, building it")
+    build_vector_store(df, embedder, path, quantize=quantize, previous=previous)
+    return VectorStore(path)
+
+def fuse_scores(keyword_score, similarity, keyword_weight=0.5):
+    """Blend the keyword score, scaled to [0, 1], with cosine similarity"""
+    keyword_score = np.asarray(keyword_score, dtype=np.float64)
+    best = keyword_score.max() if len(keyword_score) else 0
+    keyword = keyword_score / best if best > 0 else np.zeros_like(keyword_score)
+    return keyword_weight * keyword + (1 - keyword_weight) * similarity
@@ -0,0 +1,144 @@
+# Skill and job level vocabularies shared by the recommender and its scorers,
+# loaded from taxonomy.json
+import json
+from config import TAXONOMY_PATH
+from term_matcher import TermMatcher
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """Vocabularies from the taxonomy data file, by section name"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+_taxonomy = load_taxonomy()
+
+SOFT_SKILLS = set(_taxonomy["soft_skills"])
+
+# Expand known skills into supersets
+SUPERSET_MAP = _taxonomy["superset_map"]
+
+# Skills implied by role words appearing in an assessment title
+ROLE_SKILL_MAP = _taxonomy["role_skill_map"]
+
+# Base job level categories
+JOB_LEVEL_MAPPING = _taxonomy["job_level_mapping"]
+
+# Infer job level from role name
+ROLE_LEVEL_MAPPING = _taxonomy["role_level_mapping"]
+
+# Other spellings of known skills, mapped to the canonical skill
+SKILL_ALIASES = _taxonomy["skill_aliases"]
+
+# What an assessment measures rather than a subject it covers
+ASSESSMENT_FOCUS_SKILLS = _taxonomy["assessment_focus_skills"]
+
+# Job titles a query can name as the job level
+ROLE_TITLES = _taxonomy["role_titles"]
+
+# Seniority terms that are unambiguous in free text (no "advanced Excel" or "lead generation")
+SENIORITY_TERMS = _taxonomy["seniority_terms"]
+
+# Matchers compiled once from the vocabularies: one pass over a skill or
+# title finds every vocabulary term inside it
+_SOFT_SKILL_MATCHER = TermMatcher(sorted(SOFT_SKILLS))
+_SUPERSET_MATCHER = TermMatcher(SUPERSET_MAP)
+_ROLE_SKILL_MATCHER = TermMatcher(ROLE_SKILL_MAP)
+_ROLE_LEVEL_MATCHER = TermMatcher(ROLE_LEVEL_MAPPING)
+
+# Superset skills by lowercased skill, every skill is a dictionary lookup after
+# its first request. Cleared when full so free-text skills cannot grow it forever
+_expansions = {}
+_MAX_EXPANSIONS = 10_000
+
+def tokenize_term(term):
+    """Break a term into its component words and parts"""
+    # Convert to lowercase
+    term = term.lower()
+
+    # Replace hyphens and underscores with spaces
+    term = term.replace('-', ' ').replace('_', ' ')
+
+    # Split into words
+    words = term.split()
+
+    # Add the original term and individual words
+    tokens = [term] + words
+
+    # Add combinations of adjacent words
+    for i in range(len(words) - 1):
+        tokens.append(words[i] + ' ' + words[i+1])
+
+    return set(tokens)
+
+def terms_overlap(term1, term2):
+    """Check if two terms overlap by breaking them into tokens"""
+    tokens1 = tokenize_term(term1)
+    tokens2 = tokenize_term(term2)
+
+    # Check for any overlap between token sets
+    return bool(tokens1.intersection(tokens2))
+
+def classify_skills(skills):
+    """Split extracted skills into (technical, soft) lists"""
+    technical_skills = []
+    identified_soft_skills = []
+
+    for skill in skills:
+        # Soft when any soft skill is a substring of it
+        if skill.lower() in _SOFT_SKILL_MATCHER:
+            identified_soft_skills.append(skill)
+        else:
+            technical_skills.append(skill)
+
+    return technical_skills, identified_soft_skills
+
+def superset_skills(skill):
+    """Supersets of ``skill``: those of every key it contains or is part of"""
+    skill = skill.lower()
+    supers = _expansions.get(skill)
+    if supers is None:
+        keys = set(_SUPERSET_MATCHER.found(skill))
+        keys.update(key for key in SUPERSET_MAP if skill in key)
+        supers = tuple(dict.fromkeys(s for key in SUPERSET_MAP if key in keys for s in SUPERSET_MAP[key]))
+        if len(_expansions) >= _MAX_EXPANSIONS:
+            _expansions.clear()
+        _expansions[skill] = supers
+    return supers
+
+def expand_technical_skills(technical_skills):
+    """Add the superset skills of every technical skill"""
+    expanded_tech_skills = set()
+    for skill in technical_skills:
+        expanded_tech_skills.add(skill)
+        expanded_tech_skills.update(superset_skills(skill))
+
+    return list(expanded_tech_skills)
+
+def infer_skills_from_role(title):
+    """Infer skills from the role words in an assessment title"""
+    inferred = []
+    for role in _ROLE_SKILL_MATCHER.found(str(title).lower()):
+        inferred.extend(ROLE_SKILL_MAP[role])
+    return inferred
+
+def infer_levels_from_role(title):
+    """Job level categories implied by role words in a title, once per role"""
+    levels = []
+    for role in _ROLE_LEVEL_MATCHER.found(str(title).lower()):
+        levels.extend(ROLE_LEVEL_MAPPING[role])
+    return levels
+
+def match_job_level_category(job_level):
+    """Find the job level category whose terms overlap the requested level"""
+    tokens = tokenize_term(job_level)
+    for category, category_tokens in _LEVEL_TOKENS.items():
+        if tokens & category_tokens:
+            return category
+    return None
+
+# Tokens of every category's terms, so matching a level is one set intersection per category
+_LEVEL_TOKENS = {category: set().union(*(tokenize_term(term) for term in terms))
+                 for category, terms in JOB_LEVEL_MAPPING.items()}
+
+# Expand every skill the taxonomy knows up front
+for _skill in set(SUPERSET_MAP).union(*SUPERSET_MAP.values(), *ROLE_SKILL_MAP.values()):
+    superset_skills(_skill)
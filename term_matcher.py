@@ -0,0 +1,63 @@
+from collections import deque
+
+class TermMatcher:
+    """Aho-Corasick automaton over a fixed list of terms.
+
+    Built once from the vocabulary, then ``found(text)`` reports every term
+    occurring as a substring of ``text`` (the ``term in text`` test) in one
+    pass over the text, however many terms there are.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(dict.fromkeys(terms))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                following = self._goto[state].get(char)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto[state][char] = following
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = following
+            self._output[state] += (term_id,)
+
+        # Breadth-first, so every fail target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target if target != following else 0
+                self._output[following] += self._output[self._fail[following]]
+
+    def found_ids(self, text):
+        """Ids (positions in ``terms``) of the terms found in ``text``"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        # The empty term is in every text
+        found.update(output[0])
+        return found
+
+    def found(self, text):
+        """Terms found in ``text``, in vocabulary order"""
+        return [self.terms[i] for i in sorted(self.found_ids(text))]
+
+    def __contains__(self, text):
+        return bool(self.found_ids(text))
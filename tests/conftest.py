@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The modules live at the repository root and read their data files
+# relative to it; tests never call a real model or tracing backend
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("TRACE_BACKEND", "none")
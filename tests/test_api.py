@@ -0,0 +1,41 @@
+import asyncio
+from fastapi import Response
+from starlette.requests import Request
+import main
+
+QUERY = "Java developer who can collaborate, 40 minutes"
+
+def _request(headers=None):
+    return Request({"type": "http", "method": "POST", "path": "/recommend",
+                    "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]})
+
+def _recommend(headers=None):
+    response = Response()
+    body = asyncio.run(main.recommend(main.QueryModel(query=QUERY), _request(headers), response))
+    return body, response
+
+def test_cached_recommend_body_is_the_same_for_the_same_etag():
+    first, first_response = _recommend()
+    second, second_response = _recommend()
+
+    assert first_response.headers["etag"] == second_response.headers["etag"]
+    assert first == second
+    assert "run_id" not in first
+    assert first_response.headers["x-run-id"] != second_response.headers["x-run-id"]
+
+def test_matching_etag_gets_not_modified():
+    _, response = _recommend()
+
+    not_modified, _ = _recommend({"If-None-Match": response.headers["etag"]})
+
+    assert not_modified.status_code == 304
+    assert "x-run-id" in not_modified.headers
+
+def test_every_mode_returns_the_same_body_shape():
+    for mode in ("keyword", "semantic", "hybrid"):
+        response = Response()
+        body = asyncio.run(main.recommend(main.QueryModel(query=QUERY, mode=mode), _request(), response))
+
+        assert set(body) == {"recommendations"}, mode
+        assert body["recommendations"]
+        assert "x-run-id" in response.headers
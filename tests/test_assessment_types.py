@@ -0,0 +1,90 @@
+import random
+import numpy as np
+import pytest
+from assessment_types import (TEST_TYPE_BITS, TEST_TYPE_CODES, TEST_TYPE_LABELS, extract_test_types, mask_codes,
+                              mask_labels, parse_test_type, parse_test_types)
+from assessment_types import test_types_mask as filter_mask
+from benchmarks import SAMPLE_FILTERS, random_filters
+from catalog_index import CatalogIndex
+from recommender import (catalog_manager, recommend_assessments, recommend_assessments_batch,
+                         score_assessments)
+from response_format import Assessment
+from scoring import ScoringEngine
+
+@pytest.mark.parametrize("value, codes", [
+    ("K", ["K"]),
+    ("C P", ["C", "P"]),
+    ("p  a", ["A", "P"]),
+    ("A B C D E K P S", list(TEST_TYPE_CODES)),
+    ("K X", ["K"]),
+    ("", []),
+    (float("nan"), []),
+    (None, []),
+])
+def test_parse_test_type(value, codes):
+    assert mask_codes(parse_test_type(value)) == codes
+
+def test_every_code_has_its_own_bit_of_a_uint8():
+    bits = [TEST_TYPE_BITS[code] for code in TEST_TYPE_CODES]
+    assert sorted(bits) == [1 << i for i in range(8)]
+    masks = parse_test_types(["A", "S", "C P", None])
+    assert masks.dtype == np.uint8
+    assert masks.tolist() == [1, 128, TEST_TYPE_BITS["C"] | TEST_TYPE_BITS["P"], 0]
+
+def test_labels_are_listed_in_code_order_and_unknown_is_mixed():
+    assert mask_labels(parse_test_type("P K")) == ["Knowledge & Skills", "Personality & Behavior"]
+    assert mask_labels(0) == ["Mixed"]
+
+@pytest.mark.parametrize("values, codes", [
+    (["A", "p"], ["A", "P"]),
+    (["Personality & Behavior"], ["P"]),
+    (["cognitive", "Simulations"], ["A", "S"]),
+    ("knowledge", ["K"]),
+    (["unknown", 7], []),
+    (None, []),
+])
+def test_test_types_filter_accepts_codes_labels_and_words(values, codes):
+    assert mask_codes(filter_mask(values)) == codes
+
+def test_query_phrases_name_test_types():
+    assert extract_test_types("cognitive and personality tests for an analyst") == ["A", "P"]
+    assert extract_test_types("strong problem solving skills and ability") == []
+
+def test_every_catalog_row_lists_the_label_of_each_of_its_codes():
+    state = catalog_manager.current
+    for record in state.index.records:
+        codes = str(record["test_type"]).upper().split()
+        expected = [TEST_TYPE_LABELS[code] for code in TEST_TYPE_CODES if code in codes] or ["Mixed"]
+        assert Assessment(record, state.urls).test_type == expected
+
+def test_mask_filter_selects_rows_having_any_requested_code():
+    engine = catalog_manager.current.engine
+    codes = [set(str(value).upper().split()) for value in catalog_manager.current.df["test_type"]]
+    for mask in range(1, 1 << len(TEST_TYPE_CODES)):
+        wanted = set(mask_codes(mask))
+        expected = np.array([bool(wanted & row_codes) for row_codes in codes])
+        assert np.array_equal(engine.test_type_match(mask), expected), mask_codes(mask)
+
+def test_score_assessments_keeps_only_rows_of_the_requested_types():
+    engine = catalog_manager.current.engine
+    filters = {"skills": ["java"], "job_level": None, "duration_limit": None, "test_types": ["Personality"]}
+    _, _, keep = score_assessments(filters, engine)
+    assert keep.sum() >= 3
+    assert np.all(engine.test_type_match(TEST_TYPE_BITS["P"])[keep])
+    assert all("P" in str(r["test_type"]).split() for r in recommend_assessments(filters, engine=engine))
+
+def test_too_few_matching_rows_keep_every_row():
+    df = catalog_manager.current.df.head(20).copy()
+    df["test_type"] = ["S"] + ["K"] * (len(df) - 1)
+    engine = ScoringEngine(CatalogIndex(df))
+    filters = {"skills": ["java"], "job_level": None, "duration_limit": None, "test_types": ["S"]}
+    _, _, keep = score_assessments(filters, engine)
+    assert keep.all()
+
+def test_batch_and_single_scoring_agree_under_test_types_filters(seed=0):
+    engine = catalog_manager.current.engine
+    rng = random.Random(seed)
+    filters_list = [{**filters, "test_types": rng.sample(TEST_TYPE_CODES, rng.randint(0, 3))}
+                    for filters in SAMPLE_FILTERS + random_filters(50, seed=seed)]
+    assert (recommend_assessments_batch(filters_list, engine=engine)
+            == [recommend_assessments(filters, engine=engine) for filters in filters_list])
@@ -0,0 +1,80 @@
+import json
+import bulk
+from bulk import read_jobs, recommend_file
+
+def _write(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_read_jobs_keeps_the_offset_of_a_malformed_line(tmp_path):
+    jobs = _write(tmp_path / "jobs.jsonl", [
+        json.dumps({"id": "a", "query": "python developer"}),
+        '{"id": "b", "query": ',
+        "[1, 2]",
+        "plain text description",
+    ])
+
+    rows = list(read_jobs(jobs))
+
+    assert [row[0] for row in rows] == [0, 1, 2, 3]
+    assert rows[0] == (0, "a", "python developer", None)
+    assert rows[1][3].startswith("JSONDecodeError")
+    assert rows[2] == (2, 2, "[1, 2]", None)
+    assert rows[3] == (3, 3, "plain text description", None)
+
+def test_recommend_file_records_bad_rows_and_carries_on(tmp_path, monkeypatch):
+    real_parse = bulk.parse_query
+
+    def parse_query(query, min_confidence=None):
+        if "explode" in query:
+            raise RuntimeError("model unavailable")
+        return real_parse(query, min_confidence=min_confidence)
+
+    monkeypatch.setattr(bulk, "parse_query", parse_query)
+    jobs = _write(tmp_path / "jobs.jsonl", [
+        json.dumps({"id": "ok-1", "query": "python developer, 30 minutes"}),
+        "{not json",
+        json.dumps({"id": "boom", "query": "please explode"}),
+        json.dumps({"id": "ok-2", "query": "java developer"}),
+    ])
+    output = str(tmp_path / "out.jsonl")
+
+    summary = recommend_file(jobs, output, resume=False, min_confidence=0.0, workers=2)
+
+    records = _records(output)
+    assert summary["rows"] == 4
+    assert summary["errors"] == 2
+    assert [record["offset"] for record in records] == [0, 1, 2, 3]
+    assert records[0]["recommendations"] and records[3]["recommendations"]
+    assert records[1]["error"].startswith("JSONDecodeError")
+    assert records[2]["id"] == "boom" and "model unavailable" in records[2]["error"]
+
+def test_resume_after_a_torn_write_matches_an_uninterrupted_run(tmp_path):
+    jobs = _write(tmp_path / "jobs.jsonl", [json.dumps({"id": i, "query": query}) for i, query in enumerate(
+        ["python developer", "java developer, 30 minutes", "senior sales manager", "excel analyst"] * 10)])
+    reference = str(tmp_path / "reference.jsonl")
+    output = str(tmp_path / "out.jsonl")
+    recommend_file(jobs, reference, resume=False, min_confidence=0.0)
+
+    stopped = recommend_file(jobs, output, resume=False, min_confidence=0.0, limit=15, checkpoint_every=4)
+    # A crash after the last checkpoint leaves a partial line behind
+    with open(output, "ab") as f:
+        f.write(b'{"id": "torn')
+    resumed = recommend_file(jobs, output, resume=True, min_confidence=0.0, checkpoint_every=4)
+
+    assert stopped["next_offset"] == 15
+    assert resumed["resumed_from"] == 15
+    with open(reference, "rb") as a, open(output, "rb") as b:
+        assert a.read() == b.read()
+
+def test_parse_memo_stays_within_its_bound(tmp_path):
+    jobs = _write(tmp_path / "jobs.jsonl", [f"python developer number {i}" for i in range(50)])
+
+    summary = recommend_file(jobs, str(tmp_path / "out.jsonl"), resume=False, min_confidence=0.0, memo_entries=8)
+
+    assert summary["rows"] == 50
+    assert summary["parse_memo_entries"] == 8
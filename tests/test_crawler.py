@@ -0,0 +1,127 @@
+import time
+import pandas as pd
+import pytest
+from benchmarks import fixture_server, render_fixture_site
+from crawler import CATALOG_FIELDS, Crawler, crawl_catalog
+from extractor import extract_detail
+
+ROWS = 30
+
+def _normalize(value):
+    return "" if pd.isna(value) else " ".join(str(value).split())
+
+@pytest.fixture
+def raw():
+    raw = pd.read_csv("shl_clean.csv", encoding="latin1").head(ROWS)
+    return raw.drop_duplicates("Topic").reset_index(drop=True)
+
+@pytest.fixture
+def site(raw, tmp_path):
+    directory = str(tmp_path / "site")
+    render_fixture_site(raw, directory)
+    return directory
+
+@pytest.fixture
+def server(site):
+    with fixture_server(site, delay=0.01) as (base_url, counters):
+        yield base_url, counters
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "catalog.csv"), str(tmp_path / "final.txt"), str(tmp_path / "state.sqlite")
+
+def _crawler(base_url, state_path, rate=0.0, workers=4):
+    return Crawler(base_url, state_path, rate=rate, workers=workers)
+
+def test_crawled_rows_match_the_source_pages(raw, server, paths):
+    base_url, _ = server
+    csv_path, url_path, state_path = paths
+
+    count = crawl_catalog(_crawler(base_url, state_path), csv_path, url_path, snapshot_path="")
+
+    crawled = pd.read_csv(csv_path, encoding="utf-8", keep_default_na=False)
+    assert count == len(raw)
+    assert list(crawled.columns) == CATALOG_FIELDS
+    for (_, got), (_, want) in zip(crawled.iterrows(), raw.iterrows()):
+        assert {field: _normalize(got[field]) for field in CATALOG_FIELDS} == \
+               {field: _normalize(want[field]) for field in CATALOG_FIELDS}
+
+def test_interrupted_crawl_resumes_without_fetching_done_pages(raw, server, paths):
+    base_url, _ = server
+    csv_path, url_path, state_path = paths
+    crawler = _crawler(base_url, state_path)
+    for i, _ in enumerate(crawler.crawl()):
+        if i + 1 >= len(raw) // 2:
+            break
+
+    crawler = _crawler(base_url, state_path)
+    count = crawl_catalog(crawler, csv_path, url_path, snapshot_path="")
+
+    assert count == len(raw)
+    assert crawler.stats["resumed"] > 0
+    assert crawler.stats["fetched"] < len(raw)
+
+def test_recrawl_downloads_only_the_changed_page(raw, site, server, paths):
+    base_url, counters = server
+    csv_path, url_path, state_path = paths
+    crawl_catalog(_crawler(base_url, state_path), csv_path, url_path, snapshot_path="")
+    changed = raw.iloc[[0]].copy()
+    changed["Description"] = "Changed description."
+    render_fixture_site(pd.concat([changed, raw.iloc[1:]]), site)
+
+    crawler = _crawler(base_url, state_path)
+    crawl_catalog(crawler, csv_path, url_path, snapshot_path="", resume=False)
+
+    assert crawler.stats["fetched"] == 1
+    assert crawler.stats["not_modified"] == len(raw) - 1
+    assert counters["304"] == len(raw) - 1
+    assert pd.read_csv(csv_path, encoding="utf-8")["Description"][0] == "Changed description."
+
+def test_requests_respect_the_rate_limit(raw, server, paths):
+    base_url, counters = server
+    csv_path, url_path, state_path = paths
+    rate, workers = 40.0, 4
+    crawler = _crawler(base_url, state_path, rate=rate, workers=workers)
+
+    start = time.perf_counter()
+    crawl_catalog(crawler, csv_path, url_path, snapshot_path="")
+    seconds = time.perf_counter() - start
+
+    requests = counters["200"] + counters["304"] + counters["404"]
+    # The token bucket lets a burst of workers // 2 through at once
+    assert seconds >= (requests - workers // 2) / rate * 0.9
+
+def test_threads_share_a_pool_of_kept_alive_connections(raw, server, paths):
+    base_url, counters = server
+    csv_path, url_path, state_path = paths
+    workers = 4
+
+    crawl_catalog(_crawler(base_url, state_path, workers=workers), csv_path, url_path, snapshot_path="")
+
+    assert 1 < counters["max_in_flight"] <= workers
+    # Every page of the crawl went over at most one connection per pooled slot
+    assert counters["connections"] <= workers
+
+def test_a_page_the_extractor_cannot_read_fails_alone(raw, server, paths):
+    base_url, _ = server
+    csv_path, url_path, state_path = paths
+    broken = raw["Topic"][1]
+
+    def parse(html):
+        if broken in html:
+            raise ValueError("malformed product page")
+        return extract_detail(html)
+
+    crawler = Crawler(base_url, state_path, rate=0.0, workers=4, parse=parse)
+    count = crawl_catalog(crawler, csv_path, url_path, snapshot_path="")
+
+    assert count == len(raw) - 1
+    assert crawler.stats["failed"] == 1
+    failures = crawler.state.failures()
+    assert len(failures) == 1 and "malformed product page" in next(iter(failures.values()))
+    assert broken not in set(pd.read_csv(csv_path, encoding="utf-8")["Topic"])
+
+    # The next run fetches the page again and clears its failure
+    crawler = _crawler(base_url, state_path)
+    assert crawl_catalog(crawler, csv_path, url_path, snapshot_path="") == len(raw)
+    assert crawler.state.failures() == {}
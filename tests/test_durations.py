@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from durations import DurationIndex, parse_assessment_length, parse_assessment_lengths
+
+LABEL = "Approximate Completion Time in minutes = "
+
+# Every assessment_length format found in shl_clean.csv, with the expected parse
+@pytest.mark.parametrize("value, expected", [
+    (LABEL + "30", (30.0, "fixed")),
+    (LABEL + "5", (5.0, "fixed")),
+    (LABEL + "7 minutes", (7.0, "fixed")),
+    (LABEL + "20 minutes", (20.0, "fixed")),
+    (LABEL + "15 to 35", (35.0, "range")),
+    (LABEL + "max 60", (60.0, "max")),
+    (LABEL + "Untimed", (None, "untimed")),
+    (LABEL + "Untimed, approx. 25", (25.0, "approximate")),
+    (LABEL + "Variable", (None, "variable")),
+    (LABEL + "-", (None, "unknown")),
+    (LABEL + "TBC", (None, "unknown")),
+    (LABEL + "N/A", (None, "unknown")),
+    ("7 minutes", (7.0, "fixed")),
+    (float("nan"), (None, "unknown")),
+    (None, (None, "unknown")),
+    (45, (45.0, "fixed")),
+])
+def test_parse_assessment_length(value, expected):
+    assert parse_assessment_length(value) == expected
+
+def test_every_catalog_value_is_understood():
+    raw = pd.read_csv("shl_clean.csv", encoding="latin1")["Assessment Length"]
+
+    unknown = [value for value in raw.dropna().unique()
+               if parse_assessment_length(value)[1] == "unknown"
+               and not any(token in value for token in ("= -", "TBC", "N/A"))]
+
+    assert unknown == []
+
+@pytest.mark.parametrize("limit", [0, 5, 10, 17.5, 30, 45, 60, 1000, float("nan")])
+def test_duration_index_agrees_with_a_full_scan(limit):
+    minutes, _ = parse_assessment_lengths(
+        pd.read_csv("shl_clean.csv", encoding="latin1")["Assessment Length"])
+    index = DurationIndex(minutes)
+
+    assert index.count_within(limit) == int((minutes <= limit).sum())
+    assert np.array_equal(index.mask_within(limit), minutes <= limit)
+    expected_score = np.where(minutes <= limit, 3, np.where(minutes <= limit * 1.5, 1, 0))
+    assert np.array_equal(index.match_score(limit), expected_score)
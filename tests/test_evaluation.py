@@ -0,0 +1,50 @@
+import time
+import evaluation
+from evaluation import evaluate_case
+from tracing import TraceExporter
+
+CASE = {"query": "Looking for assessments on Python and ML, 45 mins max",
+        "expected_filters": {"skills": ["python", "machine learning"], "duration_limit": 45, "job_level": None},
+        "relevant": ["Python (New)"]}
+
+class RecordingSink:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+def _evaluate(monkeypatch, recommend=None, delay=0.05):
+    parse_query = evaluation.parse_query
+
+    def slow_parse(*args, **kwargs):
+        time.sleep(delay)
+        return parse_query(*args, **kwargs)
+
+    monkeypatch.setattr(evaluation, "parse_query", slow_parse)
+    if recommend is not None:
+        monkeypatch.setattr(evaluation, "recommend_assessments", recommend)
+    sink = RecordingSink()
+    tracer = TraceExporter(sink, flush_interval=0.05)
+    result = evaluate_case(CASE, no_llm=True, tracer=tracer)
+    assert tracer.flush(timeout=30)
+    tracer.shutdown()
+    return result, sink.spans
+
+def test_the_span_covers_parsing_and_scoring(monkeypatch, delay=0.05):
+    result, [span] = _evaluate(monkeypatch, delay=delay)
+
+    assert span["end_time"] - span["start_time"] >= delay
+    assert span["id"] == result["langsmith_run_id"]
+    assert span["outputs"]["filters"] == result["extracted"]
+    assert span["error"] is None
+
+def test_a_failing_case_records_the_error_in_its_span(monkeypatch):
+    def failing(filters, top_k=10):
+        raise RuntimeError("scoring failed")
+
+    result, [span] = _evaluate(monkeypatch, recommend=failing)
+
+    assert "scoring failed" in result["error"]
+    assert "scoring failed" in span["error"]
+    assert span["id"] == result["langsmith_run_id"]
@@ -0,0 +1,24 @@
+from metrics import Histogram
+
+def test_percentiles_use_only_the_last_window_of_samples():
+    histogram = Histogram("test_seconds", buckets=(0.1, 1.0), window=10)
+    for _ in range(100):
+        histogram.observe("slow", 5.0)
+    for _ in range(10):
+        histogram.observe("slow", 0.05)
+
+    assert histogram.percentile("slow", 95) == 0.05
+    assert len(histogram._series["slow"]["samples"]) == 10
+    # Counts and buckets still cover every observation
+    counts, count, total = histogram.totals()["slow"]
+    assert counts == [10, 0, 100] and count == 110
+    assert abs(total - 500.5) < 1e-9
+
+def test_snapshot_reports_each_label():
+    histogram = Histogram("test_seconds", label_name="stage")
+    histogram.observe("parse", 0.002)
+    histogram.observe("score", 0.02)
+
+    report = histogram.snapshot()
+    assert set(report) == {"parse", "score"}
+    assert report["parse"]["p50_ms"] == 2.0 and report["parse"]["count"] == 1
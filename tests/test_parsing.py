@@ -0,0 +1,17 @@
+import asyncio
+from llm_client import AsyncLLMClient
+from recommender import local_parser, parse_query_async
+
+# Scores below the local parser's confidence threshold, so the model is asked
+UNSURE_QUERY = "I need an hour-long test for a senior data analyst"
+
+def _no_api_key():
+    raise ValueError("GOOGLE_API_KEY environment variable not set")
+
+def test_parse_query_async_degrades_when_the_model_cannot_be_created():
+    client = AsyncLLMClient(model_factory=_no_api_key)
+
+    filters = asyncio.run(parse_query_async(UNSURE_QUERY, client=client, cache=None))
+
+    expected, _ = local_parser.parse(UNSURE_QUERY)
+    assert filters == {**expected, "degraded": True}
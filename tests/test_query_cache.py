@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import query_cache
+from query_cache import QueryCache
+
+FILTERS = {"skills": ["java"], "job_level": "developer", "duration_limit": 40}
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_keys_ignore_case_and_whitespace_but_not_the_model():
+    cache = QueryCache()
+
+    assert cache.key("Java  developer\n", "m") == cache.key("java developer", "m")
+    assert cache.key("java developer", "m") != cache.key("java developer", "other")
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.set("a", {"skills": ["a"]})
+    cache.set("b", {"skills": ["b"]})
+    assert cache.get("a") == {"skills": ["a"]}
+    cache.set("c", {"skills": ["c"]})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"skills": ["a"]}
+    assert cache.get("c") == {"skills": ["c"]}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+def test_entries_expire_after_the_ttl(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache, "time", SimpleNamespace(time=clock))
+    cache = QueryCache(path=str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.set("k", FILTERS)
+
+    clock.now += 59
+    assert cache.get("k") == FILTERS
+    clock.now += 2
+    assert cache.get("k") is None
+    # The SQLite tier expires too, not only the memory tier
+    assert QueryCache(path=str(tmp_path / "cache.sqlite"), ttl=60).get("k") is None
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = QueryCache(path=path)
+    first.set(first.key("Java developer", "m"), FILTERS)
+
+    second = QueryCache(path=path)
+    key = second.key("java developer", "m")
+    assert second.get(key) == FILTERS
+    assert second.get(key) == FILTERS
+    assert (second.disk_hits, second.memory_hits) == (1, 1)
+
+def test_expired_rows_are_deleted_on_write(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache, "time", SimpleNamespace(time=clock))
+    cache = QueryCache(path=str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.set("old", FILTERS)
+    clock.now += 120
+    cache.set("new", FILTERS)
+
+    assert [row[0] for row in cache._db().execute("SELECT key FROM query_cache")] == ["new"]
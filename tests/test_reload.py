@@ -0,0 +1,133 @@
+import json
+import random
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks import SAMPLE_FILTERS, random_filters
+from catalog_index import CatalogIndex
+from catalog_manager import CatalogManager
+from catalog_snapshot import build_snapshot, load_catalog_csv
+from config import SEMANTIC
+from recommender import recommend_assessments
+from scoring import ScoringEngine
+from semantic import HashingEmbedder, catalog_texts
+
+def _edit_catalog_csv(path, url_path, rng, generation):
+    """Remove, add and update a few rows of a raw catalog CSV and its URL map"""
+    raw = pd.read_csv(path, encoding='latin1')
+    title = raw.columns[0]
+    raw = raw.drop(index=rng.choice(raw.index, size=5, replace=False))
+    added = raw.sample(n=3, random_state=int(rng.integers(1 << 30))).copy()
+    added[title] = [f"{name} (Revision {generation})" for name in added[title]]
+    updated = rng.choice(raw.index, size=3, replace=False)
+    raw.loc[updated, raw.columns[1]] = raw.loc[updated, raw.columns[1]].astype(str) + f" Updated in revision {generation}."
+    raw = pd.concat([raw, added], ignore_index=True)
+    raw.to_csv(path, index=False, encoding='latin1')
+    with open(url_path, "a") as f:
+        for name in added[title]:
+            f.write(f"{name} => https://example.com/{generation}\n")
+
+@pytest.fixture
+def catalog_copy(tmp_path):
+    csv_path = str(tmp_path / "catalog.csv")
+    url_path = str(tmp_path / "final.txt")
+    snapshot_path = str(tmp_path / "catalog.snap")
+    shutil.copy("shl_clean.csv", csv_path)
+    shutil.copy("final.txt", url_path)
+    build_snapshot(csv_path, url_path, snapshot_path)
+    semantic_config = dict(SEMANTIC, embedder="hashing", path=str(tmp_path / "vectors"))
+    return csv_path, url_path, snapshot_path, semantic_config
+
+def test_no_request_fails_while_the_catalog_reloads(catalog_copy, threads=4, reloads=3, pause=0.1):
+    csv_path, url_path, snapshot_path, semantic_config = catalog_copy
+    manager = CatalogManager(csv_path, url_path, snapshot_path, semantic_config)
+    manager.current.vector_store()
+    rng = np.random.default_rng(0)
+    filters_pool = SAMPLE_FILTERS + random_filters(50)
+    stop = threading.Event()
+    lock = threading.Lock()
+    counts = {"requests": 0}
+    errors = []
+
+    def load(worker):
+        local = random.Random(worker)
+        while not stop.is_set():
+            # Endpoints read the live generation once per request
+            state = manager.current
+            try:
+                results = recommend_assessments(local.choice(filters_pool), engine=state.engine)
+                titles = set(state.index.titles)
+                assert results and all(r["title"] in titles for r in results)
+                rows, _ = state.vector_store().search(state.embedder.encode(["python developer"])[0], k=5)
+                assert all(0 <= row < state.engine.size for row in rows)
+            except Exception as e:
+                errors.append(repr(e))
+            with lock:
+                counts["requests"] += 1
+
+    workers = [threading.Thread(target=load, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    served = []
+    try:
+        for generation in range(1, reloads + 1):
+            time.sleep(pause)
+            before = counts["requests"]
+            _edit_catalog_csv(csv_path, url_path, rng, generation)
+            report = manager.reload(rebuild_snapshot=True)
+            served.append(counts["requests"] - before)
+            assert "error" not in report
+        time.sleep(pause)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert errors == []
+    assert all(served), f"no request ran during some reloads: {served}"
+    assert manager.stats()["version"] == manager.current.version
+
+    # The live generation scores and embeds like one built from scratch
+    fresh_df = load_catalog_csv(csv_path)
+    fresh = ScoringEngine(CatalogIndex(fresh_df))
+    for filters in SAMPLE_FILTERS:
+        assert (json.dumps(recommend_assessments(filters, engine=manager.current.engine), default=str)
+                == json.dumps(recommend_assessments(filters, engine=fresh), default=str))
+    expected = HashingEmbedder().encode(catalog_texts(fresh_df))
+    assert np.allclose(np.asarray(manager.current.vector_store().vectors), expected, atol=1e-6)
+
+def test_changed_url_map_reaches_recommend_without_a_snapshot(tmp_path, monkeypatch):
+    import app
+    import recommender
+    csv_path = str(tmp_path / "catalog.csv")
+    url_path = str(tmp_path / "final.txt")
+    shutil.copy("shl_clean.csv", csv_path)
+    shutil.copy("final.txt", url_path)
+    # No snapshot file: the catalog is read from the CSV and URL map
+    semantic_config = dict(SEMANTIC, embedder="hashing", path=str(tmp_path / "vectors"))
+    manager = CatalogManager(csv_path, url_path, str(tmp_path / "missing.snap"), semantic_config)
+    manager.subscribe(lambda state: recommender.response_cache.set_catalog_version(state.version))
+    live = recommender.catalog_manager
+    monkeypatch.setattr(recommender, "catalog_manager", manager)
+    recommender.response_cache.set_catalog_version(manager.current.version)
+    client = app.app.test_client()
+    try:
+        first = client.post("/recommend", json={"query": "Java developer, 40 minutes"}).get_json()
+        top = first["recommended_assessments"][0]
+        with open(url_path) as f:
+            text = f.read()
+        assert top["url"] in text
+        new_url = "https://example.com/moved/java"
+        with open(url_path, "w") as f:
+            f.write(text.replace(top["url"], new_url))
+
+        report = manager.reload()
+        assert report["swapped"] and report["urls_changed"]
+
+        second = client.post("/recommend", json={"query": "Java developer, 40 minutes"}).get_json()
+        assert second["recommended_assessments"][0]["url"] == new_url
+    finally:
+        recommender.response_cache.set_catalog_version(live.current.version)
@@ -0,0 +1,28 @@
+import pytest
+from recommender import cached_recommendations, recommend_assessments, recommend_assessments_batch
+from response_cache import ResponseCache
+
+CANONICAL = {"skills": ["communication", "python"], "job_level": "developer", "duration_limit": 40}
+
+# A repeated soft skill used to be scored once per mention when not cached
+VARIANTS = [
+    {"skills": ["Python", "Communication"], "job_level": "Developer", "duration_limit": "40"},
+    {"skills": ["communication", "python", "communication"], "job_level": "developer", "duration_limit": 40},
+    {"skills": [" Communication ", "python", "COMMUNICATION"], "job_level": "developer", "duration_limit": 40.0},
+]
+
+@pytest.mark.parametrize("filters", VARIANTS)
+def test_variants_of_the_same_filters_rank_the_same_on_every_path(filters):
+    expected = recommend_assessments(CANONICAL)
+
+    assert recommend_assessments(filters) == expected
+    assert recommend_assessments_batch([filters])[0] == expected
+    payload, _ = cached_recommendations(filters, cache=ResponseCache())
+    assert payload == expected
+
+def test_variants_share_one_cache_entry():
+    cache = ResponseCache()
+    etags = {cached_recommendations(filters, cache=cache)[1] for filters in VARIANTS}
+
+    assert len(etags) == 1
+    assert cache.misses == 1
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import pytest
+import app
+import response_format
+from benchmarks import SAMPLE_FILTERS, random_filters
+from recommender import cached_response, catalog_manager, recommend_assessments
+from response_cache import ResponseCache
+from response_format import GENERIC_ASSESSMENT, ResponseFragments, dumps
+
+FILTERS = SAMPLE_FILTERS + random_filters(30, seed=1)
+
+def _serialized(filters):
+    """The body the dict path builds: result dicts, response dicts, then jsonify"""
+    with app.app.app_context():
+        results = recommend_assessments(filters)
+        body = {"recommended_assessments": app.format_recommendations(results)}
+        return app.jsonify(body).get_data()
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_fragment_body_decodes_like_serializing_the_recommendations(filters):
+    body, _ = cached_response(filters, cache=ResponseCache())
+
+    assert json.loads(body) == json.loads(_serialized(filters))
+
+def test_no_rows_render_the_generic_assessment():
+    fragments = catalog_manager.current.fragments
+
+    assert json.loads(fragments.render([])) == {"recommended_assessments": [GENERIC_ASSESSMENT]}
+
+def test_fragments_are_the_same_json_without_orjson(monkeypatch):
+    state = catalog_manager.current
+    rows = list(range(10))
+    expected = json.loads(state.fragments.render(rows))
+    monkeypatch.setattr(response_format, "orjson", None)
+
+    assert json.loads(ResponseFragments(state.index.records, state.urls).render(rows)) == expected
+    assert dumps({"b": 1, "a": [2]}) == b'{"a":[2],"b":1}'
+
+def test_etag_is_the_hash_of_the_body_and_stable_across_hits():
+    cache = ResponseCache()
+    body, etag = cached_response(SAMPLE_FILTERS[0], cache=cache)
+    again, same = cached_response(SAMPLE_FILTERS[0], cache=cache)
+    other, different = cached_response(SAMPLE_FILTERS[1], cache=cache)
+
+    assert etag == hashlib.sha256(body).hexdigest()[:32]
+    assert (again, same) == (body, etag)
+    assert cache.hits == 1
+    assert other != body and different != etag
+
+def test_flask_recommend_serves_the_fragment_body_and_not_modified():
+    client = app.app.test_client()
+    query = {"query": "Java developer who can collaborate, 40 minutes"}
+
+    first = client.post("/recommend", json=query)
+    etag = first.headers["ETag"].strip('"')
+    body, expected = cached_response(app.parse_query(query["query"]))
+    not_modified = client.post("/recommend", json=query, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.mimetype == "application/json"
+    assert first.get_data() == body
+    assert etag == expected
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b""
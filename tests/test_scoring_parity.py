@@ -0,0 +1,13 @@
+import json
+import pytest
+from benchmarks import SAMPLE_FILTERS
+from benchmarks_legacy import recommend_assessments_old
+from recommender import recommend_assessments
+
+@pytest.mark.parametrize("filters", SAMPLE_FILTERS, ids=lambda filters: ",".join(filters.get("skills") or ["none"]))
+def test_vectorized_ranking_matches_the_legacy_scorer(filters):
+    old = recommend_assessments_old(dict(filters))
+    new = recommend_assessments(dict(filters))
+
+    assert [r["title"] for r in new] == [r["title"] for r in old]
+    assert json.dumps(new, default=str) == json.dumps(old, default=str)
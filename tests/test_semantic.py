@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import recommender
+from scoring import top_k_rows
+from semantic import HashingEmbedder, VectorStore, build_vector_store, catalog_texts, load_vector_store
+
+@pytest.fixture(scope="module")
+def catalog():
+    return recommender.shl_df
+
+@pytest.fixture(scope="module")
+def embedder():
+    return HashingEmbedder()
+
+@pytest.fixture(params=[False, True], ids=["float32", "int8"])
+def store(request, catalog, embedder, tmp_path):
+    path = str(tmp_path / "vectors")
+    build_vector_store(catalog, embedder, path, quantize=request.param)
+    return VectorStore(path)
+
+def test_hashing_embedder_is_deterministic_and_normalized(embedder):
+    texts = ["Python programming and data analysis", "Retail customer service skills"]
+
+    vectors = embedder.encode(texts)
+
+    assert np.array_equal(vectors, HashingEmbedder().encode(texts))
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+def test_shared_vocabulary_scores_higher(embedder):
+    query, related, unrelated = embedder.encode(
+        ["python data analysis", "data analysis with python and pandas", "forklift safety in a warehouse"])
+
+    assert query @ related > query @ unrelated
+
+def test_store_is_memory_mapped_and_matches_the_catalog(store, catalog, embedder):
+    texts = catalog_texts(catalog)
+
+    assert isinstance(store.vectors, np.memmap)
+    assert store.matches(texts, embedder.name)
+    assert not store.matches(texts[:-1], embedder.name)
+    assert not store.matches(texts, "hashing-512")
+
+def test_store_vectors_are_normalized(store):
+    scale = 127.0 if store.quantized else 1.0
+    norms = np.linalg.norm(np.asarray(store.vectors, dtype=np.float32) / scale, axis=1)
+
+    assert np.allclose(norms[norms > 0], 1.0, atol=0.05 if store.quantized else 1e-4)
+
+def test_search_agrees_with_brute_force(store, catalog, embedder):
+    texts = catalog_texts(catalog)
+    expected = embedder.encode(texts)
+
+    for row in range(0, len(texts), 37):
+        query = embedder.encode([texts[row]])[0]
+        rows, _ = store.search(query, k=10)
+        brute = top_k_rows(expected @ query, k=10)
+        if store.quantized:
+            assert len(set(rows) & set(brute)) >= 8
+        else:
+            assert np.array_equal(rows, brute)
+        # Duplicate catalog texts may tie with the row itself
+        similarities = store.similarities(query)
+        assert np.isclose(similarities[rows[0]], similarities[row], atol=0.02 if store.quantized else 1e-6)
+
+def test_stale_store_is_rebuilt_from_changed_rows_only(catalog, embedder, tmp_path):
+    path = str(tmp_path / "vectors")
+    build_vector_store(catalog, embedder, path)
+    edited = catalog.copy()
+    edited.loc[edited.index[:3], "description"] = "Rewritten description of the assessment"
+
+    store = load_vector_store(edited, embedder, path)
+
+    assert store.matches(catalog_texts(edited), embedder.name)
+    assert store.manifest["embedded_rows"] == 3
@@ -0,0 +1,112 @@
+import threading
+import time
+from tracing import TraceExporter
+
+class SlowSink:
+    def __init__(self, delay):
+        self.delay = delay
+        self.spans = []
+
+    def export(self, spans):
+        time.sleep(self.delay)
+        self.spans.extend(spans)
+
+class BlockedSink:
+    """Holds every batch until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.spans = []
+
+    def export(self, spans):
+        self.release.wait()
+        self.spans.extend(spans)
+
+class FailingSink:
+    def __init__(self, failures):
+        self.failures = failures
+        self.spans = []
+
+    def export(self, spans):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("collector down")
+        self.spans.extend(spans)
+
+def test_a_slow_sink_does_not_delay_ending_spans(spans=200, delay=0.25):
+    sink = SlowSink(delay)
+    exporter = TraceExporter(sink, batch_size=50, flush_interval=0.05)
+    start = time.perf_counter()
+    for i in range(spans):
+        exporter.span("recommend_api_call", inputs={"i": i}).end(outputs={"recommendations_count": 10})
+    submit_seconds = time.perf_counter() - start
+
+    assert exporter.flush(timeout=30)
+    exporter.shutdown()
+
+    # Ending every span cost less than one export call of the sink
+    assert submit_seconds < delay
+    assert len(sink.spans) == spans
+    assert exporter.stats()["exported"] == spans
+
+def test_a_full_queue_drops_spans_instead_of_blocking(spans=100):
+    sink = BlockedSink()
+    exporter = TraceExporter(sink, max_queue=10, batch_size=5, flush_interval=0.05)
+    start = time.perf_counter()
+    for i in range(spans):
+        exporter.span("overflow", inputs={"i": i}).end()
+    submit_seconds = time.perf_counter() - start
+    sink.release.set()
+
+    assert exporter.flush(timeout=30)
+    exporter.shutdown()
+
+    stats = exporter.stats()
+    assert submit_seconds < 1.0
+    assert stats["dropped"] > 0
+    assert stats["submitted"] + stats["dropped"] == spans
+    assert len(sink.spans) == stats["exported"] == stats["submitted"]
+
+def test_sink_failures_are_counted_and_later_batches_still_export(capsys):
+    sink = FailingSink(failures=1)
+    exporter = TraceExporter(sink, batch_size=10, flush_interval=0.05)
+    for i in range(10):
+        exporter.span("first", inputs={"i": i}).end()
+    assert exporter.flush(timeout=30)
+    for i in range(10):
+        exporter.span("second", inputs={"i": i}).end()
+    assert exporter.flush(timeout=30)
+    exporter.shutdown()
+
+    stats = exporter.stats()
+    assert stats["failed"] == 10
+    assert stats["exported"] == 10
+    assert {span["name"] for span in sink.spans} == {"second"}
+    assert "Failed to export 10 spans" in capsys.readouterr().out
+
+def test_a_span_left_by_an_exception_records_the_error():
+    sink = SlowSink(0.0)
+    exporter = TraceExporter(sink, flush_interval=0.05)
+    try:
+        with exporter.span("recommend_api_call", inputs={"query": "java"}):
+            raise ValueError("no catalog")
+    except ValueError:
+        pass
+    assert exporter.flush(timeout=30)
+    exporter.shutdown()
+
+    [span] = sink.spans
+    assert span["error"] == "no catalog"
+    assert span["end_time"] >= span["start_time"]
+
+def test_metadata_keys_never_override_span_fields():
+    sink = SlowSink(0.0)
+    exporter = TraceExporter(sink, flush_interval=0.05)
+    metadata = {"run_type": "llm", "tags": ["x"], "inputs": {}, "name": "other"}
+    exporter.span("parse_query", inputs={"query": "java"}, metadata=metadata).end()
+    assert exporter.flush(timeout=30)
+    exporter.shutdown()
+
+    [span] = sink.spans
+    assert (span["name"], span["run_type"], span["tags"], span["inputs"]) == ("parse_query", "chain", [], {"query": "java"})
+    assert span["metadata"] == metadata
@@ -0,0 +1,249 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from config import TRACING
+
+class Span:
+    """One traced operation, submitted to its exporter when it ends.
+
+    Used as ``with exporter.span(name, inputs) as span: ... span.end(outputs=...)``.
+    Leaving the block ends the span if ``end`` was not called, recording
+    the exception as its error.
+    """
+
+    def __init__(self, exporter, name, inputs=None, run_type="chain", run_id=None, tags=None, metadata=None):
+        self.exporter = exporter
+        self.record = {
+            "id": str(run_id or uuid.uuid4()),
+            "name": name,
+            "run_type": run_type,
+            "inputs": inputs or {},
+            "outputs": {},
+            "error": None,
+            "start_time": time.time(),
+            "end_time": None,
+            "tags": list(tags or []),
+            "metadata": dict(metadata or {}),
+        }
+
+    @property
+    def id(self):
+        return self.record["id"]
+
+    def end(self, outputs=None, error=None):
+        if self.record["end_time"] is not None:
+            return
+        self.record["end_time"] = time.time()
+        if outputs:
+            self.record["outputs"] = outputs
+        if error is not None:
+            self.record["error"] = str(error)
+        self.exporter.submit(self.record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(error=exc)
+        return False
+
+class NullSink:
+    def export(self, spans):
+        pass
+
+class JsonlSink:
+    """Appends spans as JSON lines to a local file"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(span, default=str) + "\n" for span in spans))
+
+class HttpSink:
+    """POSTs each batch as a JSON list to a collector URL"""
+
+    def __init__(self, url, timeout=5.0, session=None):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def export(self, spans):
+        response = self.session.post(self.url, json=spans, timeout=self.timeout)
+        response.raise_for_status()
+
+class LangSmithSink:
+    """Creates one LangSmith run per span, or one batch request when the client supports it"""
+
+    def __init__(self, project_name="shl-recommender", client=None):
+        if client is None:
+            from langsmith import Client
+
+            client = Client()
+        self.client = client
+        self.project_name = project_name
+
+    def _run(self, span):
+        run = dict(span)
+        for key in ("start_time", "end_time"):
+            if run[key] is not None:
+                run[key] = datetime.fromtimestamp(run[key], tz=timezone.utc)
+        run["extra"] = {"metadata": run.pop("metadata")}
+        run["session_name"] = self.project_name
+        return run
+
+    def export(self, spans):
+        runs = [self._run(span) for span in spans]
+        if hasattr(self.client, "batch_ingest_runs"):
+            self.client.batch_ingest_runs(create=runs)
+            return
+        for run in runs:
+            self.client.create_run(project_name=run.pop("session_name"), **run)
+
+class TraceExporter:
+    """Ships spans to a sink from a background thread, off the request path.
+
+    ``submit`` only appends to a bounded in-memory queue; when the queue
+    is full the span is dropped and counted rather than blocking the
+    caller. The export thread sends spans in batches of up to
+    ``batch_size``, at least every ``flush_interval`` seconds, so the
+    latency and failures of the tracing backend never reach requests.
+    Failed batches are counted and discarded.
+    """
+
+    def __init__(self, sink, max_queue=10000, batch_size=100, flush_interval=1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._thread_pid = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.submitted = 0
+        self.dropped = 0
+        self.exported = 0
+        self.failed = 0
+        self.batches = 0
+
+    def span(self, name, inputs=None, run_type="chain", run_id=None, tags=None, metadata=None):
+        return Span(self, name, inputs, run_type=run_type, run_id=run_id, tags=tags, metadata=metadata)
+
+    def submit(self, span):
+        """Queue ``span`` for export, False when it was dropped"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _ensure_thread(self):
+        # Threads do not survive a fork, each worker starts its own
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch):
+        try:
+            self.sink.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"⚠️ Warning: Failed to export {len(batch)} spans: {e}")
+        finally:
+            self.batches += 1
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued span was exported or failed, True if it finished in time"""
+        if self._thread is None or self._thread_pid != os.getpid():
+            return self._queue.empty()
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout=5.0):
+        """Export what is queued, then stop the export thread"""
+        self._stop.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "exported": self.exported,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queued": self._queue.qsize(),
+        }
+
+def make_sink(backend=None, path=None, url=None, project_name="shl-recommender"):
+    """Sink for a backend name: langsmith, jsonl, http or none"""
+    backend = backend or TRACING["backend"]
+    if backend == "langsmith":
+        return LangSmithSink(project_name)
+    if backend == "jsonl":
+        return JsonlSink(path or TRACING["path"])
+    if backend == "http":
+        return HttpSink(url or TRACING["url"])
+    if backend == "none":
+        return NullSink()
+    raise ValueError(f"Unknown tracing backend: {backend}")
+
+# One exporter per process, created on first use
+_exporter = None
+
+def get_exporter():
+    """The process-wide exporter configured by TRACING, flushed at exit"""
+    global _exporter
+    if _exporter is None:
+        try:
+            sink = make_sink()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not initialize {TRACING['backend']} tracing, spans are discarded: {e}")
+            sink = NullSink()
+        _exporter = TraceExporter(sink, max_queue=TRACING["max_queue"], batch_size=TRACING["batch_size"],
+                                  flush_interval=TRACING["flush_interval"])
+        atexit.register(_exporter.flush, 2.0)
+    return _exporter